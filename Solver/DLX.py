@@ -1,40 +1,80 @@
 # solvers/DLX.py
 
 import time
-
-class CandidateNode:
-    def __init__(self, digit, row, col):
-        self.digit = digit
-        self.row = row
-        self.col = col
+from contextlib import nullcontext
+
+from .array_dlx import (
+    acquire_sudoku_template,
+    fill_sudoku_solution,
+    release_sudoku_template,
+)
+from . import presolve as presolver
+from .board import board_dimensions, board_like, cell_values
+from .budget import Budget, BudgetExceeded
+from .conflicts import is_valid_board
+from .search import CANCELLED, DLXSearch
+from .stats import SolveStats, count_column_ops
 
 class Node:
-    def __init__(self, candidate_node=None):
+    __slots__ = ("left", "right", "up", "down", "column", "row_id")
+
+    def __init__(self, row_id=None):
         self.left = self
         self.right = self
         self.up = self
         self.down = self
         self.column = None  # Reference to the column header
-        self.candidate = candidate_node
+        self.row_id = row_id  # The option this node belongs to, see sudoku_row_id
 
 class ColumnNode(Node):
+    __slots__ = ("name", "size")
+
     def __init__(self, name):
         super().__init__()
         self.name = name
         self.size = 0  # Number of nodes in this column
 
 class DLX:
-    def __init__(self, size):
+    """
+    Dancing Links over node objects.
+
+    DLX(size) lays out the Sudoku constraint columns, named as in
+    initialize_columns. DLX(columns=n,
+    secondary=k) is a generic exact-cover matrix instead, with integer
+    column ids 0..n-1. The last k of them are secondary: a solution
+    covers them at most once and the search never branches on them.
+    Rows are added with add_option or add_options, which return the
+    row ids that solutions are reported in.
+    """
+
+    def __init__(self, size=None, columns=None, secondary=0):
         self.SIZE = size
         self.header = ColumnNode("header")
         self.columns = []
         self.column_map = {}
+        self.num_rows = 0
         self.solutions = []
-        self.solution_stack = []
-        self.found_solution = False 
+        self.found_solution = False
 
         # Initialize all constraint columns
-        self.initialize_columns()
+        if size is not None:
+            self.initialize_columns()
+        else:
+            self.initialize_generic_columns(columns, secondary)
+
+    def initialize_generic_columns(self, count, secondary=0):
+        """Create columns 0..count-1, leaving the last `secondary` out of the header list."""
+        if count is None or not 0 <= secondary <= count:
+            raise ValueError("need a column count of at least the number of secondary columns")
+        primary = count - secondary
+        for column in range(count):
+            col_node = ColumnNode(column)
+            if column < primary:
+                self.link_column(col_node)
+            # A secondary column links only to itself, so covering it
+            # still removes the rows that use it
+            self.columns.append(col_node)
+            self.column_map[column] = col_node
 
     def initialize_columns(self):
         """Initialize all constraint columns and link them horizontally."""
@@ -95,14 +135,35 @@ class DLX:
         for node in row_nodes:
             column = node.column
             if column is None:
-                print(f"Error: Column is None for candidate {node.candidate}")
-                continue  # Skip adding this node if column is missing
+                raise ValueError(f"node of row {node.row_id} has no column")
             node.down = column
             node.up = column.up
             column.up.down = node
             column.up = node
             column.size += 1
 
+    def add_option(self, columns):
+        """Add a row covering the given columns (ids or names). Returns its row id."""
+        row_id = self.num_rows
+        nodes = []
+        for column in columns:
+            node = Node(row_id)
+            node.column = self.column_map[column]
+            nodes.append(node)
+        if not nodes:
+            raise ValueError("a row must cover at least one column")
+        self.add_row(nodes)
+        self.num_rows += 1
+        return row_id
+
+    def add_options(self, rows):
+        """Add rows in bulk, each an iterable of columns. Returns the range of their ids."""
+        first = self.num_rows
+        add_option = self.add_option
+        for columns in rows:
+            add_option(columns)
+        return range(first, self.num_rows)
+
     def choose_column(self):
         """Choose the column with the smallest size (fewest nodes)."""
         min_size = float('inf')
@@ -147,199 +208,312 @@ class DLX:
         col_node.right.left = col_node
         col_node.left.right = col_node
 
-    def search(self):
-        """Recursive search for solutions."""
-        if self.header.right == self.header:
-            # Found a solution
-            solution = []
-            for row_node in self.solution_stack:
-                candidate = row_node.candidate
-                solution.append((candidate.digit, candidate.row, candidate.col))
-            self.solutions.append(solution)
-            self.found_solution = True
-            return
-
-        # Choose the column with the fewest nodes
-        column = self.choose_column()
-        if column.size == 0:
-            return  # No solution exists
-
-        self.cover(column)
-
-        current = column.down
-        while current != column:
-            self.solution_stack.append(current)
-            if self.found_solution:
-                return
-
-            # Cover all columns in this row
-            node = current.right
-            while node != current:
-                self.cover(node.column)
-                node = node.right
-
-            self.search()
-
-            # Backtrack
-            self.solution_stack.pop()
-            node = current.left
-            while node != current:
-                self.uncover(node.column)
-                node = node.left
-
-            current = current.down
-
-        self.uncover(column)
+    def column_size(self, col_node):
+        """Return the number of rows currently in a column."""
+        return col_node.size
+
+    def down(self, node):
+        """Return the node below this one in its column."""
+        return node.down
+
+    def row_of(self, node):
+        """Return the id of the option a node belongs to."""
+        return node.row_id
+
+    def select(self, row_node):
+        """Cover all other columns in the row of row_node."""
+        node = row_node.right
+        while node != row_node:
+            self.cover(node.column)
+            node = node.right
+
+    def deselect(self, row_node):
+        """Undo select, uncovering the columns in reverse order."""
+        node = row_node.left
+        while node != row_node:
+            self.uncover(node.column)
+            node = node.left
+
+    def search(self, cancel=None):
+        """Return an iterative search driver over this matrix."""
+        return DLXSearch(self, cancel)
+
+    def iter_solutions(self, cancel=None):
+        """
+        Yield each solution, as a list of row ids, as soon as it is found.
+        Nothing is kept in self.solutions. The matrix is back in its
+        starting state once the generator is exhausted or closed; call
+        close() when stopping early (CPython also closes it once dropped).
+        """
+        return self.search(cancel).solutions()
 
     def solve(self):
-        """Initiate the DLX algorithm to find all solutions."""
-        self.search()
+        """Initiate the DLX algorithm and stop at the first solution."""
+        search = self.search()
+        if search.run():
+            self.solutions.append(search.solution())
+            self.found_solution = True
+        search.close()
         return self.solutions
 
 class SudokuSolver:
-    def __init__(self):
-        self.SIZE = 9
-        self.SUBGRID_SIZE = 3
-
-    def get_grid_id(self, row, col):
-        """Get the grid index based on row and column."""
-        return (row // self.SUBGRID_SIZE) * self.SUBGRID_SIZE + (col // self.SUBGRID_SIZE)
-
-    def is_valid_option(self, digit, row, col, grid, rows, cols, grids):
-        """Check if placing digit at (row, col) is valid."""
-        if digit in rows[row]:
-            return False
-        if digit in cols[col]:
-            return False
-        if digit in grids[grid]:
-            return False
-        return True
-
-    def solve(self, board):
-        """Solve the Sudoku puzzle using DLX."""
-        # Initialize constraint sets
-        rows = [set() for _ in range(self.SIZE)]
-        cols = [set() for _ in range(self.SIZE)]
-        grids = [set() for _ in range(self.SIZE)]
-
-        # Populate the constraint sets with pre-filled numbers
-        for row in range(self.SIZE):
-            for col in range(self.SIZE):
-                cell = board[row][col]
-                if cell != 0:
-                    digit = cell
-                    rows[row].add(digit)
-                    cols[col].add(digit)
-                    grid = self.get_grid_id(row, col)
-                    grids[grid].add(digit)
-
-        # Initialize DLX
-        dlx = DLX(self.SIZE)
-
-        # Add all possible option rows to DLX
-        for row in range(self.SIZE):
-            for col in range(self.SIZE):
-                grid = self.get_grid_id(row, col)
-                if board[row][col] == 0:
-                    # Empty cell
-                    for digit in range(1, 10):
-                        if self.is_valid_option(digit, row, col, grid, rows, cols, grids):
-                            # Constraint names
-                            pos_constraint = f"pos_{row},{col}"
-                            row_constraint = f"row_{row},{digit}"
-                            col_constraint = f"col_{col},{digit}"
-                            grid_constraint = f"grid_{grid},{digit}"
-
-                            # Retrieve column nodes
-                            pos_col = dlx.get_column(pos_constraint)
-                            row_col = dlx.get_column(row_constraint)
-                            col_col = dlx.get_column(col_constraint)
-                            grid_col = dlx.get_column(grid_constraint)
-
-                            # Check if columns exist
-                            if not all([pos_col, row_col, col_col, grid_col]):
-                                print(f"Error: Missing column(s) for constraints: {pos_constraint}, {row_constraint}, {col_constraint}, {grid_constraint}")
-                                continue
-
-                            # Create candidate node
-                            candidate = CandidateNode(digit, row, col)
-
-                            # Create nodes for each constraint
-                            pos_node = Node(candidate)
-                            row_node = Node(candidate)
-                            col_node = Node(candidate)
-                            grid_node = Node(candidate)
-
-                            # Assign column headers to nodes
-                            pos_node.column = pos_col
-                            row_node.column = row_col
-                            col_node.column = col_col
-                            grid_node.column = grid_col
-
-                            # Add the row to DLX
-                            dlx.add_row([pos_node, row_node, col_node, grid_node])
-                else:
-                    # Pre-filled cell: only one possible digit, add its row
-                    digit = board[row][col]
-                    # Constraint names
-                    pos_constraint = f"pos_{row},{col}"
-                    row_constraint = f"row_{row},{digit}"
-                    col_constraint = f"col_{col},{digit}"
-                    grid_constraint = f"grid_{grid},{digit}"
-
-                    # Retrieve column nodes
-                    pos_col = dlx.get_column(pos_constraint)
-                    row_col = dlx.get_column(row_constraint)
-                    col_col = dlx.get_column(col_constraint)
-                    grid_col = dlx.get_column(grid_constraint)
-
-                    # Check if columns exist
-                    if not all([pos_col, row_col, col_col, grid_col]):
-                        print(f"Error: Missing column(s) for constraints: {pos_constraint}, {row_constraint}, {col_constraint}, {grid_constraint}")
-                        continue
-
-                    candidate = CandidateNode(digit, row, col)
-
-                    # Create nodes for each constraint
-                    pos_node = Node(candidate)
-                    row_node = Node(candidate)
-                    col_node = Node(candidate)
-                    grid_node = Node(candidate)
-
-                    # Assign column headers to nodes
-                    pos_node.column = pos_col
-                    row_node.column = row_col
-                    col_node.column = col_col
-                    grid_node.column = grid_col
-
-                    # Add the row to DLX
-                    dlx.add_row([pos_node, row_node, col_node, grid_node])
-
-        # Solve using DLX
+    """
+    Sudoku front end for DLX. Grids of any supported size (4x4 up to
+    25x25) are accepted; the size is taken from each board.
+    With a SolutionCache, solve() answers puzzles equivalent to ones it
+    has already solved without searching.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+
+    def apply_givens(self, dlx, board):
+        """
+        Select the template rows of the board's givens.
+        Returns their row ids, or None if two givens clash, in which case
+        nothing is left selected.
+        """
+        size = len(board)
+        givens = []
+        for cell, digit in enumerate(cell_values(board)):
+            if digit != 0:
+                row_id = cell * size + digit - 1
+                if not dlx.row_is_free(row_id):
+                    # Clashes with an earlier given
+                    self.release_givens(dlx, givens)
+                    return None
+                dlx.select_row(row_id)
+                givens.append(row_id)
+        return givens
+
+    def release_givens(self, dlx, givens):
+        """Deselect the givens' rows, restoring the template."""
+        for row_id in reversed(givens):
+            dlx.deselect_row(row_id)
+
+    def load_board(self, dlx, board, presolve=True, stats=None):
+        """
+        Load a board into a template. With presolve, logic deductions are
+        selected along with the givens and the options the presolver ruled
+        out are hidden, so the search only sees what is left.
+        Returns (start_board, givens, hidden) for unload_board, or None if
+        the board is contradictory (the template is left untouched).
+        """
+        cands = None
+        if presolve:
+            start_time = time.perf_counter()
+            result = presolver.presolve(board)
+            if stats is not None:
+                stats.presolve_time = time.perf_counter() - start_time
+            if result is None:
+                return None
+            board, cands = result
+        return self.load_presolved(dlx, board, cands)
+
+    def load_presolved(self, dlx, board, cands=None):
+        """
+        Load a board whose logic deductions are already made: select its
+        filled cells and hide every option cands (one digit mask per cell,
+        row-major, as returned by the presolver) rules out. Returns what
+        load_board does.
+        """
+        size = len(board)
+        givens = self.apply_givens(dlx, board)
+        if givens is None:
+            return None
+
+        hidden = []
+        if cands is not None:
+            values = cell_values(board)
+            for cell, mask in enumerate(cands):
+                if values[cell]:
+                    continue
+                for digit in range(1, size + 1):
+                    if not mask >> (digit - 1) & 1:
+                        row_id = cell * size + digit - 1
+                        # Options already removed by a given stay as they are
+                        if dlx.row_is_free(row_id):
+                            dlx.hide_row(row_id)
+                            hidden.append(row_id)
+        return board, givens, hidden
+
+    def unload_board(self, dlx, loaded):
+        """Undo load_board, restoring the template."""
+        _, givens, hidden = loaded
+        for row_id in reversed(hidden):
+            dlx.unhide_row(row_id)
+        self.release_givens(dlx, givens)
+
+    def iter_solutions(self, board, presolve=True, cancel=None):
+        """
+        Yield every solution of the puzzle as it is found, in the same
+        form solve() returns them, without collecting them first. The
+        template is held until the generator is exhausted or closed, and
+        goes back to the pool with no givens or search state left in it.
+        """
+        size, subgrid_size = board_dimensions(board)
+        if not is_valid_board(board):
+            return
+        dlx = acquire_sudoku_template(size, subgrid_size)
+        loaded = self.load_board(dlx, board, presolve)
+        if loaded is None:
+            release_sudoku_template(size, dlx)
+            return
+        solutions = dlx.iter_solutions(cancel)
+        try:
+            for solution in solutions:
+                yield self.build_solution(board, loaded[0], solution)
+        finally:
+            # Unwind the search before the givens it was built on
+            solutions.close()
+            self.unload_board(dlx, loaded)
+            release_sudoku_template(size, dlx)
+
+    def build_solution(self, board, start_board, row_ids):
+        """
+        Fill a solution's row ids into the loaded start board, returning
+        a Board for a Board and nested lists for nested lists.
+        """
+        values = fill_sudoku_solution(len(start_board), cell_values(start_board), row_ids)
+        return board_like(board, values)
+
+    def count_solutions(self, board, limit=2, presolve=True):
+        """
+        Count the solutions of the puzzle, stopping as soon as `limit` is
+        reached. No solved boards are built.
+        """
+        size, subgrid_size = board_dimensions(board)
+        if not is_valid_board(board):
+            return 0
+        dlx = acquire_sudoku_template(size, subgrid_size)
+        loaded = self.load_board(dlx, board, presolve)
+        count = 0
+        if loaded is not None:
+            search = dlx.search()
+            while count < limit and search.run():
+                count += 1
+            search.close()
+            self.unload_board(dlx, loaded)
+        release_sudoku_template(size, dlx)
+        return count
+
+    def run_search(self, dlx, stats=None, cancel=None, budget=None):
+        """
+        Search the loaded template for its first solution, within budget
+        if one is given. Returns (solutions as lists of row ids, the
+        finished search).
+        """
+        search = dlx.search(cancel)
+        counting = count_column_ops(dlx, stats) if stats is not None else nullcontext()
+        with counting:
+            found = search.run() if budget is None else search.run_within(budget)
+            solutions = [search.solution()] if found else []
+            search.close()
+        if stats is not None:
+            self.record_search(stats, search)
+        return solutions, search
+
+    def record_search(self, stats, search):
+        """Copy a search's counters into a SolveStats."""
+        stats.nodes = search.nodes
+        stats.branch_points = search.branch_points
+        stats.alternatives = search.alternatives
+        stats.backtracks = search.backtracks
+        stats.max_depth = search.max_depth
+
+    def solve(self, board, presolve=True, stats=None, cancel=None, timeout=None, max_nodes=None):
+        """
+        Solve the Sudoku puzzle using DLX, running the logic presolver
+        first unless presolve is False. Pass a SolveStats as stats for a
+        breakdown of the solve; its hooks are called when it finishes.
+        cancel may be a threading.Event (or anything with is_set()); once
+        set, the search stops and the result reports "cancelled": True.
+        timeout (seconds) and max_nodes bound the solve; when either runs
+        out the search stops and the result's "budget_exceeded" holds a
+        BudgetExceeded with the partial stats (None otherwise).
+        """
+        size, subgrid_size = board_dimensions(board)
         start_time = time.perf_counter()
-        solutions = dlx.solve()
+        budget = Budget.create(timeout, max_nodes)
+        # Budgeted solves report partial stats on an overrun; stats made
+        # here skip the column counting a caller's stats get
+        partial = stats is None and budget is not None
+        if partial:
+            stats = SolveStats()
+        valid = is_valid_board(board)
+
+        # Puzzles seen before, in any orientation, need no search
+        token = None
+        if valid and self.cache is not None:
+            found, solution, token = self.cache.lookup(board)
+            if found:
+                if solution is not None:
+                    solution = board_like(board, cell_values(solution))
+                return self.cached_result(solution, start_time, stats)
+
+        # Reject clashing givens before touching a template
+        loaded = None
+        if valid:
+            dlx = acquire_sudoku_template(size, subgrid_size)
+            # Apply the givens by selecting their rows in the prebuilt matrix
+            loaded = self.load_board(dlx, board, presolve, stats)
+            if loaded is None:
+                release_sudoku_template(size, dlx)
+        built_time = time.perf_counter()
+
+        # Solve using DLX, then restore the template for the next solve
+        solutions = []
+        cancelled = False
+        if loaded is not None:
+            solutions, search = self.run_search(dlx, None if partial else stats,
+                                                cancel, budget)
+            if partial:
+                self.record_search(stats, search)
+            cancelled = search.status == CANCELLED
+            self.unload_board(dlx, loaded)
+            release_sudoku_template(size, dlx)
+
         end_time = time.perf_counter()
         elapsed_time = end_time - start_time
 
-        # Format solutions
-        formatted_solutions = []
-        for solution in solutions:
-            solved_board = [[0 for _ in range(self.SIZE)] for _ in range(self.SIZE)]
-            for digit, row, col in solution:
-                solved_board[row][col] = digit
-            formatted_solutions.append(solved_board)
-
-        if formatted_solutions:
-            return {
-                "found_solutions": formatted_solutions,
-                "time_elapsed": f"{elapsed_time:.5f} seconds"
-            }
-        else:
-            return {
-                "found_solutions": [],
-                "time_elapsed": f"{elapsed_time:.5f} seconds"
-            }
-
-
+        exceeded = None
+        if budget is not None and budget.exceeded:
+            exceeded = BudgetExceeded(budget.exceeded, elapsed_time, stats)
 
+        if stats is not None:
+            if budget is not None:
+                stats.budget_exceeded = budget.exceeded
+            stats.engine = "dlx"
+            stats.solved = bool(solutions)
+            stats.build_time = built_time - start_time
+            stats.search_time = end_time - built_time
+            stats.finish()
 
+        # Format solutions
+        formatted_solutions = [
+            self.build_solution(board, loaded[0], solution) for solution in solutions
+        ]
+
+        if token is not None and not cancelled and exceeded is None:
+            self.cache.store(token, formatted_solutions[0] if formatted_solutions else None)
+
+        return {
+            "found_solutions": formatted_solutions,
+            "time_elapsed": f"{elapsed_time:.5f} seconds",
+            "cancelled": cancelled,
+            "budget_exceeded": exceeded,
+        }
+
+    def cached_result(self, solution, start_time, stats=None):
+        """Build the solve() result for a cache hit."""
+        elapsed_time = time.perf_counter() - start_time
+        if stats is not None:
+            stats.engine = "cache"
+            stats.solved = solution is not None
+            stats.finish()
+        return {
+            "found_solutions": [solution] if solution is not None else [],
+            "time_elapsed": f"{elapsed_time:.5f} seconds",
+            "cancelled": False,
+            "budget_exceeded": None,
+        }
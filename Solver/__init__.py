@@ -1,4 +1,15 @@
-from .backtracking import backTrackingSolver
-from .DLX import SudokuSolver
+from .backtracking import backTrackingSolver, count_solutions
+from .DLX import DLX, SudokuSolver
+from .batch import solve_many
+from .board import Board
+from .budget import BudgetExceeded
+from .cache import SolutionCache
+from .generator import generate_puzzle, generate_many
+from .parallel import ParallelSolver
+from .portfolio import PortfolioSolver
+from .session import DLXSession
+from .stats import SolveStats
+from .variants import VariantSolver
+from .vectorized import solve_array
 
-__all__ = ['backTrackingSolver', 'SudokuSolver']
\ No newline at end of file
+__all__ = ['Board', 'backTrackingSolver', 'count_solutions', 'DLX', 'SudokuSolver', 'VariantSolver', 'SolutionCache', 'PortfolioSolver', 'ParallelSolver', 'DLXSession', 'solve_many', 'generate_puzzle', 'generate_many', 'SolveStats', 'BudgetExceeded', 'solve_array']
\ No newline at end of file
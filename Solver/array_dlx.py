@@ -0,0 +1,380 @@
+# Solver/array_dlx.py
+
+from array import array
+
+from .search import DLXSearch
+
+# Every link fits in a C int, so the lists are stored as array('i')
+# buffers rather than lists of boxed Python ints
+LINK_TYPE = "i"
+
+
+class ArrayDLX:
+    """
+    Dancing Links matrix stored in flat integer arrays instead of node objects.
+
+    Index 0 is the root header, indices 1..num_columns are the column headers
+    and every index after that is a row node. For each index the arrays hold
+    its left/right/up/down neighbours (L, R, U, D), its column header (C) and
+    the id of the row it belongs to (ROW). S holds the size of each column.
+
+    Column ids are 0-based. The first num_columns - num_secondary are
+    primary and must be covered exactly once; the last num_secondary are
+    secondary (optional) and may be covered at most once. Secondary
+    headers hang off a second root, just after them, that the search
+    never walks, so they are never chosen to branch on.
+
+    capacity is the number of row nodes to allocate up front; the arrays
+    grow as rows are added past it. Indices from self.used on are spare.
+    """
+
+    def __init__(self, num_columns, num_secondary=0, capacity=0):
+        primary = num_columns - num_secondary
+        n = num_columns + 1
+        headers = n + 1 if num_secondary else n
+        self.num_columns = num_columns
+        self.num_secondary = num_secondary
+        self.used = headers  # Indices in use; row nodes are added from here
+        total = headers + capacity
+        self.L = array(LINK_TYPE, range(-1, total - 1))
+        self.R = array(LINK_TYPE, range(1, total + 1))
+        self.L[0] = primary
+        self.R[primary] = 0
+        self.U = array(LINK_TYPE, range(total))
+        self.D = array(LINK_TYPE, range(total))
+        self.C = array(LINK_TYPE, range(total))
+        self.ROW = array(LINK_TYPE, [-1]) * total
+        self.S = array(LINK_TYPE, bytes(4 * headers))
+        if num_secondary:
+            # Ring the secondary headers round their own root
+            root = n
+            self.L[primary + 1] = root
+            self.R[num_columns] = root
+            self.L[root] = num_columns
+            self.R[root] = primary + 1
+        self.row_heads = array(LINK_TYPE)  # First node index of every row, by row id
+        self.packed = None  # The link arrays while unpack() has lists in their place
+        self.solutions = []
+        self.found_solution = False
+
+    def unpack(self):
+        """
+        Swap the link arrays for plain lists, which the search reads about
+        twice as fast, keeping the arrays for pack(). The matrix must be
+        back in the state it was unpacked in when pack() is called.
+        """
+        if self.packed is None:
+            self.packed = (self.L, self.R, self.U, self.D, self.C, self.S)
+            self.L, self.R, self.U, self.D, self.C, self.S = (
+                links.tolist() for links in self.packed
+            )
+
+    def pack(self):
+        """Drop the lists made by unpack() and go back to the compact arrays."""
+        if self.packed is not None:
+            self.L, self.R, self.U, self.D, self.C, self.S = self.packed
+            self.packed = None
+
+    def reserve(self, nodes):
+        """Make room for at least `nodes` more row nodes."""
+        missing = self.used + nodes - len(self.L)
+        if missing > 0:
+            # Grow geometrically so rows added one at a time stay cheap
+            missing = max(missing, len(self.L) // 2)
+            filler = array(LINK_TYPE, bytes(4 * missing))
+            for links in (self.L, self.R, self.U, self.D, self.C, self.ROW):
+                links.extend(filler)
+
+    def add_row(self, columns):
+        """
+        Append a row covering the given column ids (0-based).
+        Returns the id of the new row.
+        """
+        return self.add_rows((columns,))[0]
+
+    def add_rows(self, rows):
+        """
+        Append rows in bulk, each an iterable of column ids (0-based).
+        Returns the range of the new rows' ids.
+        """
+        row_heads = self.row_heads
+        first_id = len(row_heads)
+        for columns in rows:
+            columns = [column + 1 for column in columns]
+            count = len(columns)
+            if not count:
+                raise ValueError("a row must cover at least one column")
+            if min(columns) < 1 or max(columns) > self.num_columns:
+                raise ValueError(f"column ids must be in 0..{self.num_columns - 1}, "
+                                 f"got {[column - 1 for column in columns]}")
+            if self.used + count > len(self.L):
+                self.pack()
+                self.reserve(count)
+            L, R, U, D, C, S, ROW = self.L, self.R, self.U, self.D, self.C, self.S, self.ROW
+            row_id = len(row_heads)
+            first = self.used
+            node = first
+            for col in columns:
+                # Horizontal links form a circular list, closed once the row is done
+                L[node] = node - 1
+                R[node] = node + 1
+                # Vertical links insert the node at the bottom of its column
+                last = U[col]
+                U[node] = last
+                D[node] = col
+                D[last] = node
+                U[col] = node
+                C[node] = col
+                ROW[node] = row_id
+                S[col] += 1
+                node += 1
+            last = node - 1
+            L[first] = last
+            R[last] = first
+            row_heads.append(first)
+            self.used = node
+        return range(first_id, len(row_heads))
+
+    def choose_column(self):
+        """
+        Choose the column with the smallest size (fewest nodes).
+        Returns None once every column is covered.
+        """
+        R, S = self.R, self.S
+        best = None
+        min_size = self.used
+        col = R[0]
+        while col != 0:
+            size = S[col]
+            if size < min_size:
+                min_size = size
+                best = col
+                if size <= 1:
+                    break  # Nothing beats a forced or dead column
+            col = R[col]
+        return best
+
+    def cover(self, col):
+        """Cover a column and remove the rows that intersect it."""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[col]] = R[col]
+        L[R[col]] = L[col]
+        i = D[col]
+        while i != col:
+            j = R[i]
+            while j != i:
+                up, down = U[j], D[j]
+                D[up] = down
+                U[down] = up
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, col):
+        """Uncover a column, restoring its rows in reverse order."""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[col]
+        while i != col:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[col]] = col
+        L[R[col]] = col
+
+    def row_is_free(self, row_id):
+        """Return True if none of the row's columns is currently covered."""
+        L, R, C = self.L, self.R, self.C
+        head = self.row_heads[row_id]
+        node = head
+        while True:
+            col = C[node]
+            if R[L[col]] != col:
+                return False
+            node = R[node]
+            if node == head:
+                return True
+
+    def select_row(self, row_id):
+        """Cover every column of a row, as if the search had chosen it."""
+        R, C = self.R, self.C
+        head = self.row_heads[row_id]
+        node = head
+        while True:
+            self.cover(C[node])
+            node = R[node]
+            if node == head:
+                break
+
+    def deselect_row(self, row_id):
+        """Undo select_row, uncovering the row's columns in reverse order."""
+        L, C = self.L, self.C
+        head = self.row_heads[row_id]
+        node = L[head]
+        while True:
+            self.uncover(C[node])
+            if node == head:
+                break
+            node = L[node]
+
+    def hide_row(self, row_id):
+        """Unlink a fully linked row from its columns, removing the option."""
+        R, U, D, C, S = self.R, self.U, self.D, self.C, self.S
+        head = self.row_heads[row_id]
+        node = head
+        while True:
+            D[U[node]] = D[node]
+            U[D[node]] = U[node]
+            S[C[node]] -= 1
+            node = R[node]
+            if node == head:
+                break
+
+    def unhide_row(self, row_id):
+        """Undo hide_row. Rows must be unhidden in reverse order."""
+        L, U, D, C, S = self.L, self.U, self.D, self.C, self.S
+        head = self.row_heads[row_id]
+        node = L[head]
+        while True:
+            D[U[node]] = node
+            U[D[node]] = node
+            S[C[node]] += 1
+            if node == head:
+                break
+            node = L[node]
+
+    def column_size(self, col):
+        """Return the number of rows currently in a column."""
+        return self.S[col]
+
+    def is_covered(self, col):
+        """Return True if a column is currently covered."""
+        return self.R[self.L[col]] != col
+
+    def down(self, node):
+        """Return the node below this one in its column."""
+        return self.D[node]
+
+    def row_of(self, node):
+        """Return the id of the row a node belongs to."""
+        return self.ROW[node]
+
+    def select(self, node):
+        """Cover the other columns of the row containing node."""
+        R, C = self.R, self.C
+        j = R[node]
+        while j != node:
+            self.cover(C[j])
+            j = R[j]
+
+    def deselect(self, node):
+        """Undo select, uncovering the row's other columns in reverse."""
+        L, C = self.L, self.C
+        j = L[node]
+        while j != node:
+            self.uncover(C[j])
+            j = L[j]
+
+    def search(self, cancel=None):
+        """Return an iterative search driver over this matrix."""
+        return DLXSearch(self, cancel)
+
+    def iter_solutions(self, cancel=None):
+        """
+        Yield each solution, as a list of row ids, as soon as it is found.
+        Nothing is kept in self.solutions. The matrix is back in its
+        starting state once the generator is exhausted or closed; call
+        close() when stopping early (CPython also closes it once dropped).
+        """
+        return self.search(cancel).solutions()
+
+    def solve(self):
+        """Run the search and return the first solution as a list of row ids."""
+        search = self.search()
+        self.solutions = [search.solution()] if search.run() else []
+        self.found_solution = bool(self.solutions)
+        search.close()
+        return self.solutions
+
+
+def sudoku_row_columns(size, subgrid_size, row, col, digit):
+    """
+    Return the four constraint column ids satisfied by placing digit at
+    (row, col), laid out like DLX.initialize_columns: position, row,
+    column and grid constraints.
+    """
+    cells = size * size
+    grid = (row // subgrid_size) * subgrid_size + (col // subgrid_size)
+    d = digit - 1
+    return (
+        row * size + col,
+        cells + row * size + d,
+        2 * cells + col * size + d,
+        3 * cells + grid * size + d,
+    )
+
+
+def sudoku_row_id(size, row, col, digit):
+    """Row id of the option placing digit at (row, col) in a Sudoku template."""
+    return (row * size + col) * size + digit - 1
+
+
+def fill_sudoku_solution(size, values, row_ids):
+    """
+    Return a copy of a board's flat row-major cell values with the
+    digits of a solution's row ids (see sudoku_row_id) filled in.
+    """
+    values = list(values)
+    for row_id in row_ids:
+        cell, d = divmod(row_id, size)
+        values[cell] = d + 1
+    return values
+
+
+def decode_sudoku_row(size, row_id):
+    """Inverse of sudoku_row_id: return (digit, row, col)."""
+    cell, d = divmod(row_id, size)
+    row, col = divmod(cell, size)
+    return d + 1, row, col
+
+
+def build_sudoku_template(size, subgrid_size):
+    """
+    Build the full exact-cover matrix for an empty grid, with one row for
+    every (row, col, digit) option numbered by sudoku_row_id.
+    """
+    dlx = ArrayDLX(4 * size * size, capacity=4 * size ** 3)
+    dlx.add_rows(
+        sudoku_row_columns(size, subgrid_size, row, col, digit)
+        for row in range(size)
+        for col in range(size)
+        for digit in range(1, size + 1)
+    )
+    return dlx
+
+
+# Idle templates by grid size. A solve takes one out of the pool and puts
+# it back once every given has been deselected again, so concurrent or
+# nested solves never share a matrix. Idle templates are kept packed; the
+# one a solve is using is unpacked for speed.
+_template_pool = {}
+
+
+def acquire_sudoku_template(size, subgrid_size):
+    """Take a prebuilt template for this size from the pool, or build one."""
+    pool = _template_pool.setdefault(size, [])
+    try:
+        dlx = pool.pop()
+    except IndexError:
+        dlx = build_sudoku_template(size, subgrid_size)
+    dlx.unpack()
+    return dlx
+
+
+def release_sudoku_template(size, dlx):
+    """Return a template to the pool. It must be back in its pristine state."""
+    dlx.pack()
+    _template_pool[size].append(dlx)
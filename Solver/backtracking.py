@@ -1,78 +1,347 @@
+import random
 import time
-import copy
 
-def is_valid(grid, row, col, num):
+from . import presolve as presolver
+from .board import Board, board_dimensions, cell_values, copy_board
+from .budget import Budget
+from .conflicts import is_valid_board
+
+
+def init_masks(grid, allowed=None):
     """
-    Check if it's valid to place the number in the cell (row, col).
+    Build the row, column and box bitmasks of digits already placed, where
+    bit d-1 stands for digit d. Returns (rows, cols, boxes, empties, all_digits),
+    or None if the givens conflict. Each empty cell is recorded as
+    (row, col, box, mask) where mask limits the digits it may take, taken
+    from `allowed` (one mask per cell, row-major) when given. grid may be
+    a nested-list board or a Board.
     """
-    # Check the row
-    for i in range(9):
-        if grid[row][i] == num:
-            return False
-
-    # Check the column
-    for i in range(9):
-        if grid[i][col] == num:
-            return False
-
-    # Check the 3x3 subgrid
-    start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-    for i in range(3):
-        for j in range(3):
-            if grid[start_row + i][start_col + j] == num:
-                return False
-
-    return True
-
-def find_empty(grid):
+    size, box_size = board_dimensions(grid)
+    values = cell_values(grid)
+    rows = [0] * size
+    cols = [0] * size
+    boxes = [0] * size
+    empties = []
+    all_digits = (1 << size) - 1
+
+    for row in range(size):
+        band = (row // box_size) * box_size
+        base = row * size
+        for col in range(size):
+            num = values[base + col]
+            box = band + col // box_size
+            if num == 0:
+                mask = allowed[row * size + col] if allowed else all_digits
+                empties.append((row, col, box, mask))
+                continue
+            bit = 1 << (num - 1)
+            if (rows[row] | cols[col] | boxes[box]) & bit:
+                return None  # Duplicate digit in a row, column or box
+            rows[row] |= bit
+            cols[col] |= bit
+            boxes[box] |= bit
+
+    return rows, cols, boxes, empties, all_digits
+
+
+def pick_branch(empties, remaining, rows, cols, boxes, all_digits):
     """
-    Find an empty cell in the grid (represented by 0).
-    Returns a tuple (row, col) if found, otherwise None.
+    Choose what to branch on among the first `remaining` entries of
+    empties. Returns the alternatives as a list of (index, digit_bit)
+    placements, exactly one of which must hold; an empty list means the
+    position is a dead end.
+
+    A cell with a single candidate (naked single) is taken straight away.
+    Otherwise a digit that fits only one cell of a row, column or box
+    (hidden single) is forced there. Failing both, the search branches on
+    the cell with the fewest candidates (MRV), or on a digit with only two
+    places left in some unit when that is narrower.
     """
-    for row in range(9):
-        for col in range(9):
-            if grid[row][col] == 0:
-                return row, col
-    return None
+    best = 0
+    best_count = all_digits.bit_length() + 1
+    cand_list = [0] * remaining
+    for i in range(remaining):
+        row, col, box, mask = empties[i]
+        cands = mask & ~(rows[row] | cols[col] | boxes[box])
+        cand_list[i] = cands
+        count = cands.bit_count()
+        if count < best_count:
+            best, best_count = i, count
+            if count <= 1:
+                return [(i, cands)] if cands else []
+
+    # Digits seen in at least one / two / three cells of each unit
+    size = len(rows)
+    once = [0] * (3 * size)
+    twice = [0] * (3 * size)
+    thrice = [0] * (3 * size)
+    for i in range(remaining):
+        row, col, box, _ = empties[i]
+        cands = cand_list[i]
+        for unit in (row, size + col, 2 * size + box):
+            seen = once[unit]
+            both = seen & cands
+            thrice[unit] |= twice[unit] & cands
+            twice[unit] |= both
+            once[unit] = seen | cands
+
+    used = rows + cols + boxes
+    pair_unit = pair_bit = -1
+    for unit in range(3 * size):
+        needed = all_digits & ~used[unit]
+        if not needed:
+            continue  # Unit already complete
+        if needed & ~once[unit]:
+            return []  # A digit has nowhere left to go
+        hidden = once[unit] & ~twice[unit]
+        if hidden:
+            pair_unit, pair_bit = unit, hidden & -hidden
+            break
+        if pair_unit < 0 and best_count > 2:
+            pairs = twice[unit] & ~thrice[unit]
+            if pairs:
+                pair_unit, pair_bit = unit, pairs & -pairs
+
+    if pair_unit < 0:
+        cands = cand_list[best]
+        choices = []
+        while cands:
+            bit = cands & -cands
+            cands ^= bit
+            choices.append((best, bit))
+        return choices
+
+    # Place the digit in each cell of the unit that can still take it
+    kind, index = divmod(pair_unit, size)
+    return [(i, pair_bit) for i in range(remaining)
+            if empties[i][kind] == index and cand_list[i] & pair_bit]
+
+
+class SearchCancelled(Exception):
+    """Raised inside the search when the caller's cancel flag is set or its budget runs out."""
+
+
+class SearchRestart(Exception):
+    """Raised inside the search when the current randomized run has used up its nodes."""
+
+
+CANCEL_CHECK_INTERVAL = 32  # Nodes between polls of the cancel flag and the clock
+
+# Grids of RESTART_MIN_SIZE or more are searched in randomized runs, the
+# first capped at RESTART_BASE_NODES nodes and each later one RESTART_GROWTH
+# times longer. Search times on large grids are heavy-tailed, so a run
+# stuck under an early bad branch is cheaper to abandon than to finish;
+# the caps grow without bound, so the search stays complete.
+RESTART_MIN_SIZE = 16
+RESTART_BASE_NODES = 2000
+RESTART_GROWTH = 1.5
+
 
-def solve_backtracking(grid):
+def prepare(grid, presolve, stats=None):
     """
-    Solves the Sudoku using backtracking.
-    Returns the solved grid if solvable, otherwise None.
+    Optionally run the logic presolver, then build the search masks.
+    Returns (work, masks), where work is a flat row-major list of the
+    cells to fill in, or None if the puzzle is contradictory.
     """
-    empty = find_empty(grid)
-    if not empty:
-        return grid  # No empty spaces, puzzle solved
-    row, col = empty
+    if not is_valid_board(grid):
+        return None
+    allowed = None
+    if presolve:
+        start_time = time.perf_counter()
+        result = presolver.presolve(grid)
+        if stats is not None:
+            stats.presolve_time = time.perf_counter() - start_time
+        if result is None:
+            return None
+        grid, allowed = result
+    masks = init_masks(grid, allowed)
+    if masks is None:
+        return None
+    return list(cell_values(grid)), masks
 
-    for num in range(1, 10):  # Try numbers 1 through 9
-        if is_valid(grid, row, col, num):
-            grid[row][col] = num
 
-            if solve_backtracking(grid):
-                return grid
+def solve_backtracking(grid, presolve=True, stats=None, cancel=None, budget=None, seed=0):
+    """
+    Solves the Sudoku in place using backtracking over bitmask candidates,
+    branching where the fewest alternatives remain (see pick_branch).
+    grid may be a nested-list board or a Board.
+    With presolve, logic deductions are made first and only what remains
+    is searched. Returns the solved grid if solvable, otherwise None.
+    Grids of RESTART_MIN_SIZE and up are searched in restarted runs that
+    break ties at random, in an order fixed by seed.
+    Pass a SolveStats as stats to have it filled in. cancel may be a
+    threading.Event; once it is set the search gives up and returns None.
+    Likewise with a Budget once it runs out; budget.exceeded then says why.
+    """
+    start_time = time.perf_counter()
+    prepared = prepare(grid, presolve, stats)
+    if prepared is None:
+        if stats is not None:
+            stats.build_time = time.perf_counter() - start_time
+        return None
+    work, masks = prepared
+    rows, cols, boxes, empties, all_digits = masks
+    size = len(rows)
+    built_time = time.perf_counter()
+
+    nodes = branch_points = alternatives = backtracks = 0
+    deepest = len(empties)  # Fewest cells left unfilled at any point
+    next_check = float("inf")  # Node count at which to poll cancel and budget
+    rng = random.Random(seed) if size >= RESTART_MIN_SIZE else None
+    restart_at = float("inf")  # Node count at which the current run gives up
+
+    def checkpoint():
+        nonlocal next_check
+        if cancel is not None and cancel.is_set():
+            raise SearchCancelled
+        if budget is not None and budget.check(nodes):
+            raise SearchCancelled
+        if nodes >= restart_at:
+            raise SearchRestart
+        next_check = restart_at
+        if cancel is not None or budget is not None:
+            next_check = min(next_check, nodes + CANCEL_CHECK_INTERVAL)
+            if budget is not None and budget.max_nodes is not None:
+                # Stop on the first node past the limit, not at the next poll
+                next_check = min(next_check, budget.max_nodes + 1)
+
+    def search(remaining):
+        nonlocal nodes, branch_points, alternatives, backtracks, deepest
+        if remaining == 0:
+            deepest = 0
+            return True  # No empty spaces, puzzle solved
+        if remaining < deepest:
+            deepest = remaining
+
+        last = remaining - 1
+        choices = pick_branch(empties, remaining, rows, cols, boxes, all_digits)
+        if rng is not None:
+            rng.shuffle(choices)
+        branch_points += 1
+        alternatives += len(choices)
+        for index, bit in choices:
+            nodes += 1
+            if nodes >= next_check:
+                checkpoint()
+            # Move the chosen cell out of the unfilled prefix
+            empties[index], empties[last] = empties[last], empties[index]
+            row, col, box, _ = empties[last]
+            rows[row] |= bit
+            cols[col] |= bit
+            boxes[box] |= bit
+
+            if search(last):
+                work[row * size + col] = bit.bit_length()
+                return True
+
+            # Undo the placement and try the next alternative
+            backtracks += 1
+            rows[row] ^= bit
+            cols[col] ^= bit
+            boxes[box] ^= bit
+            empties[index], empties[last] = empties[last], empties[index]
+
+        return False
+
+    if rng is not None:
+        start_masks = rows[:], cols[:], boxes[:]
+        run_nodes = RESTART_BASE_NODES
+    while True:
+        if rng is not None:
+            rng.shuffle(empties)  # Reorders the ties pick_branch breaks by position
+            restart_at = nodes + run_nodes
+            run_nodes *= RESTART_GROWTH
+        try:
+            checkpoint()
+            solved = search(len(empties))
+        except SearchCancelled:
+            solved = False
+        except SearchRestart:
+            # Placements are not undone when a run is abandoned; start afresh
+            rows[:], cols[:], boxes[:] = start_masks
+            continue
+        break
 
-            # If placing the number didn't lead to a solution, backtrack
-            grid[row][col] = 0
+    if stats is not None:
+        stats.engine = "backtracking"
+        stats.solved = solved
+        stats.build_time = built_time - start_time
+        stats.search_time = time.perf_counter() - built_time
+        stats.nodes = nodes
+        stats.branch_points = branch_points
+        stats.alternatives = alternatives
+        stats.backtracks = backtracks
+        stats.max_depth = len(empties) - deepest
 
+    if solved:
+        if isinstance(grid, Board):
+            grid.cells[:] = bytes(work)
+        else:
+            for row, line in enumerate(grid):
+                line[:] = work[row * size:(row + 1) * size]
+        return grid
     return None
 
-def backTrackingSolver(grid):
+
+def count_solutions(grid, limit=2, presolve=True):
+    """
+    Count the solutions of the Sudoku, stopping as soon as `limit` is
+    reached. The grid is left untouched and no solved boards are built.
+    """
+    prepared = prepare(grid, presolve)
+    if prepared is None:
+        return 0
+    _, masks = prepared
+    rows, cols, boxes, empties, all_digits = masks
+
+    def search(remaining, found):
+        if remaining == 0:
+            return found + 1
+
+        last = remaining - 1
+        for index, bit in pick_branch(empties, remaining, rows, cols, boxes, all_digits):
+            if found >= limit:
+                break
+            empties[index], empties[last] = empties[last], empties[index]
+            row, col, box, _ = empties[last]
+            rows[row] |= bit
+            cols[col] |= bit
+            boxes[box] |= bit
+            found = search(last, found)
+            rows[row] ^= bit
+            cols[col] ^= bit
+            boxes[box] ^= bit
+            empties[index], empties[last] = empties[last], empties[index]
+
+        return found
+
+    return search(len(empties), 0)
+
+
+def backTrackingSolver(grid, stats=None, cancel=None, timeout=None, max_nodes=None):
     """
     Solves the Sudoku using backtracking and measures the time taken.
-    Returns the solved grid or None.
+    Returns the solved grid or None. Pass a SolveStats as stats for a
+    breakdown of the solve; its hooks are called when it finishes.
+    Setting the optional cancel event stops the search early.
+    timeout (seconds) and max_nodes bound the solve; when either runs out
+    the grid comes back as None and stats.budget_exceeded says why.
     """
-    # Create a deep copy of the grid to avoid modifying the original
-    grid_copy = copy.deepcopy(grid)
+    budget = Budget.create(timeout, max_nodes)
+
+    # Solve a copy to avoid modifying the original
+    grid_copy = copy_board(grid)
 
     start_time = time.perf_counter()  # Start the timer
 
-    solved_grid = solve_backtracking(grid_copy)
+    solved_grid = solve_backtracking(grid_copy, stats=stats, cancel=cancel, budget=budget)
 
     end_time = time.perf_counter()  # Stop the timer
     elapsed_time = end_time - start_time
 
-    # Print the time taken (optional)
-    print(f"Backtracking Solver: {elapsed_time:.5f} seconds")
+    if stats is not None:
+        if budget is not None:
+            stats.budget_exceeded = budget.exceeded
+        stats.finish()
 
     return solved_grid ,elapsed_time # Return the solved grid or None
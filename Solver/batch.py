@@ -0,0 +1,137 @@
+# Solver/batch.py
+
+import os
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from .budget import BudgetExceeded
+from .engines import get_engine
+from .vectorized import INVALID, SOLVED, propagate_boards
+
+# solution is the solved board or None; elapsed is the solve time in
+# seconds; exceeded is the BudgetExceeded of a solve that ran out of budget
+BatchResult = namedtuple("BatchResult", ["index", "solution", "elapsed", "exceeded"],
+                         defaults=(None,))
+
+CHUNKS_IN_FLIGHT_PER_WORKER = 2  # Bounds memory to a few chunks per worker
+
+
+def solve_chunk(engine, chunk, timeout=None, max_nodes=None, vectorized=False):
+    """
+    Solve a list of (index, board) pairs in the current process, each
+    within the given budget. None boards are passed through unsolved so
+    callers can keep their output aligned with their input.
+    With vectorized=True, singles are first propagated across the whole
+    chunk at once with NumPy (see Solver.vectorized), leaving the engine
+    only the puzzles propagation could not settle.
+    """
+    solve = get_engine(engine)
+    settled = {}
+    if vectorized:
+        chunk, settled = _propagate_chunk(chunk)
+    results = []
+    for index, board in chunk:
+        if board is None:
+            results.append(BatchResult(index, None, 0.0))
+            continue
+        if index in settled:
+            results.append(settled[index])
+            continue
+        start_time = time.perf_counter()
+        solution = solve(board, None, timeout, max_nodes)
+        elapsed = time.perf_counter() - start_time
+        if isinstance(solution, BudgetExceeded):
+            results.append(BatchResult(index, None, elapsed, solution))
+        else:
+            results.append(BatchResult(index, solution, elapsed))
+    return results
+
+
+def _propagate_chunk(chunk):
+    """
+    Run vectorized propagation over a chunk's boards, one batch per grid
+    size. Returns (chunk, settled): the chunk with every board filled in
+    as far as propagation got, and the BatchResults of the puzzles it
+    solved or found contradictory, by index. Their elapsed is an even
+    share of their batch's time.
+    """
+    by_size = {}
+    for index, board in chunk:
+        if board is not None:
+            by_size.setdefault(len(board), []).append(index)
+    boards = dict(chunk)
+    settled = {}
+    for indices in by_size.values():
+        start_time = time.perf_counter()
+        filled, status = propagate_boards([boards[index] for index in indices])
+        share = (time.perf_counter() - start_time) / len(indices)
+        for index, board, state in zip(indices, filled, status):
+            boards[index] = board
+            if state == SOLVED:
+                settled[index] = BatchResult(index, board, share)
+            elif state == INVALID:
+                settled[index] = BatchResult(index, None, share)
+    return [(index, boards[index]) for index, _ in chunk], settled
+
+
+def _chunks(puzzles, chunksize):
+    """Lazily group puzzles into lists of (index, board) pairs."""
+    numbered = enumerate(puzzles)
+    while True:
+        chunk = list(islice(numbered, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_many(puzzles, engine="dlx", workers=None, chunksize=64, ordered=True,
+               timeout=None, max_nodes=None, vectorized=False):
+    """
+    Solve an iterable of boards across a process pool, yielding a
+    BatchResult per puzzle.
+
+    Puzzles are read lazily and at most a few chunks per worker are in
+    flight, so arbitrarily long inputs run in bounded memory. With
+    ordered=True results come back in input order, otherwise as soon as
+    their chunk finishes. workers defaults to the CPU count; workers=1
+    solves in the calling process without a pool.
+    timeout (seconds) and max_nodes bound each solve, so one adversarial
+    puzzle cannot hold up a worker; puzzles that run out of budget come
+    back unsolved with the BatchResult's exceeded set.
+    vectorized=True propagates singles across each chunk with NumPy
+    before the engine runs, which pays off on large batches of easy
+    puzzles; those it settles report a share of their chunk's time.
+    """
+    get_engine(engine)  # Fail fast on unknown engine names
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = _chunks(puzzles, chunksize)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from solve_chunk(engine, chunk, timeout, max_nodes, vectorized)
+        return
+
+    max_in_flight = workers * CHUNKS_IN_FLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque(
+            pool.submit(solve_chunk, engine, chunk, timeout, max_nodes, vectorized)
+            for chunk in islice(chunks, max_in_flight)
+        )
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+
+            for future in done:
+                # Top the pipeline back up before handing results out
+                for chunk in islice(chunks, 1):
+                    pending.append(pool.submit(solve_chunk, engine, chunk, timeout,
+                                               max_nodes, vectorized))
+                yield from future.result()
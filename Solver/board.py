@@ -0,0 +1,167 @@
+# Solver/board.py
+
+import math
+
+BOX_SIZES = range(2, 6)  # 4x4 up to 25x25 grids
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"  # Cell values 1..25
+BLANKS = "0."
+INVALID = 0xFF
+
+
+def box_size(size):
+    """
+    Return the box size of a size x size grid (3 for 9x9).
+    Raises ValueError for sizes that are not a supported square.
+    """
+    box = math.isqrt(size)
+    if box * box != size or box not in BOX_SIZES:
+        raise ValueError(
+            f"unsupported grid size {size}; box sizes "
+            f"{BOX_SIZES[0]} to {BOX_SIZES[-1]} are supported"
+        )
+    return box
+
+
+class Board:
+    """
+    A compact grid: the cell values of a size x size board in one flat
+    bytearray, row-major, 0 for blanks. Copying is a single buffer copy
+    and the contents hash as bytes, so boards can key dicts and sets
+    while they are not being modified.
+
+    board[row] is a writable view of one row, so board[row][col] reads
+    and writes like a nested list; solvers use board.cells directly.
+    """
+
+    __slots__ = ("size", "cells")
+
+    def __init__(self, size=9, cells=None):
+        box_size(size)
+        self.size = size
+        self.cells = bytearray(size * size) if cells is None else bytearray(cells)
+        if len(self.cells) != size * size:
+            raise ValueError(f"expected {size * size} cells, got {len(self.cells)}")
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a Board from a nested-list board."""
+        return cls(len(rows), bytes(value for row in rows for value in row))
+
+    @classmethod
+    def from_line(cls, line):
+        """Parse a single-line puzzle (see parse_line) into a Board."""
+        size, values = _parse_cells(line)
+        return cls(size, values)
+
+    def rows(self):
+        """The board as nested lists."""
+        size, cells = self.size, self.cells
+        return [list(cells[row * size:(row + 1) * size]) for row in range(size)]
+
+    def copy(self):
+        return Board(self.size, self.cells)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.size:
+            raise IndexError("board row out of range")
+        return memoryview(self.cells)[row * self.size:(row + 1) * self.size]
+
+    def __iter__(self):
+        for row in range(self.size):
+            yield self[row]
+
+    def __eq__(self, other):
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self.cells == other.cells
+
+    def __hash__(self):
+        return hash(bytes(self.cells))
+
+    def __repr__(self):
+        return f"Board.from_line({format_board(self)!r})"
+
+
+def board_dimensions(board):
+    """Return (size, box_size) for a nested-list board or a Board."""
+    size = len(board)
+    return size, box_size(size)
+
+
+def cell_values(board):
+    """The cells of a board in row-major order: a Board's own buffer, or a flat list."""
+    if isinstance(board, Board):
+        return board.cells
+    return [value for row in board for value in row]
+
+
+def copy_board(board):
+    """An independent copy of a nested-list board or a Board."""
+    if isinstance(board, Board):
+        return board.copy()
+    return [row[:] for row in board]
+
+
+def board_like(board, values):
+    """
+    Wrap flat row-major values in the same kind of board as `board`:
+    a Board for a Board, nested lists otherwise.
+    """
+    size = len(board)
+    if isinstance(board, Board):
+        return Board(size, values)
+    return [list(values[row * size:(row + 1) * size]) for row in range(size)]
+
+
+def _decode_table(size):
+    """Byte translation table mapping symbols to cell values, else INVALID."""
+    table = bytearray([INVALID]) * 256
+    for blank in BLANKS:
+        table[ord(blank)] = 0
+    for value, symbol in enumerate(SYMBOLS[:size], 1):
+        table[ord(symbol)] = value
+        table[ord(symbol.lower())] = value
+    return bytes(table)
+
+
+# Cell count of a puzzle line -> (size, translation table)
+_LINE_FORMATS = {
+    box ** 4: (box * box, _decode_table(box * box)) for box in BOX_SIZES
+}
+
+
+def parse_line(line):
+    """
+    Parse one puzzle written as a single line of cells, row by row: 81
+    characters for 9x9, 256 for 16x16 and so on. '0' or '.' marks a blank
+    and values above 9 use letters (A=10 ... P=25). Accepts bytes or str;
+    surrounding whitespace is ignored. Raises ValueError for malformed lines.
+    """
+    size, values = _parse_cells(line)
+    return [list(values[row * size:(row + 1) * size]) for row in range(size)]
+
+
+def _parse_cells(line):
+    """Return (size, row-major cell values as bytes) for a puzzle line."""
+    if isinstance(line, str):
+        line = line.encode("ascii", "replace")
+    cells = line.strip()
+    try:
+        size, table = _LINE_FORMATS[len(cells)]
+    except KeyError:
+        counts = ", ".join(str(count) for count in _LINE_FORMATS)
+        raise ValueError(f"expected one of {counts} cells, got {len(cells)}") from None
+
+    values = cells.translate(table)
+    bad = values.find(INVALID)
+    if bad != -1:
+        raise ValueError(f"invalid cell {chr(cells[bad])!r}")
+    return size, values
+
+
+def format_board(board):
+    """Format a board as a single line of symbols, with '.' for blanks."""
+    return "".join(SYMBOLS[value - 1] if value else "." for value in cell_values(board))
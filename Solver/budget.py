@@ -0,0 +1,45 @@
+# Solver/budget.py
+
+import time
+from collections import namedtuple
+
+# Reasons a budget runs out
+TIMEOUT = "timeout"
+MAX_NODES = "max_nodes"
+
+# Returned in place of a solution when a solve runs out of budget. reason
+# is TIMEOUT or MAX_NODES; stats is a SolveStats holding the counters
+# reached so far (the caller's own, if one was passed).
+BudgetExceeded = namedtuple("BudgetExceeded", ["reason", "elapsed", "stats"])
+
+
+class Budget:
+    """
+    Time and node limits for a single solve. timeout is in seconds from
+    when the budget is created; max_nodes caps the rows (DLX) or digits
+    (backtracking) the search may try. Either may be None for no limit.
+    """
+
+    def __init__(self, timeout=None, max_nodes=None):
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.deadline = None if timeout is None else time.perf_counter() + timeout
+        self.exceeded = None  # TIMEOUT or MAX_NODES once a limit is hit
+
+    @classmethod
+    def create(cls, timeout=None, max_nodes=None):
+        """A Budget, or None when neither limit is set."""
+        if timeout is None and max_nodes is None:
+            return None
+        return cls(timeout, max_nodes)
+
+    def check(self, nodes):
+        """
+        Return the reason the budget is spent after `nodes` search nodes,
+        or None while it lasts. The reason is also kept in self.exceeded.
+        """
+        if self.max_nodes is not None and nodes > self.max_nodes:
+            self.exceeded = MAX_NODES
+        elif self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.exceeded = TIMEOUT
+        return self.exceeded
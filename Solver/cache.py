@@ -0,0 +1,103 @@
+# Solver/cache.py
+
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from .board import format_board, parse_line
+from .canonical import canonicalize
+
+# Stored in place of a solution for puzzles known to have none
+NO_SOLUTION = ""
+
+
+class SolutionCache:
+    """
+    Solutions keyed by canonical form, so a puzzle that is a relabeled,
+    permuted or transposed copy of one seen before is answered without
+    search.
+
+    An in-memory LRU holds up to maxsize entries. With a path, entries are
+    also written to a sqlite file and looked up there on a memory miss, so
+    the cache outlives the process. Solutions are stored in the canonical
+    orientation and mapped back to the caller's on every hit.
+    """
+
+    def __init__(self, maxsize=4096, path=None):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions (puzzle TEXT PRIMARY KEY, solution TEXT)"
+            )
+            self.db.commit()
+
+    def lookup(self, board):
+        """
+        Return (found, solution, token). found tells whether the puzzle was
+        cached; solution is then the solved board in the caller's
+        orientation, or None if it is known to have no solution. Pass token
+        to store() after solving a miss; it is None for puzzles that cannot
+        be cached.
+        """
+        token = canonicalize(board)
+        if token is None:
+            return False, None, None
+        key, transform = token
+        with self.lock:
+            stored = self.entries.get(key)
+            if stored is not None:
+                self.entries.move_to_end(key)
+            elif self.db is not None:
+                row = self.db.execute(
+                    "SELECT solution FROM solutions WHERE puzzle = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    stored = row[0]
+                    self._remember(key, stored)
+            if stored is None:
+                self.misses += 1
+                return False, None, token
+            self.hits += 1
+        if stored == NO_SOLUTION:
+            return True, None, token
+        return True, transform.invert(parse_line(stored)), token
+
+    def store(self, token, solution):
+        """Cache the solution (or None for no solution) of a looked-up puzzle."""
+        if token is None:
+            return
+        key, transform = token
+        stored = NO_SOLUTION if solution is None else format_board(transform.apply(solution))
+        with self.lock:
+            self._remember(key, stored)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO solutions (puzzle, solution) VALUES (?, ?)",
+                    (key, stored),
+                )
+                self.db.commit()
+
+    def _remember(self, key, stored):
+        self.entries[key] = stored
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Empty the in-memory tier; the on-disk store is kept."""
+        with self.lock:
+            self.entries.clear()
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,162 @@
+# Solver/canonical.py
+
+from itertools import groupby, permutations, product
+from math import factorial, prod
+
+from .board import box_size, format_board
+
+# Puzzles whose symmetries leave more orderings than this to compare are
+# not canonicalized; callers just solve them directly.
+MAX_ORDERINGS = 1024
+
+
+class Transform:
+    """
+    A validity-preserving relabeling of a grid: optional transposition,
+    then a row order and a column order (bands, stacks and the lines
+    inside them permuted as blocks), then a digit relabeling.
+    apply() maps a board of the original orientation to the canonical
+    one and invert() maps it back.
+    """
+
+    def __init__(self, transposed, rows, cols, labels):
+        self.transposed = transposed
+        self.rows = rows
+        self.cols = cols
+        self.labels = labels  # labels[digit] -> canonical digit, labels[0] == 0
+        self.inverse = [0] * len(labels)
+        for digit, label in enumerate(labels):
+            self.inverse[label] = digit
+
+    def apply(self, board):
+        if self.transposed:
+            board = [list(line) for line in zip(*board)]
+        labels = self.labels
+        return [[labels[board[row][col]] for col in self.cols] for row in self.rows]
+
+    def invert(self, board):
+        size = len(board)
+        inverse = self.inverse
+        original = [[0] * size for _ in range(size)]
+        for i, row in enumerate(self.rows):
+            line = original[row]
+            for j, col in enumerate(self.cols):
+                line[col] = inverse[board[i][j]]
+        if self.transposed:
+            original = [list(line) for line in zip(*original)]
+        return original
+
+
+def _line_signatures(grid, other_counts, frequency):
+    """
+    Describe each row of grid in terms that survive every transform: its
+    clue count and, per clue, how many clues share its column and how
+    often its digit occurs on the whole board.
+    """
+    signatures = []
+    for line in grid:
+        clues = sorted((other_counts[col], frequency[value])
+                       for col, value in enumerate(line) if value)
+        signatures.append((len(clues), tuple(clues)))
+    return signatures
+
+
+def _tied_orders(items, key):
+    """Every ordering of items sorted by key, permuting only runs of equal keys."""
+    runs = [list(run) for _, run in groupby(sorted(items, key=key), key=key)]
+    count = prod(factorial(len(run)) for run in runs)
+    orders = (
+        [item for run in choice for item in run]
+        for choice in product(*(permutations(run) for run in runs))
+    )
+    return count, orders
+
+
+def _line_orders(signatures, box):
+    """
+    Candidate line orders: bands sorted by the sorted signatures of their
+    lines, lines sorted within each band. Returns (count, orders) or None
+    if ties leave more than MAX_ORDERINGS to try.
+    """
+    bands = [list(range(start, start + box)) for start in range(0, box * box, box)]
+    band_key = lambda band: sorted(signatures[line] for line in band)
+    band_count, band_orders = _tied_orders(bands, band_key)
+
+    inner = []
+    count = band_count
+    for band in bands:
+        line_count, line_orders = _tied_orders(band, signatures.__getitem__)
+        count *= line_count
+        if count > MAX_ORDERINGS:
+            return None
+        inner.append(list(line_orders))
+
+    by_band = {band[0]: orders for band, orders in zip(bands, inner)}
+    orders = []
+    for band_order in band_orders:
+        for choice in product(*(by_band[band[0]] for band in band_order)):
+            orders.append([line for lines in choice for line in lines])
+    return count, orders
+
+
+def canonicalize(board):
+    """
+    Return (key, transform) for a board, where key is the same string for
+    every board that is equivalent up to digit relabeling, row/column
+    swaps within bands and stacks, band/stack swaps and transposition,
+    and transform maps this board onto that canonical form. Returns None
+    for boards too symmetric to canonicalize within MAX_ORDERINGS.
+    """
+    size = len(board)
+    box = box_size(size)
+    frequency = [0] * (size + 1)
+    for line in board:
+        for value in line:
+            frequency[value] += 1
+
+    candidates = []
+    total = 0
+    transposed_board = [list(line) for line in zip(*board)]
+    for transposed, grid in ((False, board), (True, transposed_board)):
+        other = transposed_board if not transposed else board
+        row_counts = [sum(1 for value in line if value) for line in grid]
+        col_counts = [sum(1 for value in line if value) for line in other]
+        row_orders = _line_orders(_line_signatures(grid, col_counts, frequency), box)
+        col_orders = _line_orders(_line_signatures(other, row_counts, frequency), box)
+        if row_orders is None or col_orders is None:
+            return None
+        total += row_orders[0] * col_orders[0]
+        if total > MAX_ORDERINGS:
+            return None
+        candidates.append((transposed, grid, row_orders[1], col_orders[1]))
+
+    best = best_transform = None
+    for transposed, grid, row_orders, col_orders in candidates:
+        for rows in row_orders:
+            for cols in col_orders:
+                # Relabel digits in order of first appearance
+                labels = {}
+                cells = []
+                for row in rows:
+                    line = grid[row]
+                    for col in cols:
+                        value = line[col]
+                        if value:
+                            label = labels.get(value)
+                            if label is None:
+                                label = labels[value] = len(labels) + 1
+                            value = label
+                        cells.append(value)
+                if best is None or cells < best:
+                    best = cells
+                    best_transform = (transposed, rows, cols, labels)
+
+    transposed, rows, cols, labels = best_transform
+    # Digits missing from the board take the leftover labels in order
+    table = [0] * (size + 1)
+    unused = iter(label for label in range(1, size + 1) if label not in labels.values())
+    for digit in range(1, size + 1):
+        table[digit] = labels[digit] if digit in labels else next(unused)
+
+    key = format_board([best[row * size:(row + 1) * size] for row in range(size)])
+    return key, Transform(transposed, rows, cols, table)
@@ -0,0 +1,110 @@
+# Solver/cli.py
+
+import argparse
+import sys
+import time
+from collections import deque
+
+from .batch import solve_many
+from .board import Board, format_board
+from .engines import ENGINES
+
+IO_BUFFER_SIZE = 1 << 20
+NO_SOLUTION = b"No solution"
+INVALID = b"Invalid puzzle"
+BUDGET_EXCEEDED = b"Budget exceeded"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m Solver",
+        description="Solve Sudoku puzzles, one line of cells per puzzle (81 "
+                    "characters for 9x9, 16, 256 or 625 for other sizes, '0' or "
+                    "'.' for blanks), streaming solutions to stdout.",
+    )
+    parser.add_argument("input", nargs="?", default="-",
+                        help="puzzle file to read (default: stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file to write solutions to (default: stdout)")
+    parser.add_argument("-e", "--engine", choices=sorted(ENGINES), default="dlx",
+                        help="solver engine (default: dlx)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="worker processes (default: 1, no pool)")
+    parser.add_argument("--chunksize", type=int, default=256,
+                        help="puzzles sent to a worker at a time (default: 256)")
+    parser.add_argument("--timeout", type=float,
+                        help="give up on a puzzle after this many seconds")
+    parser.add_argument("--max-nodes", type=int,
+                        help="give up on a puzzle after this many search nodes")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="propagate singles across each chunk with NumPy first")
+    parser.add_argument("--summary", action="store_true",
+                        help="print a throughput summary to stderr")
+    return parser
+
+
+def open_binary(path, mode):
+    """Open a path, or stdin/stdout for '-', as a large-buffered binary stream."""
+    if path == "-":
+        stream = sys.stdin if "r" in mode else sys.stdout
+        return open(stream.fileno(), mode, buffering=IO_BUFFER_SIZE, closefd=False)
+    return open(path, mode, buffering=IO_BUFFER_SIZE)
+
+
+def read_puzzles(stream, valid):
+    """
+    Lazily parse puzzles from a stream, skipping blank and '#' lines.
+    Invalid lines are yielded as None and recorded in `valid` so the
+    output stays aligned with the input.
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith(b"#"):
+            continue
+        try:
+            board = Board.from_line(line)
+        except ValueError as error:
+            print(f"line {line_number}: {error}", file=sys.stderr)
+            valid.append(False)
+            yield None
+            continue
+        valid.append(True)
+        yield board
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    valid = deque()
+    solved = unsolved = invalid = exceeded = 0
+    start_time = time.perf_counter()
+
+    with open_binary(args.input, "rb") as source, open_binary(args.output, "wb") as sink:
+        puzzles = read_puzzles(source, valid)
+        results = solve_many(puzzles, engine=args.engine, workers=args.workers,
+                             chunksize=args.chunksize, ordered=True,
+                             timeout=args.timeout, max_nodes=args.max_nodes,
+                             vectorized=args.vectorized)
+        for result in results:
+            if not valid.popleft():
+                sink.write(INVALID)
+                invalid += 1
+            elif result.exceeded is not None:
+                sink.write(BUDGET_EXCEEDED)
+                exceeded += 1
+            elif result.solution is None:
+                sink.write(NO_SOLUTION)
+                unsolved += 1
+            else:
+                sink.write(format_board(result.solution).encode("ascii"))
+                solved += 1
+            sink.write(b"\n")
+
+    if args.summary:
+        elapsed = time.perf_counter() - start_time
+        total = solved + unsolved + invalid + exceeded
+        rate = total / elapsed if elapsed else 0.0
+        print(f"{total} puzzles ({solved} solved, {unsolved} unsolvable, "
+              f"{invalid} invalid, {exceeded} over budget) in {elapsed:.3f} seconds, "
+              f"{rate:.1f}/s",
+              file=sys.stderr)
+    return 1 if invalid else 0
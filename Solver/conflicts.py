@@ -0,0 +1,126 @@
+# Solver/conflicts.py
+
+from .board import Board, box_size
+
+
+class ConflictTracker:
+    """
+    Keeps track of clashing digits on a grid that is edited one cell at a
+    time. For every row, column and box it records which cells hold each
+    digit, so setting a cell only touches its three units instead of
+    rescanning the board.
+
+    conflicts is the set of (row, col) cells whose digit also appears
+    elsewhere in one of their units; it is kept up to date by set_cell().
+    """
+
+    def __init__(self, size=9):
+        self.size = size
+        self.box_size = box_size(size)
+        self.values = [[0] * size for _ in range(size)]
+        # positions[unit][digit]: cells of the unit holding the digit.
+        # Units are numbered rows first, then columns, then boxes.
+        self.positions = [[set() for _ in range(size + 1)] for _ in range(3 * size)]
+        self.conflicts = set()
+
+    @classmethod
+    def from_board(cls, board):
+        """Build a tracker holding the digits of a nested-list board."""
+        tracker = cls(len(board))
+        tracker.load(board)
+        return tracker
+
+    def units(self, row, col):
+        """The row, column and box unit numbers of a cell."""
+        box = self.box_size
+        return (row, self.size + col,
+                2 * self.size + (row // box) * box + col // box)
+
+    def set_cell(self, row, col, value):
+        """Put value (0 to clear) in a cell and update the conflicts."""
+        old = self.values[row][col]
+        if old == value:
+            return
+        if not 0 <= value <= self.size:
+            raise ValueError(f"value {value} out of range for a {self.size}x{self.size} grid")
+        self.values[row][col] = value
+        cell = (row, col)
+        affected = {cell}
+        for unit in self.units(row, col):
+            if old:
+                holders = self.positions[unit][old]
+                holders.discard(cell)
+                affected.update(holders)
+            if value:
+                holders = self.positions[unit][value]
+                holders.add(cell)
+                affected.update(holders)
+        for other in affected:
+            if self.clashes(*other):
+                self.conflicts.add(other)
+            else:
+                self.conflicts.discard(other)
+
+    def clashes(self, row, col):
+        """True if the cell's digit appears again in one of its units."""
+        value = self.values[row][col]
+        if not value:
+            return False
+        return any(len(self.positions[unit][value]) > 1 for unit in self.units(row, col))
+
+    def load(self, board):
+        """Replace the tracked grid with the digits of a board."""
+        self.reset()
+        for row, values in enumerate(board):
+            for col, value in enumerate(values):
+                if value:
+                    self.set_cell(row, col, value)
+
+    def reset(self):
+        """Clear every cell."""
+        for row in self.values:
+            row[:] = [0] * self.size
+        for unit in self.positions:
+            for holders in unit:
+                holders.clear()
+        self.conflicts.clear()
+
+    def is_valid(self):
+        """True if no digit is repeated in any row, column or box."""
+        return not self.conflicts
+
+
+def is_valid_board(board):
+    """
+    Fast one-pass check that a nested-list board or Board has no out-of-range
+    values and no digit repeated in a row, column or box. Solvers call
+    this before building any search state for the board.
+    """
+    size = len(board)
+    box = box_size(size)
+    if isinstance(board, Board):
+        cells = board.cells
+    else:
+        if any(len(values) != size for values in board):
+            return False
+        cells = [value for values in board for value in values]
+    rows = [0] * size
+    cols = [0] * size
+    boxes = [0] * size
+    for row in range(size):
+        band = (row // box) * box
+        base = row * size
+        for col in range(size):
+            value = cells[base + col]
+            if not value:
+                continue
+            if not 0 < value <= size:
+                return False
+            bit = 1 << value
+            unit = band + col // box
+            if (rows[row] | cols[col] | boxes[unit]) & bit:
+                return False
+            rows[row] |= bit
+            cols[col] |= bit
+            boxes[unit] |= bit
+    return True
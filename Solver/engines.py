@@ -0,0 +1,58 @@
+# Solver/engines.py
+
+from .backtracking import backTrackingSolver
+from .budget import BudgetExceeded
+from .DLX import SudokuSolver
+from .features import choose_engine, puzzle_features
+from .stats import SolveStats
+
+_dlx_solver = SudokuSolver()
+
+
+def solve_with_backtracking(board, cancel=None, timeout=None, max_nodes=None):
+    """Return the solved board using the bitmask backtracking engine, or None."""
+    # Budgeted solves keep stats so an overrun can be told from no solution
+    stats = SolveStats() if timeout is not None or max_nodes is not None else None
+    solution, elapsed = backTrackingSolver(board, stats, cancel, timeout, max_nodes)
+    if stats is not None and stats.budget_exceeded is not None:
+        return BudgetExceeded(stats.budget_exceeded, elapsed, stats)
+    return solution
+
+
+def solve_with_dlx(board, cancel=None, timeout=None, max_nodes=None):
+    """Return the first DLX solution of the board, or None."""
+    result = _dlx_solver.solve(board, cancel=cancel, timeout=timeout, max_nodes=max_nodes)
+    if result["budget_exceeded"] is not None:
+        return result["budget_exceeded"]
+    solutions = result["found_solutions"]
+    return solutions[0] if solutions else None
+
+
+def solve_with_auto(board, cancel=None, timeout=None, max_nodes=None):
+    """
+    Pick backtracking or DLX from the puzzle's features; close calls go
+    to DLX, whose worst cases are milder. See Solver.portfolio for racing.
+    """
+    engine = choose_engine(puzzle_features(board)) or "dlx"
+    return ENGINES[engine](board, cancel, timeout, max_nodes)
+
+
+# Engine name -> function(board, cancel=None, timeout=None, max_nodes=None)
+# returning a solved board or None. cancel, if given, is an Event-like
+# object that stops the solve. timeout (seconds) and max_nodes bound the
+# solve; if either runs out a BudgetExceeded is returned instead.
+ENGINES = {
+    "auto": solve_with_auto,
+    "backtracking": solve_with_backtracking,
+    "dlx": solve_with_dlx,
+}
+
+
+def get_engine(name):
+    """Look up an engine by name, raising ValueError for unknown names."""
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown engine {name!r}; expected one of {', '.join(sorted(ENGINES))}"
+        ) from None
@@ -0,0 +1,169 @@
+# Solver/features.py
+
+import json
+from collections import namedtuple
+from itertools import product
+
+from .backtracking import init_masks
+
+# clue_fraction: share of cells given. candidate_density: average share
+# of digits still open in an empty cell, counting only row, column and
+# box eliminations. Both are cheap compared with any solve.
+Features = namedtuple("Features", ["size", "clue_fraction", "candidate_density"])
+
+# A puzzle goes to backtracking when it has at least
+# backtracking_min_clues of its cells given and a candidate density of at
+# most backtracking_max_density; to DLX when it has at most dlx_max_clues
+# given or a density of at least dlx_min_density. Anything else is a
+# close call that the portfolio settles by racing both engines.
+# A threshold of None leaves its test out; a rule with all its tests left
+# out never fires. Where the engines cross over depends on the grid size,
+# so thresholds are kept per size.
+Thresholds = namedtuple("Thresholds", [
+    "backtracking_min_clues", "backtracking_max_density",
+    "dlx_max_clues", "dlx_min_density",
+])
+
+# Grid size -> Thresholds, learned with `python -m benchmarks.portfolio
+# --cores 2`. Sizes without an entry use the nearest size that has one.
+# On 9x9 and 16x16 grids one engine is reliably the faster for a given
+# density, so nothing is raced. Sparse 25x25 grids near their hardness
+# peak are raced: either engine can stall for seconds on a puzzle the
+# other solves in milliseconds, and no feature tells which.
+DEFAULT_THRESHOLDS = {
+    9: Thresholds(None, 0.559, None, 0.111),
+    16: Thresholds(None, 0.408, None, 0.23),
+    25: Thresholds(0.515, None, None, 0.238),
+}
+
+# Expected cost in seconds of racing on top of the winner's solve time:
+# shipping the board to the warm workers, the result back and stopping
+# the loser, as measured by `python -m benchmarks.portfolio`
+RACE_OVERHEAD = 0.0016
+
+# Cores the fit assumes a race gets. PortfolioSolver only races on
+# machines with more than one CPU, so the defaults are fitted for two.
+RACE_CORES = 2
+
+
+def puzzle_features(board):
+    """Return the Features of a board, or None if its givens clash."""
+    masks = init_masks(board)
+    if masks is None:
+        return None
+    rows, cols, boxes, empties, _ = masks
+    size = len(board)
+    open_digits = 0
+    for row, col, box, mask in empties:
+        open_digits += (mask & ~(rows[row] | cols[col] | boxes[box])).bit_count()
+    cells = size * size
+    density = open_digits / (len(empties) * size) if empties else 0.0
+    return Features(size, (cells - len(empties)) / cells, density)
+
+
+def _at_least(value, limit):
+    return None if limit is None else value >= limit
+
+
+def _at_most(value, limit):
+    return None if limit is None else value <= limit
+
+
+def choose_engine(features, thresholds=DEFAULT_THRESHOLDS):
+    """Return "backtracking" or "dlx" for a puzzle, or None if it is a close call."""
+    if features is None:
+        return "dlx"  # Clashing givens are rejected at once either way
+    size = min(thresholds, key=lambda known: abs(known - features.size))
+    limits = thresholds[size]
+    clues, density = features.clue_fraction, features.candidate_density
+    backtracking = [test for test in (_at_least(clues, limits.backtracking_min_clues),
+                                      _at_most(density, limits.backtracking_max_density))
+                    if test is not None]
+    if backtracking and all(backtracking):
+        return "backtracking"
+    if _at_most(clues, limits.dlx_max_clues) or _at_least(density, limits.dlx_min_density):
+        return "dlx"
+    return None
+
+
+def race_time(times, race_overhead=RACE_OVERHEAD, cores=RACE_CORES):
+    """
+    Expected time of racing engines whose solo times are given: the
+    fastest one, slowed down when there are fewer cores than engines to
+    share them, plus the race overhead.
+    """
+    slowdown = max(1.0, len(times) / cores)
+    return min(times.values()) * slowdown + race_overhead
+
+
+def decision_times(thresholds, history, race_overhead=RACE_OVERHEAD, cores=RACE_CORES):
+    """Per-puzzle solve times the thresholds would have led to on the history."""
+    spent = []
+    for features, times in history:
+        engine = choose_engine(features, thresholds)
+        if engine is None:
+            spent.append(race_time(times, race_overhead, cores))
+        else:
+            spent.append(times[engine])
+    return spent
+
+
+def decision_cost(thresholds, history, race_overhead=RACE_OVERHEAD, cores=RACE_CORES):
+    """
+    Score thresholds on the history as mean plus 95th percentile solve
+    time, so a rule that saves a little on average but leaves a slow tail
+    loses to one that races the puzzles it cannot call.
+    """
+    spent = sorted(decision_times(thresholds, history, race_overhead, cores))
+    if not spent:
+        return 0.0
+    tail = spent[max(0, round(0.95 * len(spent)) - 1)]
+    return sum(spent) / len(spent) + tail
+
+
+def _quantiles(values, steps=10):
+    values = sorted(values)
+    picks = {values[round(i * (len(values) - 1) / steps)] for i in range(steps + 1)}
+    return sorted(picks)
+
+
+def _fit(history, race_overhead, cores):
+    """The Thresholds with the lowest decision_cost over one size's history."""
+    # None leaves a test out
+    clue_cuts = [None] + _quantiles(features.clue_fraction for features, _ in history)
+    density_cuts = [None] + _quantiles(features.candidate_density for features, _ in history)
+
+    size = history[0][0].size
+    best = best_cost = None
+    for values in product(clue_cuts, density_cuts, clue_cuts, density_cuts):
+        thresholds = {size: Thresholds(*(None if value is None else round(value, 3)
+                                         for value in values))}
+        cost = decision_cost(thresholds, history, race_overhead, cores)
+        if best_cost is None or cost < best_cost:
+            best, best_cost = thresholds[size], cost
+    return best
+
+
+def learn_thresholds(history, race_overhead=RACE_OVERHEAD, cores=RACE_CORES):
+    """
+    Fit thresholds to benchmark history: a list of (Features, times)
+    pairs where times maps each engine name to its solve time in seconds.
+    For each grid size, every combination of feature quantiles is tried
+    and the one with the best decision_cost, counting races as race_time
+    on `cores` cores, is kept.
+    """
+    by_size = {}
+    for features, times in history:
+        if features is not None:
+            by_size.setdefault(features.size, []).append((features, times))
+    if not by_size:
+        return dict(DEFAULT_THRESHOLDS)
+    return {size: _fit(entries, race_overhead, cores)
+            for size, entries in sorted(by_size.items())}
+
+
+def load_thresholds(path):
+    """Read thresholds written by `python -m benchmarks.portfolio --output`."""
+    with open(path) as handle:
+        data = json.load(handle)
+    return {int(size): Thresholds(**values) for size, values in data["thresholds"].items()}
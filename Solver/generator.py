@@ -0,0 +1,294 @@
+# Solver/generator.py
+
+import os
+import random
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from . import presolve as presolver
+from .array_dlx import acquire_sudoku_template, release_sudoku_template
+from .board import box_size, format_board
+from .DLX import SudokuSolver
+from .stats import SolveStats
+
+GeneratedPuzzle = namedtuple("GeneratedPuzzle", ["puzzle", "solution", "difficulty"])
+
+# Difficulty bands from easiest to hardest:
+#   easy    solved by the presolver's logic alone, with plenty of clues
+#   medium  solved by logic alone
+#   hard    needs search, but little backtracking
+#   expert  needs real search
+DIFFICULTIES = ("easy", "medium", "hard", "expert")
+EASY_MIN_CLUES = 0.4  # Fraction of cells given for an easy puzzle
+HARD_MAX_BACKTRACKS = 20
+
+
+def _mirror_horizontal(size, row, col):
+    return [(row, size - 1 - col)]
+
+
+def _mirror_vertical(size, row, col):
+    return [(size - 1 - row, col)]
+
+
+def _rotate_half(size, row, col):
+    return [(size - 1 - row, size - 1 - col)]
+
+
+def _mirror_diagonal(size, row, col):
+    return [(col, row)]
+
+
+def _rotate_quarter(size, row, col):
+    return [(col, size - 1 - row)]
+
+
+# Symmetry name -> functions mapping a cell to its images. Clues are
+# removed a whole orbit at a time so the pattern is kept.
+SYMMETRIES = {
+    "none": (),
+    "rotational": (_rotate_half,),
+    "quarter": (_rotate_quarter,),
+    "horizontal": (_mirror_horizontal,),
+    "vertical": (_mirror_vertical,),
+    "diagonal": (_mirror_diagonal,),
+    "full": (_mirror_horizontal, _mirror_vertical, _mirror_diagonal),
+}
+
+
+def cell_orbits(size, symmetry):
+    """Partition the cells of a grid into the orbits of a symmetry."""
+    try:
+        images = SYMMETRIES[symmetry]
+    except KeyError:
+        raise ValueError(
+            f"Unknown symmetry {symmetry!r}; expected one of {', '.join(SYMMETRIES)}"
+        ) from None
+    orbits = []
+    seen = set()
+    for row in range(size):
+        for col in range(size):
+            if (row, col) in seen:
+                continue
+            orbit = {(row, col)}
+            frontier = [(row, col)]
+            while frontier:
+                cell = frontier.pop()
+                for image in images:
+                    for other in image(size, *cell):
+                        if other not in orbit:
+                            orbit.add(other)
+                            frontier.append(other)
+            seen |= orbit
+            orbits.append(sorted(orbit))
+    return orbits
+
+
+def difficulty_rank(difficulty):
+    try:
+        return DIFFICULTIES.index(difficulty)
+    except ValueError:
+        raise ValueError(
+            f"Unknown difficulty {difficulty!r}; expected one of {', '.join(DIFFICULTIES)}"
+        ) from None
+
+
+def rate(board, solver=None):
+    """
+    Return the difficulty band of a puzzle with a unique solution, judged
+    by how far the logic presolver gets and how much the DLX search has to
+    backtrack afterwards.
+    """
+    result = presolver.presolve(board)
+    if result is not None and all(all(row) for row in result[0]):
+        clues = sum(1 for row in board for value in row if value)
+        return "easy" if clues >= EASY_MIN_CLUES * len(board) ** 2 else "medium"
+    solver = solver or SudokuSolver()
+    stats = SolveStats()
+    solver.solve(board, stats=stats)
+    return "hard" if stats.backtracks <= HARD_MAX_BACKTRACKS else "expert"
+
+
+def random_solution(size, rng, solver=None):
+    """
+    A random complete grid: the boxes on the main diagonal share no row,
+    column or box, so they are filled with independent random permutations
+    and DLX completes the rest.
+    """
+    solver = solver or SudokuSolver()
+    box = box_size(size)
+    digits = list(range(1, size + 1))
+    while True:
+        board = [[0] * size for _ in range(size)]
+        for start in range(0, size, box):
+            rng.shuffle(digits)
+            for i, digit in enumerate(digits):
+                board[start + i // box][start + i % box] = digit
+        solutions = solver.solve(board)["found_solutions"]
+        if solutions:
+            return solutions[0]
+
+
+def has_other_solution(solver, dlx, board, solution, cells):
+    """
+    Check whether the puzzle `board`, whose blanks include `cells`, has a
+    solution other than `solution`. The board without `cells` must already
+    be known to be unique, so any other solution differs in one of them:
+    each cell's known digit is forbidden in turn and DLX looks for any
+    solution at all. A board the presolver completes is unique outright.
+    """
+    size = len(board)
+    # Cheapest first: each removed cell may still be a naked single
+    _, peers, _ = presolver.geometry(size, box_size(size))
+    all_digits = (1 << size) - 1
+    forced = True
+    for row, col in cells:
+        seen = 0
+        for peer in peers[row * size + col]:
+            value = board[peer // size][peer % size]
+            if value:
+                seen |= 1 << (value - 1)
+        if (all_digits & ~seen).bit_count() != 1:
+            forced = False
+            break
+    if forced:
+        return False
+
+    # Then logic, which usually settles the rest
+    result = presolver.presolve(board)
+    if result is None:
+        return False
+    grid, cands = result
+    if all(grid[row][col] for row, col in cells):
+        return False
+
+    for row, col in cells:
+        if grid[row][col]:
+            continue  # Forced by logic
+        # Forbid the known digit and look for any solution at all
+        cell = row * size + col
+        allowed = cands[cell]
+        cands[cell] = allowed & ~(1 << (solution[row][col] - 1))
+        loaded = solver.load_presolved(dlx, grid, cands)
+        cands[cell] = allowed
+        if loaded is None:
+            continue
+        search = dlx.search()
+        found = search.run()
+        search.close()
+        solver.unload_board(dlx, loaded)
+        if found:
+            return True
+    return False
+
+
+def generate_puzzle(size=9, symmetry="none", difficulty=None, rng=None, max_attempts=20):
+    """
+    Generate a puzzle with exactly one solution.
+
+    A random grid is filled in, then clues are removed one symmetry orbit
+    at a time in random order, keeping each removal only if the solution
+    stays unique and, with a target difficulty, the puzzle does not get
+    harder than that band. The result is minimal for its symmetry unless
+    the difficulty cap stopped it early. Grids that end up easier than the
+    target are thrown away and a new one is tried, up to max_attempts.
+    Returns a GeneratedPuzzle, or None if no grid reached the target.
+    """
+    rng = rng or random.Random()
+    target = difficulty_rank(difficulty) if difficulty is not None else None
+    orbits = cell_orbits(size, symmetry)
+    solver = SudokuSolver()
+    box = box_size(size)
+
+    for _ in range(max_attempts):
+        solution = random_solution(size, rng, solver)
+        board = [row[:] for row in solution]
+        rng.shuffle(orbits)
+        dlx = acquire_sudoku_template(size, box)
+        try:
+            for orbit in orbits:
+                for row, col in orbit:
+                    board[row][col] = 0
+                keep = not has_other_solution(solver, dlx, board, solution, orbit)
+                if keep and target is not None and target < len(DIFFICULTIES) - 1:
+                    keep = difficulty_rank(rate(board, solver)) <= target
+                if not keep:
+                    for row, col in orbit:
+                        board[row][col] = solution[row][col]
+        finally:
+            release_sudoku_template(size, dlx)
+
+        rating = rate(board, solver)
+        if target is None or difficulty_rank(rating) == target:
+            return GeneratedPuzzle(board, solution, rating)
+    return None
+
+
+def generate_chunk(count, size, symmetry, difficulty, seed, max_attempts=20):
+    """Generate up to `count` puzzles in the current process."""
+    rng = random.Random(seed)
+    puzzles = []
+    for _ in range(count):
+        puzzle = generate_puzzle(size, symmetry, difficulty, rng, max_attempts)
+        if puzzle is not None:
+            puzzles.append(puzzle)
+    return puzzles
+
+
+def generate_many(count, size=9, symmetry="none", difficulty=None, workers=None,
+                  chunksize=16, seed=None, max_attempts=20):
+    """
+    Generate `count` distinct puzzles across a process pool, yielding
+    GeneratedPuzzle tuples as chunks finish. workers defaults to the CPU
+    count; workers=1 generates in the calling process. A seed makes the
+    output reproducible for a given worker layout.
+
+    Generation stops early, with fewer than `count` puzzles, once
+    max_attempts chunks in a row have finished without a new one: the
+    difficulty is out of reach for the size and symmetry, or there are
+    not `count` distinct puzzles to find.
+    """
+    if difficulty is not None:
+        difficulty_rank(difficulty)  # Fail fast on unknown bands
+    cell_orbits(size, symmetry)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if seed is None:
+        seed = int.from_bytes(os.urandom(8), "little")
+
+    seen = set()
+    produced = 0
+    chunk_index = 0
+    stale = 0  # Chunks finished in a row without a new puzzle
+
+    def next_chunk():
+        nonlocal chunk_index
+        chunk_index += 1
+        return (chunksize, size, symmetry, difficulty, f"{seed}:{chunk_index}", max_attempts)
+
+    def take(puzzles):
+        # Drop repeats so every puzzle handed out is distinct
+        nonlocal produced, stale
+        before = produced
+        for puzzle in puzzles:
+            key = format_board(puzzle.puzzle)
+            if produced < count and key not in seen:
+                seen.add(key)
+                produced += 1
+                yield puzzle
+        stale = 0 if produced > before else stale + 1
+
+    if workers <= 1:
+        while produced < count and stale < max_attempts:
+            yield from take(generate_chunk(*next_chunk()))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque(pool.submit(generate_chunk, *next_chunk())
+                        for _ in range(workers * 2))
+        while produced < count and stale < max_attempts:
+            future = pending.popleft()
+            pending.append(pool.submit(generate_chunk, *next_chunk()))
+            yield from take(future.result())
+        for future in pending:
+            future.cancel()
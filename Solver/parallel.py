@@ -0,0 +1,316 @@
+# Solver/parallel.py
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .array_dlx import (
+    acquire_sudoku_template,
+    fill_sudoku_solution,
+    release_sudoku_template,
+)
+from .board import board_dimensions, board_like, cell_values, format_board, parse_line
+from .conflicts import is_valid_board
+from .DLX import SudokuSolver
+from .search import PAUSED
+from .workers import CANCEL_POLL_INTERVAL, JobStopped, init_worker, ping, stop_flag
+
+FRONTIER_PER_WORKER = 8  # Subproblems per worker the frontier is grown to
+MAX_SPLIT_DEPTH = 12  # Deepest level the frontier is grown to automatically
+SPLIT_CHECK_NODES = 256  # Nodes a worker searches between checks for idle workers
+
+FIRST = "first"
+COUNT = "count"
+
+# In workers: the number of subproblems the coordinator wants split off
+# for idle workers, and the puzzle loaded for the current job as
+# (job, dlx, loaded)
+_wanted_splits = None
+_loaded = None
+
+_loader = SudokuSolver()
+
+
+def _init_worker(stopped_job, wanted_splits):
+    global _wanted_splits
+    init_worker(stopped_job)
+    _wanted_splits = wanted_splits
+
+
+def _load_job(job, line):
+    """Load the job's puzzle into a template, reusing it for the job's later subproblems."""
+    global _loaded
+    if _loaded is not None and _loaded[0] == job:
+        return _loaded[1]
+    if _loaded is not None:
+        _, dlx, loaded = _loaded
+        _loader.unload_board(dlx, loaded)
+        release_sudoku_template(len(loaded[0]), dlx)
+        _loaded = None
+    board = parse_line(line)
+    size, subgrid_size = board_dimensions(board)
+    dlx = acquire_sudoku_template(size, subgrid_size)
+    _loaded = (job, dlx, _loader.load_board(dlx, board))
+    return dlx
+
+
+def _want_split():
+    """Claim one of the splits the coordinator asked for, if any are left."""
+    with _wanted_splits.get_lock():
+        if _wanted_splits.value > 0:
+            _wanted_splits.value -= 1
+            return True
+    return False
+
+
+def split_search(search, prefix):
+    """
+    Partition what a paused search has left into subproblems: the
+    subtree below its current path, plus every untried sibling on the
+    path. Each is the list of row ids to select before searching.
+    """
+    m = search.matrix
+    path = [m.row_of(node) for _, node in search.stack]
+    subproblems = [prefix + path]
+    for level, (col, node) in enumerate(search.stack):
+        sibling = m.down(node)
+        while sibling != col:
+            subproblems.append(prefix + path[:level] + [m.row_of(sibling)])
+            sibling = m.down(sibling)
+    return subproblems
+
+
+def run_subproblem(job, line, prefix, mode, limit=None):
+    """
+    Search one subproblem of a job in a worker process.
+    Returns (solutions, count, split): in FIRST mode the first solution
+    found (as full row id lists), in COUNT mode the number of solutions
+    (up to limit), and the subproblems handed back for idle workers.
+    """
+    stopped = JobStopped(job)
+    if stopped.is_set():
+        return [], 0, []  # Queued before the job was stopped
+    dlx = _load_job(job, line)
+    for row_id in prefix:
+        dlx.select_row(row_id)
+    search = dlx.search(stopped)
+    solutions, count, split = [], 0, []
+    try:
+        while True:
+            if search.run(SPLIT_CHECK_NODES):
+                count += 1
+                if mode == FIRST:
+                    solutions.append(prefix + search.solution())
+                    break
+                if limit is not None and count >= limit:
+                    break
+                continue
+            if search.status != PAUSED:
+                break  # Subtree exhausted or job stopped
+            if _wanted_splits.value > 0 and _want_split():
+                split = split_search(search, prefix)
+                break
+    finally:
+        search.close()
+        for row_id in reversed(prefix):
+            dlx.deselect_row(row_id)
+    return solutions, count, split
+
+
+class ParallelSolver:
+    """
+    Split one DLX search across worker processes.
+
+    The puzzle is presolved and its search tree expanded breadth-first,
+    in this process, to `depth` levels (by default until there are
+    FRONTIER_PER_WORKER subproblems per worker). Each frontier node is
+    sent out as the row ids chosen to reach it; workers load the puzzle
+    once per job and search the subtrees. When the queue runs short,
+    busy workers hand their untried siblings back to be shared out, so
+    uneven subtrees do not leave workers idle. In solve(), the first
+    solution stops every worker.
+
+    The pool is started on first use and kept until close(); use the
+    solver as a context manager to shut it down. With one worker the
+    search runs in this process.
+    """
+
+    def __init__(self, workers=None, depth=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.depth = depth
+        self.pool = None
+        self.stopped_job = None
+        self.wanted_splits = None
+        self.jobs = 0
+        self.solver = SudokuSolver()
+
+    def start(self):
+        """Start the workers if they are not running yet."""
+        if self.pool is None:
+            self.stopped_job = stop_flag()
+            self.wanted_splits = multiprocessing.Value("i", 0)
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.stopped_job, self.wanted_splits),
+            )
+            for future in [self.pool.submit(ping) for _ in range(self.workers)]:
+                future.result()
+
+    def close(self):
+        if self.pool is not None:
+            self.stopped_job.value = self.jobs
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def solve(self, board, cancel=None):
+        """
+        Return the solved board (a Board for a Board, nested lists
+        otherwise), or None if it has no solution or cancel was set.
+        """
+        result = self.run(board, FIRST, None, cancel)
+        if result is None:
+            return None
+        grid, solutions, _ = result
+        if not solutions:
+            return None
+        return board_like(board, fill_sudoku_solution(len(grid), cell_values(grid), solutions[0]))
+
+    def count_solutions(self, board, limit=None, cancel=None):
+        """Count the solutions of the puzzle, stopping once `limit` (if any) is reached."""
+        result = self.run(board, COUNT, limit, cancel)
+        if result is None:
+            return 0
+        count = result[2]
+        return count if limit is None else min(count, limit)
+
+    def expand(self, dlx, limit):
+        """
+        Grow the search frontier breadth-first. Returns (frontier,
+        solutions): the prefixes left to search and any complete
+        solutions met on the way (stopping at `limit` of them).
+        """
+        frontier = [[]]
+        solutions = []
+        depth = 0
+        target = self.workers * FRONTIER_PER_WORKER
+        while frontier:
+            if self.depth is not None:
+                if depth >= self.depth:
+                    break
+            elif len(frontier) >= target or depth >= MAX_SPLIT_DEPTH:
+                break
+            grown = []
+            for prefix in frontier:
+                for row_id in prefix:
+                    dlx.select_row(row_id)
+                col = dlx.choose_column()
+                if col is None:
+                    solutions.append(prefix)
+                else:
+                    node = dlx.down(col)
+                    while node != col:
+                        grown.append(prefix + [dlx.row_of(node)])
+                        node = dlx.down(node)
+                for row_id in reversed(prefix):
+                    dlx.deselect_row(row_id)
+                if limit is not None and len(solutions) >= limit:
+                    return [], solutions
+            frontier = grown
+            depth += 1
+        return frontier, solutions
+
+    def run(self, board, mode, limit, cancel):
+        """
+        Expand and search a puzzle. Returns (presolved grid, solutions,
+        count), or None if the puzzle is invalid or contradictory.
+        """
+        if not is_valid_board(board):
+            return None
+        size, subgrid_size = board_dimensions(board)
+        dlx = acquire_sudoku_template(size, subgrid_size)
+        loaded = self.solver.load_board(dlx, board)
+        if loaded is None:
+            release_sudoku_template(size, dlx)
+            return None
+        wanted = 1 if mode == FIRST else limit
+        try:
+            if self.workers <= 1:
+                frontier, solutions = [[]], []
+            else:
+                frontier, solutions = self.expand(dlx, wanted)
+            if self.workers <= 1 or not frontier:
+                # Nothing worth splitting: search what is left here
+                count = len(solutions)
+                for prefix in frontier:
+                    found, found_count = self.search_here(
+                        dlx, prefix, mode, None if wanted is None else wanted - count, cancel
+                    )
+                    solutions.extend(found)
+                    count += found_count
+                return loaded[0], solutions, count
+        finally:
+            self.solver.unload_board(dlx, loaded)
+            release_sudoku_template(size, dlx)
+
+        solutions, count = self.run_pool(
+            format_board(board), frontier, mode, wanted, solutions, cancel
+        )
+        return loaded[0], solutions, count
+
+    def search_here(self, dlx, prefix, mode, limit, cancel):
+        """Search one subproblem in this process; returns (solutions, count) like a worker."""
+        for row_id in prefix:
+            dlx.select_row(row_id)
+        search = dlx.search(cancel)
+        solutions, count = [], 0
+        while (limit is None or count < limit) and search.run():
+            count += 1
+            if mode == FIRST:
+                solutions.append(prefix + search.solution())
+        search.close()
+        for row_id in reversed(prefix):
+            dlx.deselect_row(row_id)
+        return solutions, count
+
+    def run_pool(self, line, frontier, mode, wanted, solutions, cancel):
+        """Farm the frontier out to the workers; returns (solutions, count)."""
+        self.start()
+        self.jobs += 1
+        job = self.jobs
+        count = len(solutions)
+        limit = None if wanted is None else wanted - count
+
+        def submit(prefix):
+            return self.pool.submit(run_subproblem, job, line, prefix, mode, limit)
+
+        pending = {submit(prefix) for prefix in frontier}
+        try:
+            while pending and (wanted is None or count < wanted):
+                if cancel is not None and cancel.is_set():
+                    break
+                # Ask busy workers to split when some would otherwise sit idle
+                with self.wanted_splits.get_lock():
+                    self.wanted_splits.value = max(0, self.workers - len(pending))
+                done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL,
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    found, found_count, split = future.result()
+                    solutions.extend(found)
+                    count += found_count
+                    pending.update(submit(prefix) for prefix in split)
+        finally:
+            # Stop the workers still searching this job
+            self.stopped_job.value = job
+            with self.wanted_splits.get_lock():
+                self.wanted_splits.value = 0
+            for future in pending:
+                future.cancel()
+        return solutions, count
@@ -0,0 +1,108 @@
+# Solver/portfolio.py
+
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .engines import get_engine
+from .features import DEFAULT_THRESHOLDS, choose_engine, puzzle_features
+from .workers import CANCEL_POLL_INTERVAL, JobStopped, init_worker, stop_flag
+
+RACE_ENGINES = ("backtracking", "dlx")
+
+# engine is the engine whose answer was used; raced tells whether the
+# engines were run against each other
+PortfolioResult = namedtuple("PortfolioResult", ["solution", "engine", "elapsed", "raced"])
+
+def run_race_entry(engine, board, race_id):
+    """Solve one entry of a race in a worker process; it stops once the race is decided."""
+    start_time = time.perf_counter()
+    solution = get_engine(engine)(board, JobStopped(race_id))
+    return engine, solution, time.perf_counter() - start_time
+
+
+class PortfolioSolver:
+    """
+    Solve each puzzle with whichever engine its features favour (see
+    Solver.features). When the features leave it a close call, both
+    engines race in a warm pool of worker processes: the first answer is
+    taken and the other engine is told to stop.
+
+    The pool is started on the first race and kept until close(); use the
+    solver as a context manager to shut it down. With race=False close
+    calls go to DLX and no processes are started. race defaults to True
+    only on machines with more than one CPU, since racing on a single
+    core just splits it between the engines.
+    """
+
+    def __init__(self, thresholds=DEFAULT_THRESHOLDS, race=None):
+        self.thresholds = thresholds
+        if race is None:
+            race = (os.cpu_count() or 1) > 1
+        self.race = race
+        self.pool = None
+        self.decided_race = None
+        self.races = 0
+
+    def start(self):
+        """Start the race workers if they are not running yet."""
+        if self.pool is None:
+            self.decided_race = stop_flag()
+            self.pool = ProcessPoolExecutor(
+                max_workers=len(RACE_ENGINES),
+                initializer=init_worker,
+                initargs=(self.decided_race,),
+            )
+
+    def solve(self, board, cancel=None):
+        """
+        Solve a board, returning a PortfolioResult. cancel may be an
+        Event-like object; once set, the solve gives up and the result's
+        solution is None.
+        """
+        start_time = time.perf_counter()
+        engine = choose_engine(puzzle_features(board), self.thresholds)
+        if engine is None and self.race:
+            return self.run_race(board, cancel, start_time)
+        engine = engine or "dlx"
+        solution = get_engine(engine)(board, cancel)
+        return PortfolioResult(solution, engine, time.perf_counter() - start_time, False)
+
+    def run_race(self, board, cancel, start_time):
+        self.start()
+        self.races += 1
+        race_id = self.races
+        pending = {
+            self.pool.submit(run_race_entry, engine, board, race_id)
+            for engine in RACE_ENGINES
+        }
+        winner, solution = None, None
+        try:
+            while pending and winner is None:
+                if cancel is not None and cancel.is_set():
+                    break
+                done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL,
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    # Every entry solves the same puzzle, so whichever
+                    # finishes first has the answer, solved or not
+                    winner, solution, _ = future.result()
+                    break
+        finally:
+            # Stop the engines still running this race
+            self.decided_race.value = race_id
+        return PortfolioResult(solution, winner, time.perf_counter() - start_time, True)
+
+    def close(self):
+        if self.pool is not None:
+            self.decided_race.value = self.races
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -0,0 +1,152 @@
+# Solver/presolve.py
+
+from .board import board_dimensions, cell_values
+
+# Per grid size: (units, peers, intersections), built on first use
+_geometry_cache = {}
+
+
+def geometry(size, box_size):
+    """
+    Return the cell-index structures for a size x size grid:
+    units holds the cells of every row, column and box; peers[cell] the
+    other cells sharing a unit with it; intersections one entry per
+    box/line pair as (shared cells, rest of box, rest of line).
+    """
+    cached = _geometry_cache.get(size)
+    if cached is not None:
+        return cached
+
+    rows = [[row * size + col for col in range(size)] for row in range(size)]
+    cols = [[row * size + col for row in range(size)] for col in range(size)]
+    boxes = []
+    for band in range(0, size, box_size):
+        for stack in range(0, size, box_size):
+            boxes.append([
+                (band + i) * size + stack + j
+                for i in range(box_size) for j in range(box_size)
+            ])
+    units = rows + cols + boxes
+
+    peers = [set() for _ in range(size * size)]
+    for unit in units:
+        for cell in unit:
+            peers[cell].update(unit)
+    peers = [tuple(sorted(cell_peers - {cell})) for cell, cell_peers in enumerate(peers)]
+
+    intersections = []
+    for box in boxes:
+        box_cells = set(box)
+        for line in rows + cols:
+            shared = box_cells.intersection(line)
+            if shared:
+                intersections.append((
+                    tuple(sorted(shared)),
+                    tuple(cell for cell in box if cell not in shared),
+                    tuple(cell for cell in line if cell not in shared),
+                ))
+
+    cached = _geometry_cache[size] = (units, peers, intersections)
+    return cached
+
+
+def presolve(board):
+    """
+    Fill in everything plain logic can deduce before search: naked singles,
+    hidden singles and pointing/claiming (locked candidate) eliminations,
+    repeated until nothing changes.
+
+    Returns (grid, candidates): a solved-as-far-as-possible copy of the
+    board and, for every cell in row-major order, the bitmask of digits it
+    can still take (bit d-1 for digit d; a filled cell has just its own
+    bit). Returns None if the board is found to be contradictory.
+    """
+    size, box_size = board_dimensions(board)
+    units, peers, intersections = geometry(size, box_size)
+    all_digits = (1 << size) - 1
+    values = cell_values(board)
+    cands = [all_digits] * (size * size)
+    singles = []  # Cells whose value is decided but not yet propagated
+
+    for cell, value in enumerate(values):
+        if value:
+            cands[cell] = 1 << (value - 1)
+            singles.append(cell)
+    values = [0] * (size * size)
+
+    def eliminate(cell, bits):
+        """Remove bits from a cell; False if it is left with no candidates."""
+        remaining = cands[cell] & ~bits
+        if remaining == cands[cell]:
+            return True
+        cands[cell] = remaining
+        if not remaining:
+            return False
+        if remaining & (remaining - 1) == 0:
+            singles.append(cell)
+        return True
+
+    while True:
+        # Naked singles: place decided cells and clear their digit from peers
+        while singles:
+            cell = singles.pop()
+            if values[cell]:
+                continue
+            bit = cands[cell]
+            if not bit or bit & (bit - 1):
+                return None  # Empty, or forced to two digits at once
+            values[cell] = bit.bit_length()
+            for peer in peers[cell]:
+                if cands[peer] & bit:
+                    if values[peer] or not eliminate(peer, bit):
+                        return None  # Two cells of a unit need the same digit
+
+        # Hidden singles: a digit with only one place left in a unit
+        for unit in units:
+            once = twice = placed = 0
+            for cell in unit:
+                if values[cell]:
+                    placed |= cands[cell]
+                else:
+                    twice |= once & cands[cell]
+                    once |= cands[cell]
+            if (all_digits & ~placed) & ~once:
+                return None  # A digit has nowhere left to go
+            hidden = once & ~twice
+            for cell in unit:
+                if cands[cell] & hidden and not values[cell]:
+                    cands[cell] &= hidden
+                    singles.append(cell)
+        if singles:
+            continue
+
+        # Pointing and claiming: a digit confined to a box/line intersection
+        # within the box (or line) cannot appear in the rest of the line (or box)
+        changed = False
+        for shared, box_rest, line_rest in intersections:
+            inside = 0
+            for cell in shared:
+                if not values[cell]:
+                    inside |= cands[cell]
+            if not inside:
+                continue
+            box_outside = line_outside = 0
+            for cell in box_rest:
+                if not values[cell]:
+                    box_outside |= cands[cell]
+            for cell in line_rest:
+                if not values[cell]:
+                    line_outside |= cands[cell]
+            pointing = inside & ~box_outside & line_outside
+            claiming = inside & ~line_outside & box_outside
+            for bits, cells in ((pointing, line_rest), (claiming, box_rest)):
+                if bits:
+                    for cell in cells:
+                        if not values[cell] and not eliminate(cell, bits):
+                            return None
+                    changed = True
+        if not changed:
+            break
+
+    grid = [values[row * size:(row + 1) * size] for row in range(size)]
+    return grid, cands
@@ -0,0 +1,178 @@
+# Solver/search.py
+
+# Search states reported by DLXSearch.status
+READY = "ready"
+FOUND = "found"
+PAUSED = "paused"
+CANCELLED = "cancelled"
+EXHAUSTED = "exhausted"
+
+# Events returned by DLXSearch.step
+NODE = "node"
+
+CANCEL_CHECK_INTERVAL = 64  # Nodes between polls of an external cancel flag
+BUDGET_CHECK_NODES = 64  # Nodes between clock checks in run_within
+
+
+class DLXSearch:
+    """
+    Iterative Algorithm X driver with an explicit choice stack.
+
+    Works on any dancing-links matrix exposing choose_column() (None once
+    every column is covered), column_size(column), cover/uncover(column), down(node),
+    select/deselect(node) for the rest of a row and row_of(node). Each
+    stack entry is [column, node]: the column branched on and the row node
+    currently chosen from it. Between calls every entry's row is selected,
+    so the search can be paused, resumed or closed at any point.
+    """
+
+    def __init__(self, matrix, cancel=None):
+        self.matrix = matrix
+        self.stack = []
+        self.status = READY
+        self.nodes = 0
+        self.branch_points = 0
+        self.alternatives = 0  # Rows available at each branch point, summed
+        self.backtracks = 0
+        self.max_depth = 0
+        self.solutions_found = 0
+        self._cancel_event = cancel  # Optional object with is_set()
+        self._cancelled = False
+        self._descend = True
+
+    def step(self):
+        """
+        Advance the search by one choice.
+        Returns NODE after choosing a row, FOUND when the chosen rows form a
+        solution and EXHAUSTED once the whole tree has been explored.
+        """
+        if self.status in (EXHAUSTED, CANCELLED):
+            return self.status
+        m = self.matrix
+        stack = self.stack
+
+        if self._descend:
+            col = m.choose_column()
+            if col is None:
+                # Every column is covered: the stack holds a solution
+                self._descend = False
+                self.solutions_found += 1
+                self.status = FOUND
+                return FOUND
+            self.branch_points += 1
+            self.alternatives += m.column_size(col)
+            m.cover(col)
+            entry = [col, m.down(col)]
+            stack.append(entry)
+            if len(stack) > self.max_depth:
+                self.max_depth = len(stack)
+        else:
+            if not stack:
+                self.status = EXHAUSTED
+                return EXHAUSTED
+            # Backtrack: drop the current row and move to the next one below
+            entry = stack[-1]
+            m.deselect(entry[1])
+            self.backtracks += 1
+            entry[1] = m.down(entry[1])
+
+        while True:
+            col, node = entry
+            if node != col:
+                m.select(node)
+                self.nodes += 1
+                self._descend = True
+                return NODE
+            # Column exhausted: restore it and backtrack further up
+            m.uncover(col)
+            stack.pop()
+            if not stack:
+                self.status = EXHAUSTED
+                return EXHAUSTED
+            entry = stack[-1]
+            m.deselect(entry[1])
+            self.backtracks += 1
+            entry[1] = m.down(entry[1])
+
+    def run(self, max_nodes=None):
+        """
+        Search until the next solution, exhaustion, cancellation or until
+        max_nodes more rows have been chosen. Returns True if a solution was
+        found; the outcome is also left in self.status.
+        """
+        if self.status in (EXHAUSTED, CANCELLED):
+            return False
+        step = self.step
+        event = self._cancel_event
+        limit = None if max_nodes is None else self.nodes + max_nodes
+        countdown = CANCEL_CHECK_INTERVAL
+
+        while True:
+            result = step()
+            if result == FOUND:
+                return True
+            if result == EXHAUSTED:
+                return False
+            if limit is not None and self.nodes >= limit:
+                self.status = PAUSED
+                return False
+            countdown -= 1
+            if countdown == 0:
+                countdown = CANCEL_CHECK_INTERVAL
+                if self._cancelled or (event is not None and event.is_set()):
+                    self.close()
+                    self.status = CANCELLED
+                    return False
+
+    resume = run
+
+    def run_within(self, budget):
+        """
+        Like run(), but in slices of BUDGET_CHECK_NODES nodes with a
+        budget.check() between them, so a Budget's timeout and max_nodes
+        are honoured. Stops PAUSED, with budget.exceeded set, once the
+        budget is spent.
+        """
+        while not budget.check(self.nodes):
+            allowance = BUDGET_CHECK_NODES
+            if budget.max_nodes is not None:
+                # Let the search go one node past the limit, so the check
+                # above catches it and a solution reached exactly at the
+                # limit still counts
+                allowance = min(allowance, budget.max_nodes + 1 - self.nodes)
+            if self.run(allowance):
+                return True
+            if self.status != PAUSED:
+                return False
+        return False
+
+    def cancel(self):
+        """Ask a running search to stop at its next cancellation check."""
+        self._cancelled = True
+
+    def solution(self):
+        """Rows chosen on the current path, as reported by row_of()."""
+        row_of = self.matrix.row_of
+        return [row_of(node) for _, node in self.stack]
+
+    def solutions(self):
+        """
+        Yield each solution, as a list of row ids, until the search is
+        exhausted or cancelled. The search is closed, leaving the matrix
+        in its starting state, once the generator finishes or is closed.
+        """
+        try:
+            while self.run():
+                yield self.solution()
+        finally:
+            self.close()
+
+    def close(self):
+        """Unwind every choice so the matrix is back in its starting state."""
+        m = self.matrix
+        while self.stack:
+            col, node = self.stack.pop()
+            m.deselect(node)
+            m.uncover(col)
+        if self.status != CANCELLED:
+            self.status = EXHAUSTED
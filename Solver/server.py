@@ -0,0 +1,437 @@
+# Solver/server.py
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .array_dlx import acquire_sudoku_template, release_sudoku_template
+from .batch import solve_chunk
+from .board import Board, box_size, format_board
+from .engines import ENGINES, get_engine
+from .workers import ping
+
+DEFAULT_PORT = 8765
+MAX_BATCH = 64  # Puzzles sent to a worker at a time
+BATCH_DELAY = 0.002  # Seconds to wait for a batch to fill up
+QUEUE_SIZE = 4096  # Puzzles waiting for a worker before requests are turned away
+BATCHES_IN_FLIGHT_PER_WORKER = 2
+MAX_BODY = 16 << 20
+LATENCY_WINDOW = 10000  # Recent request latencies kept for percentiles
+WARM_SIZES = (9,)  # Grid sizes whose DLX templates workers build up front
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _warm_worker(sizes):
+    """Pool initializer: prebuild the templates so first requests find them ready."""
+    for size in sizes:
+        release_sudoku_template(size, acquire_sudoku_template(size, box_size(size)))
+
+
+def parse_puzzle(puzzle):
+    """Turn a request's puzzle into a Board, raising ValueError if it is malformed."""
+    if isinstance(puzzle, str):
+        return Board.from_line(puzzle)
+    if isinstance(puzzle, list) and all(isinstance(row, list) for row in puzzle):
+        size = len(puzzle)
+        box_size(size)
+        if any(len(row) != size for row in puzzle):
+            raise ValueError(f"expected {size} values in every row")
+        if not all(isinstance(value, int) and 0 <= value <= size
+                   for row in puzzle for value in row):
+            raise ValueError(f"cell values must be integers from 0 to {size}")
+        return Board.from_rows(puzzle)
+    raise ValueError("a puzzle is a string of cells or a list of rows")
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ServerStats:
+    """Counters and recent latencies of a running SolveServer."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rejected = 0  # Requests turned away because the queue was full
+        self.puzzles = 0
+        self.solved = 0
+        self.batches = 0
+        self.batched_puzzles = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def snapshot(self, queued=0):
+        uptime = time.perf_counter() - self.started
+        ordered = sorted(self.latencies)
+        return {
+            "uptime": round(uptime, 3),
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "puzzles": self.puzzles,
+            "solved": self.solved,
+            "puzzles_per_second": round(self.puzzles / uptime, 2) if uptime else 0.0,
+            "batches": self.batches,
+            "mean_batch_size": round(self.batched_puzzles / self.batches, 2) if self.batches else 0.0,
+            "queued": queued,
+            "latency_ms": {
+                "p50": round(_percentile(ordered, 0.50) * 1e3, 3),
+                "p95": round(_percentile(ordered, 0.95) * 1e3, 3),
+                "p99": round(_percentile(ordered, 0.99) * 1e3, 3),
+            },
+        }
+
+
+class SolveServer:
+    """
+    A local HTTP/JSON solving service on asyncio, standard library only.
+
+    POST /solve takes {"puzzle": ...} or {"puzzles": [...]}, where each
+    puzzle is a single-line string (see Solver.board.parse_line) or a
+    list of rows. Each puzzle gets {"status", "solution", "elapsed"}:
+    status is "solved", "unsolvable", "invalid" or "budget_exceeded" and
+    solution a single-line string or null. A single puzzle is answered
+    with its result, a batch with {"results": [...]}. GET /stats reports
+    throughput, latency percentiles, batch sizes and the queue depth;
+    GET /health answers {"status": "ok"}.
+
+    Puzzles from all requests go into one bounded queue. A batcher takes
+    whatever is waiting (up to max_batch, giving stragglers batch_delay
+    seconds to arrive) and hands it to a pool of worker processes, which
+    keep their prebuilt DLX templates between batches. While every worker
+    is busy puzzles pile up, so batches grow with load. A request whose
+    puzzles do not fit in the queue is answered 503 at once.
+
+    port=0 picks a free port; it is in self.port once start() returns.
+    timeout and max_nodes bound each solve (see Solver.budget).
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, engine="dlx", workers=None,
+                 max_batch=MAX_BATCH, batch_delay=BATCH_DELAY, queue_size=QUEUE_SIZE,
+                 timeout=None, max_nodes=None):
+        get_engine(engine)  # Fail fast on unknown engine names
+        self.host = host
+        self.port = port
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.batch_delay = batch_delay
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.stats = ServerStats()
+        self.queue = None
+        self.pool = None
+        self.server = None
+        self.tasks = set()
+
+    async def start(self):
+        """Start the workers and begin listening."""
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(self.queue_size)
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_warm_worker, initargs=(WARM_SIZES,)
+        )
+        # Start every worker now rather than on the first requests
+        await asyncio.gather(*(loop.run_in_executor(self.pool, ping)
+                               for _ in range(self.workers)))
+        self.stats = ServerStats()
+        self._spawn(self._batcher())
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        """Stop listening, fail queued puzzles and shut the workers down."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        waiting = []
+        while self.queue is not None and not self.queue.empty():
+            waiting.append(self.queue.get_nowait())
+        _fail(waiting, HTTPError(503, "server shutting down"))
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+        return False
+
+    def _spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def _batcher(self):
+        slots = asyncio.Semaphore(self.workers * BATCHES_IN_FLIGHT_PER_WORKER)
+        queue = self.queue
+        while True:
+            await slots.acquire()
+            batch = [await queue.get()]
+            if len(batch) < self.max_batch and self.batch_delay and queue.empty():
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            self._spawn(self._run_batch(batch, slots))
+
+    async def _run_batch(self, batch, slots):
+        loop = asyncio.get_running_loop()
+        try:
+            chunk = [(index, board) for index, (board, _) in enumerate(batch)]
+            self.stats.batches += 1
+            self.stats.batched_puzzles += len(batch)
+            try:
+                results = await loop.run_in_executor(
+                    self.pool, solve_chunk, self.engine, chunk, self.timeout, self.max_nodes
+                )
+            except asyncio.CancelledError:
+                _fail(batch, HTTPError(503, "server shutting down"))
+                raise
+            except Exception as error:
+                _fail(batch, HTTPError(500, f"worker failed: {error!r}"))
+                return
+            for result in results:
+                future = batch[result.index][1]
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            slots.release()
+
+    async def solve_boards(self, boards):
+        """Queue boards for the workers and wait for their BatchResults."""
+        if len(boards) > self.queue_size:
+            raise HTTPError(413, f"at most {self.queue_size} puzzles per request")
+        if self.queue.maxsize - self.queue.qsize() < len(boards):
+            self.stats.rejected += 1
+            raise HTTPError(503, "solve queue is full, retry later")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for board in boards:
+            future = loop.create_future()
+            self.queue.put_nowait((board, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def solve_request(self, payload):
+        """Answer a decoded /solve body."""
+        if not isinstance(payload, dict) or ("puzzle" in payload) == ("puzzles" in payload):
+            raise HTTPError(400, 'expected an object with "puzzle" or "puzzles"')
+        single = "puzzle" in payload
+        puzzles = [payload["puzzle"]] if single else payload["puzzles"]
+        if not isinstance(puzzles, list):
+            raise HTTPError(400, '"puzzles" must be a list')
+
+        boards, invalid = [], {}
+        for index, puzzle in enumerate(puzzles):
+            try:
+                boards.append(parse_puzzle(puzzle))
+            except ValueError as error:
+                invalid[index] = str(error)
+        solved = iter(await self.solve_boards(boards))
+
+        results = []
+        for index in range(len(puzzles)):
+            if index in invalid:
+                results.append({"status": "invalid", "error": invalid[index],
+                                "solution": None, "elapsed": 0.0})
+                continue
+            result = next(solved)
+            if result.exceeded is not None:
+                status = "budget_exceeded"
+            elif result.solution is None:
+                status = "unsolvable"
+            else:
+                status = "solved"
+                self.stats.solved += 1
+            solution = None if result.solution is None else format_board(result.solution)
+            results.append({"status": status, "solution": solution,
+                            "elapsed": round(result.elapsed, 6)})
+        self.stats.puzzles += len(puzzles)
+        return results[0] if single else {"results": results}
+
+    async def route(self, method, path, body):
+        """Return (status, JSON-serialisable response) for a request."""
+        if path == "/solve":
+            if method != "POST":
+                raise HTTPError(405, "use POST")
+            try:
+                payload = json.loads(body)
+            except ValueError as error:
+                raise HTTPError(400, f"invalid JSON: {error}") from None
+            return 200, await self.solve_request(payload)
+        if path == "/stats":
+            return 200, self.stats.snapshot(self.queue.qsize())
+        if path == "/health":
+            return 200, {"status": "ok"}
+        raise HTTPError(404, f"no such endpoint {path}")
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                start_time = time.perf_counter()
+                self.stats.requests += 1
+                try:
+                    status, response = await self.route(method, path, body)
+                except HTTPError as error:
+                    status, response = error.status, {"error": str(error)}
+                except Exception:
+                    # A bug in one request must not take the connection down silently
+                    logger.exception("error handling %s %s", method, path)
+                    status, response = 500, {"error": REASONS[500]}
+                if path == "/solve":
+                    self.stats.latencies.append(time.perf_counter() - start_time)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                _write_response(writer, status, response, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HTTPError as error:
+            _write_response(writer, error.status, {"error": str(error)}, False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception:
+            logger.exception("error reading a request")
+            _write_response(writer, 500, {"error": REASONS[500]}, False)
+        finally:
+            writer.close()
+
+
+def _fail(batch, error):
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+async def _read_line(reader):
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        # readline() reports a line over the stream limit as ValueError
+        raise HTTPError(400, "request line or header too long") from None
+
+
+async def _read_request(reader):
+    """Read one HTTP/1.1 request; None once the client has closed the connection."""
+    line = await _read_line(reader)
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise HTTPError(400, "malformed request line")
+    method, path, _ = parts
+    headers = {}
+    while True:
+        line = await _read_line(reader)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0) or 0)
+    except ValueError:
+        raise HTTPError(400, "Content-Length is not an integer") from None
+    if length < 0:
+        raise HTTPError(400, "Content-Length is negative")
+    if length > MAX_BODY:
+        raise HTTPError(413, f"request body over {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method, path.split("?", 1)[0], headers, body
+
+
+def _write_response(writer, status, response, keep_alive):
+    body = json.dumps(response).encode()
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+    )
+    if status == 503:
+        head += "Retry-After: 1\r\n"
+    writer.write(head.encode("latin-1") + b"\r\n" + body)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m Solver.server",
+        description="Serve Sudoku solves over HTTP/JSON on localhost.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("-e", "--engine", choices=sorted(ENGINES), default="dlx",
+                        help="solver engine (default: dlx)")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH,
+                        help=f"most puzzles per batch (default: {MAX_BATCH})")
+    parser.add_argument("--batch-delay", type=float, default=BATCH_DELAY,
+                        help=f"seconds to let a batch fill (default: {BATCH_DELAY})")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE,
+                        help=f"puzzles queued before requests get 503 (default: {QUEUE_SIZE})")
+    parser.add_argument("--timeout", type=float, help="give up on a puzzle after this many seconds")
+    parser.add_argument("--max-nodes", type=int, help="give up on a puzzle after this many search nodes")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    server = SolveServer(
+        args.host, args.port, args.engine, args.workers, args.max_batch,
+        args.batch_delay, args.queue_size, args.timeout, args.max_nodes,
+    )
+
+    async def run():
+        await server.start()
+        print(f"Serving on http://{server.host}:{server.port}", file=sys.stderr)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+# Solver/session.py
+
+from collections import namedtuple
+
+from .array_dlx import (
+    acquire_sudoku_template,
+    decode_sudoku_row,
+    fill_sudoku_solution,
+    release_sudoku_template,
+    sudoku_row_id,
+)
+from . import presolve as presolver
+from .board import board_like, box_size, cell_values
+from .search import FOUND, PAUSED
+
+# forced is True when the digit follows from the givens alone (some cell,
+# or some digit within a unit, has a single option left) and False when
+# it is read off the solution
+Hint = namedtuple("Hint", ["row", "col", "digit", "forced"])
+
+
+class DLXSession:
+    """
+    A Sudoku board kept loaded in one DLX template while it is edited.
+
+    Givens are applied and retracted by selecting and deselecting their
+    template rows in place, so queries after each edit never rebuild the
+    matrix. Dancing links must be undone in reverse order, so retracting
+    a given deselects the givens placed after it and selects them again.
+    A given that clashes with an earlier one cannot be selected; it is
+    kept aside (and the board reported unsolvable) until the clash goes.
+
+    The template is taken from the shared pool for the session's lifetime;
+    call close() or use the session as a context manager to return it.
+    """
+
+    def __init__(self, board=None, size=9):
+        if board is not None:
+            size = len(board)
+        self.size = size
+        self.box_size = box_size(size)
+        self.dlx = acquire_sudoku_template(size, self.box_size)
+        self.values = [[0] * size for _ in range(size)]
+        self.selected = []  # (row, col, row_id) in selection order
+        self.clashing = []  # (row, col) of givens that could not be selected
+        self._result = None  # Cached (status, solution) of the current board
+        if board is not None:
+            for row, values in enumerate(board):
+                for col, value in enumerate(values):
+                    if value:
+                        self.apply(row, col, value)
+
+    def set_cell(self, row, col, value):
+        """Place value (0 to clear) at a cell, replacing what was there."""
+        if value:
+            self._check_digit(value)  # Before the old given is retracted
+        if self.values[row][col] == value:
+            return
+        if self.values[row][col]:
+            self.retract(row, col)
+        if value:
+            self.apply(row, col, value)
+
+    def apply(self, row, col, digit):
+        """Add a given to an empty cell."""
+        if self.values[row][col]:
+            raise ValueError(f"cell ({row}, {col}) already holds {self.values[row][col]}")
+        self._check_digit(digit)
+        self.values[row][col] = digit
+        self._result = None
+        row_id = sudoku_row_id(self.size, row, col, digit)
+        if self.dlx.row_is_free(row_id):
+            self.dlx.select_row(row_id)
+            self.selected.append((row, col, row_id))
+        else:
+            self.clashing.append((row, col))
+
+    def _check_digit(self, digit):
+        """Raise ValueError unless digit can be placed on this grid."""
+        if not 1 <= digit <= self.size:
+            raise ValueError(f"digit {digit} out of range for a {self.size}x{self.size} grid")
+
+    def retract(self, row, col):
+        """Remove the given at a cell."""
+        if not self.values[row][col]:
+            return
+        self.values[row][col] = 0
+        self._result = None
+        if (row, col) in self.clashing:
+            self.clashing.remove((row, col))
+            return
+
+        dlx = self.dlx
+        # Unwind back to the given, then redo the ones placed after it
+        later = []
+        while True:
+            entry = self.selected.pop()
+            dlx.deselect_row(entry[2])
+            if entry[:2] == (row, col):
+                break
+            later.append(entry)
+        for entry in reversed(later):
+            dlx.select_row(entry[2])
+            self.selected.append(entry)
+
+        # Givens held back by this one may fit now
+        waiting, self.clashing = self.clashing, []
+        for cell in waiting:
+            digit = self.values[cell[0]][cell[1]]
+            self.values[cell[0]][cell[1]] = 0
+            self.apply(cell[0], cell[1], digit)
+
+    def candidates(self, row, col):
+        """Digits a cell can take without clashing with the current givens."""
+        if self.values[row][col]:
+            return [self.values[row][col]]
+        size, dlx = self.size, self.dlx
+        return [digit for digit in range(1, size + 1)
+                if dlx.row_is_free(sudoku_row_id(size, row, col, digit))]
+
+    def solve(self, max_nodes=None):
+        """
+        Search for a completion of the current givens. Returns
+        (status, solution): status is True with the solved board, False
+        with None if there is none, or None if max_nodes ran out first.
+        Conclusive results are cached until the next edit.
+        """
+        if self._result is not None:
+            return self._result
+        if self.clashing:
+            self._result = (False, None)
+            return self._result
+
+        # Logic deductions are layered on top of the givens for the search
+        # and taken off again afterwards
+        result = presolver.presolve(self.values)
+        if result is None:
+            self._result = (False, None)
+            return self._result
+        grid, cands = result
+        deduced, hidden = self.push_deductions(grid, cands)
+
+        search = self.dlx.search()
+        search.run(max_nodes)
+        status = search.status
+        solution = None
+        if status == FOUND:
+            values = fill_sudoku_solution(self.size, cell_values(grid), search.solution())
+            solution = board_like(grid, values)
+        search.close()
+        self.pop_deductions(deduced, hidden)
+
+        if status == PAUSED:
+            return None, None
+        self._result = (solution is not None, solution)
+        return self._result
+
+    def push_deductions(self, grid, cands):
+        """Select the presolver's placements and hide the options it ruled out."""
+        size, dlx = self.size, self.dlx
+        deduced = []
+        hidden = []
+        for cell in range(size * size):
+            row, col = divmod(cell, size)
+            if self.values[row][col]:
+                continue
+            if grid[row][col]:
+                row_id = sudoku_row_id(size, row, col, grid[row][col])
+                dlx.select_row(row_id)
+                deduced.append(row_id)
+        for cell, mask in enumerate(cands):
+            row, col = divmod(cell, size)
+            if grid[row][col]:
+                continue
+            for digit in range(1, size + 1):
+                if not mask >> (digit - 1) & 1:
+                    row_id = sudoku_row_id(size, row, col, digit)
+                    if dlx.row_is_free(row_id):
+                        dlx.hide_row(row_id)
+                        hidden.append(row_id)
+        return deduced, hidden
+
+    def pop_deductions(self, deduced, hidden):
+        """Undo push_deductions."""
+        dlx = self.dlx
+        for row_id in reversed(hidden):
+            dlx.unhide_row(row_id)
+        for row_id in reversed(deduced):
+            dlx.deselect_row(row_id)
+
+    def is_solvable(self, max_nodes=None):
+        """True or False, or None if max_nodes ran out before an answer."""
+        return self.solve(max_nodes)[0]
+
+    def hint(self, max_nodes=None):
+        """
+        Suggest a next move as a Hint, or None if the board is complete,
+        unsolvable or max_nodes ran out. A forced move is preferred;
+        otherwise the solution's digit for the cell with fewest options.
+        """
+        status, solution = self.solve(max_nodes)
+        if not status:
+            return None
+        dlx = self.dlx
+        col = dlx.choose_column()
+        if col is None:
+            return None  # Every cell is filled
+        if dlx.column_size(col) == 1:
+            digit, row, cell_col = decode_sudoku_row(self.size, dlx.row_of(dlx.down(col)))
+            return Hint(row, cell_col, digit, True)
+
+        size = self.size
+        best = None
+        for cell in range(1, size * size + 1):
+            # Position columns come first; an uncovered one is an empty cell
+            if dlx.is_covered(cell):
+                continue
+            if best is None or dlx.column_size(cell) < dlx.column_size(best):
+                best = cell
+        row, cell_col = divmod(best - 1, size)
+        return Hint(row, cell_col, solution[row][cell_col], False)
+
+    def close(self):
+        """Retract every given and return the template to the pool."""
+        if self.dlx is None:
+            return
+        for _, _, row_id in reversed(self.selected):
+            self.dlx.deselect_row(row_id)
+        release_sudoku_template(self.size, self.dlx)
+        self.dlx = None
+        self.selected = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -0,0 +1,94 @@
+# Solver/stats.py
+
+
+class SolveStats:
+    """
+    Opt-in measurements of a single solve. Pass an instance as `stats=` to
+    a solver and it is filled in; without one, solvers only keep the few
+    integer counters their search loops need anyway.
+
+    Times are in seconds. build_time covers presolving and setting up the
+    search state (for DLX: fetching the template and applying the board);
+    search_time covers the search alone. nodes counts rows or digits tried,
+    branch_points the choices they were tried at, alternatives the options
+    open at those choices, backtracks the choices undone, and
+    covers/uncovers the DLX column operations. budget_exceeded is the
+    reason (see Solver.budget) a solve ran out of budget, or None.
+
+    hooks are called with the finished stats, e.g. to feed a metrics sink.
+    """
+
+    FIELDS = (
+        "engine", "solved", "presolve_time", "build_time", "search_time",
+        "nodes", "branch_points", "alternatives", "backtracks", "max_depth", "covers", "uncovers",
+        "budget_exceeded",
+    )
+
+    def __init__(self, hooks=()):
+        self.hooks = list(hooks)
+        self.engine = None
+        self.solved = False
+        self.presolve_time = 0.0
+        self.build_time = 0.0
+        self.search_time = 0.0
+        self.nodes = 0
+        self.branch_points = 0
+        self.alternatives = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.covers = 0
+        self.uncovers = 0
+        self.budget_exceeded = None
+
+    @property
+    def branching_factor(self):
+        """Average number of alternatives open per branch point."""
+        return self.alternatives / self.branch_points if self.branch_points else 0.0
+
+    def as_dict(self):
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data["branching_factor"] = self.branching_factor
+        return data
+
+    def finish(self):
+        """Call the hooks once the solve is complete."""
+        for hook in self.hooks:
+            hook(self)
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.as_dict().items())
+        return f"SolveStats({fields})"
+
+
+class count_column_ops:
+    """
+    Context manager that counts cover/uncover calls on a DLX matrix into a
+    SolveStats by shadowing the bound methods on that instance only, so
+    uninstrumented solves keep calling the plain methods.
+    """
+
+    def __init__(self, matrix, stats):
+        self.matrix = matrix
+        self.stats = stats
+
+    def __enter__(self):
+        matrix, stats = self.matrix, self.stats
+        cover, uncover = matrix.cover, matrix.uncover
+
+        def counted_cover(col):
+            stats.covers += 1
+            cover(col)
+
+        def counted_uncover(col):
+            stats.uncovers += 1
+            uncover(col)
+
+        matrix.cover = counted_cover
+        matrix.uncover = counted_uncover
+        return stats
+
+    def __exit__(self, *exc_info):
+        del self.matrix.cover
+        del self.matrix.uncover
+        return False
+
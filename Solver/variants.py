@@ -0,0 +1,203 @@
+# Solver/variants.py
+
+from .array_dlx import ArrayDLX, fill_sudoku_solution
+from .board import board_like, box_size, cell_values
+
+
+def box_regions(size):
+    """The boxes of a classic size x size grid, as lists of (row, col) cells."""
+    box = box_size(size)
+    return [
+        [(top + row, left + col) for row in range(box) for col in range(box)]
+        for top in range(0, size, box)
+        for left in range(0, size, box)
+    ]
+
+
+def regions_from_map(region_map):
+    """
+    Group the cells of a region map, a size x size grid of region labels
+    (any hashable values), into lists of (row, col) cells.
+    """
+    regions = {}
+    for row, labels in enumerate(region_map):
+        for col, label in enumerate(labels):
+            regions.setdefault(label, []).append((row, col))
+    return list(regions.values())
+
+
+def diagonal_regions(size):
+    """The two main diagonals, the extra regions of X-Sudoku."""
+    return [
+        [(i, i) for i in range(size)],
+        [(i, size - 1 - i) for i in range(size)],
+    ]
+
+
+def window_regions(size):
+    """
+    The extra box-sized windows of Windoku, each one cell in from the
+    previous window (and the edge), e.g. rows and columns 1-3 and 5-7 on 9x9.
+    """
+    box = box_size(size)
+    starts = range(1, size - box + 1, box + 1)
+    return [
+        [(top + row, left + col) for row in range(box) for col in range(box)]
+        for top in starts
+        for left in starts
+    ]
+
+
+class VariantSolver:
+    """
+    DLX solver for Sudoku variants described by their regions.
+
+    Every row and column of the grid takes each digit once, as does every
+    region: a list of (row, col) cells. A region of exactly size cells
+    must hold every digit, so its constraints are primary exact-cover
+    columns; a smaller one only forbids repeats and uses secondary
+    columns. Classic Sudoku is VariantSolver(9, box_regions(9)); see
+    x_sudoku, windoku and jigsaw for the common variants.
+
+    The matrix is built once per solver and reused: givens are selected
+    in it for a solve and deselected afterwards, like the Sudoku
+    templates. Row ids follow sudoku_row_id.
+    """
+
+    def __init__(self, size, regions):
+        box_size(size)  # Validate the grid size
+        self.size = size
+        full, partial = [], []
+        for region in regions:
+            if any(not (0 <= row < size and 0 <= col < size) for row, col in region):
+                raise ValueError("a region has a cell outside the grid")
+            cells = sorted({row * size + col for row, col in region})
+            if len(cells) != len(region):
+                raise ValueError("a region lists the same cell twice")
+            if len(cells) > size:
+                raise ValueError(f"a region has {len(cells)} cells, more than {size}")
+            (full if len(cells) == size else partial).append(cells)
+        self.regions = full + partial
+        self.num_secondary = len(partial) * size
+        # Column ids of each cell's regions, primary ones first
+        self.cell_regions = [[] for _ in range(size * size)]
+        first = 3 * size * size
+        for index, cells in enumerate(self.regions):
+            for cell in cells:
+                self.cell_regions[cell].append(first + index * size)
+        self.idle = []  # Matrices not in use by a solve
+
+    @classmethod
+    def from_region_map(cls, region_map, extra_regions=()):
+        """A solver whose regions are the labelled areas of a region map, plus any extras."""
+        return cls(len(region_map), regions_from_map(region_map) + list(extra_regions))
+
+    def build_matrix(self):
+        size = self.size
+        cells = size * size
+        nodes = sum(3 + len(regions) for regions in self.cell_regions) * size
+        dlx = ArrayDLX(3 * cells + len(self.regions) * size, self.num_secondary, nodes)
+
+        def options():
+            for cell in range(cells):
+                row, col = divmod(cell, size)
+                regions = self.cell_regions[cell]
+                for d in range(size):
+                    columns = [cell, cells + row * size + d, 2 * cells + col * size + d]
+                    columns.extend(column + d for column in regions)
+                    yield columns
+
+        dlx.add_rows(options())
+        return dlx
+
+    def acquire(self):
+        try:
+            dlx = self.idle.pop()
+        except IndexError:
+            dlx = self.build_matrix()
+        dlx.unpack()
+        return dlx
+
+    def release(self, dlx):
+        dlx.pack()
+        self.idle.append(dlx)
+
+    def apply_givens(self, dlx, board):
+        """Select the rows of the board's givens; None (with nothing selected) if they clash."""
+        size = self.size
+        if len(board) != size:
+            raise ValueError(f"expected a {size}x{size} board")
+        givens = []
+        for cell, digit in enumerate(cell_values(board)):
+            if digit:
+                row_id = cell * size + digit - 1
+                if not 1 <= digit <= size or not dlx.row_is_free(row_id):
+                    for selected in reversed(givens):
+                        dlx.deselect_row(selected)
+                    return None
+                dlx.select_row(row_id)
+                givens.append(row_id)
+        return givens
+
+    def solve(self, board, cancel=None):
+        """
+        Return the solved board (a Board for a Board, nested lists
+        otherwise), or None if it has no solution or cancel was set.
+        """
+        solutions = self.iter_solutions(board, cancel)
+        solution = next(solutions, None)
+        solutions.close()
+        return solution
+
+    def iter_solutions(self, board, cancel=None):
+        """
+        Yield every solution as it is found, without collecting them.
+        The matrix is returned clean once the generator is exhausted or
+        closed.
+        """
+        dlx = self.acquire()
+        givens = self.apply_givens(dlx, board)
+        if givens is None:
+            self.release(dlx)
+            return
+        solutions = dlx.iter_solutions(cancel)
+        try:
+            for row_ids in solutions:
+                values = fill_sudoku_solution(self.size, cell_values(board), row_ids)
+                yield board_like(board, values)
+        finally:
+            # Unwind the search before the givens it was built on
+            solutions.close()
+            for row_id in reversed(givens):
+                dlx.deselect_row(row_id)
+            self.release(dlx)
+
+    def count_solutions(self, board, limit=2):
+        """Count the solutions of the puzzle, stopping as soon as `limit` is reached."""
+        dlx = self.acquire()
+        givens = self.apply_givens(dlx, board)
+        count = 0
+        if givens is not None:
+            search = dlx.search()
+            while count < limit and search.run():
+                count += 1
+            search.close()
+            for row_id in reversed(givens):
+                dlx.deselect_row(row_id)
+        self.release(dlx)
+        return count
+
+
+def x_sudoku(size=9):
+    """Solver for X-Sudoku: the boxes plus both main diagonals."""
+    return VariantSolver(size, box_regions(size) + diagonal_regions(size))
+
+
+def windoku(size=9):
+    """Solver for Windoku: the boxes plus the extra windows of window_regions."""
+    return VariantSolver(size, box_regions(size) + window_regions(size))
+
+
+def jigsaw(region_map):
+    """Solver for jigsaw Sudoku, whose irregular regions replace the boxes."""
+    return VariantSolver.from_region_map(region_map)
@@ -0,0 +1,172 @@
+# Solver/vectorized.py
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the batch mode in this module
+    np = None
+
+from .board import board_like, box_size, cell_values
+from .engines import get_engine
+
+# Puzzle states reported by propagate
+OPEN = 0
+SOLVED = 1
+INVALID = 2
+
+MAX_ROUNDS = 200  # Safety cap; each round places at least one digit per open puzzle
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Solver.vectorized requires NumPy (pip install numpy)")
+
+
+def to_array(boards):
+    """Stack nested-list boards into an (N, size, size) uint8 array."""
+    _require_numpy()
+    return np.asarray(boards, dtype=np.uint8)
+
+
+def _digit_bits(grids):
+    """Bitmask of each cell's digit (bit d-1 for digit d), 0 for blanks."""
+    grids = grids.astype(np.uint32)
+    shifts = np.maximum(grids, 1) - 1
+    return np.where(grids > 0, np.left_shift(np.uint32(1), shifts), np.uint32(0))
+
+
+def _box_view(array, box):
+    """View (N, size, size, ...) as (N, band, row, stack, col, ...)."""
+    n = array.shape[0]
+    return array.reshape((n, box, box, box, box) + array.shape[3:])
+
+
+def candidate_masks(grids):
+    """
+    Compute candidate bitmasks for a whole batch at once.
+    Returns an (N, size, size) uint32 array with, for every blank cell, the
+    digits not yet used in its row, column or box; filled cells get 0.
+    """
+    _require_numpy()
+    grids = np.asarray(grids)
+    size = grids.shape[1]
+    box = box_size(size)
+    bits = _digit_bits(grids)
+
+    rows = np.bitwise_or.reduce(bits, axis=2)
+    cols = np.bitwise_or.reduce(bits, axis=1)
+    boxes = np.bitwise_or.reduce(np.bitwise_or.reduce(_box_view(bits, box), axis=4), axis=2)
+    box_cells = np.repeat(np.repeat(boxes, box, axis=1), box, axis=2)
+
+    used = rows[:, :, None] | cols[:, None, :] | box_cells
+    all_digits = np.uint32((1 << size) - 1)
+    return np.where(grids == 0, all_digits & ~used, np.uint32(0))
+
+
+def _unit_counts(onehot, box):
+    """
+    Per-unit digit counts of an (N, size, size, size) one-hot array:
+    (rows, cols, boxes), each shaped (N, unit, digit).
+    """
+    n, size = onehot.shape[:2]
+    rows = onehot.sum(axis=2)
+    cols = onehot.sum(axis=1)
+    boxes = _box_view(onehot, box).sum(axis=(2, 4)).reshape(n, size, size)
+    return rows, cols, boxes
+
+
+def propagate(grids):
+    """
+    Run naked and hidden singles over a batch until no puzzle changes.
+
+    Returns (grids, status): a filled-in copy of the batch and an (N,)
+    array of OPEN, SOLVED or INVALID. Only open puzzles are worked on in
+    each round, so solved and contradictory ones drop out early.
+    """
+    _require_numpy()
+    grids = np.array(grids, dtype=np.uint8)
+    n, size = grids.shape[:2]
+    box = box_size(size)
+    digits = np.arange(size, dtype=np.uint32)
+    status = np.full(n, OPEN, dtype=np.uint8)
+    active = np.arange(n)
+
+    for _ in range(MAX_ROUNDS):
+        if active.size == 0:
+            break
+        batch = grids[active]
+        placed = (batch[..., None] == (digits + 1)).astype(np.uint8)
+        masks = candidate_masks(batch)
+        cands = ((masks[..., None] >> digits) & 1).astype(np.uint8)
+        count = cands.sum(axis=3)
+        blank = batch == 0
+
+        # Contradictions: duplicate digits, dead cells, or a digit with
+        # no place left in some unit
+        placed_units = _unit_counts(placed, box)
+        cand_units = _unit_counts(cands, box)
+        invalid = (blank & (count == 0)).any(axis=(1, 2))
+        for placed_unit, cand_unit in zip(placed_units, cand_units):
+            invalid |= (placed_unit > 1).any(axis=(1, 2))
+            invalid |= ((placed_unit == 0) & (cand_unit == 0)).any(axis=(1, 2))
+
+        solved = ~blank.any(axis=(1, 2)) & ~invalid
+        status[active[invalid]] = INVALID
+        status[active[solved]] = SOLVED
+
+        # Naked singles: blank cells with exactly one candidate
+        fill = np.where(blank & (count == 1), cands.argmax(axis=3) + 1, 0)
+
+        # Hidden singles: a digit with exactly one candidate cell in a unit
+        row_units, col_units, box_units = cand_units
+        row_hidden = (row_units == 1) & (placed_units[0] == 0)
+        col_hidden = (col_units == 1) & (placed_units[1] == 0)
+        box_hidden = (box_units == 1) & (placed_units[2] == 0)
+        hidden = (
+            row_hidden[:, :, None, :]
+            | col_hidden[:, None, :, :]
+            | np.repeat(np.repeat(
+                box_hidden.reshape(-1, box, box, size), box, axis=1), box, axis=2)
+        ) & cands.astype(bool)
+        hidden_cells = hidden.any(axis=3) & (fill == 0)
+        fill = np.where(hidden_cells, hidden.argmax(axis=3) + 1, fill)
+
+        progress = (fill > 0).any(axis=(1, 2)) & ~invalid
+        batch = np.where(progress[:, None, None], batch + fill.astype(np.uint8), batch)
+        grids[active] = batch
+        active = active[progress]
+
+    return grids, status
+
+
+def solve_array(grids, engine="dlx"):
+    """
+    Solve an (N, size, size) batch: propagate singles across the whole
+    batch with NumPy, then hand only the puzzles still open to the scalar
+    engine. Returns (solutions, solved) where solved is an (N,) bool array
+    and rows of solutions for unsolved puzzles are left as propagated.
+    """
+    grids, status = propagate(grids)
+    solve = get_engine(engine)
+    solved = status == SOLVED
+    for index in np.flatnonzero(status == OPEN):
+        solution = solve(grids[index].tolist())
+        if solution is not None:
+            grids[index] = solution
+            solved[index] = True
+    return grids, solved
+
+
+def propagate_boards(boards):
+    """
+    Run propagate over a list of same-size boards (nested lists or
+    Boards). Returns (boards, status): the filled-in boards, each of its
+    input's kind, and the OPEN, SOLVED or INVALID status of each.
+    """
+    _require_numpy()
+    if not boards:
+        return [], []
+    size = len(boards[0])
+    flat = np.array([cell_values(board) for board in boards], dtype=np.uint8)
+    grids, status = propagate(flat.reshape(len(boards), size, size))
+    filled = [board_like(board, grid.tobytes()) for board, grid in zip(boards, grids)]
+    return filled, status.tolist()
@@ -0,0 +1,39 @@
+# Solver/workers.py
+
+import multiprocessing
+import os
+
+CANCEL_POLL_INTERVAL = 0.05  # Seconds between checks of the caller's cancel flag
+
+# In workers: shared id of the latest job that has been stopped
+_stopped_job = None
+
+
+def stop_flag():
+    """
+    Make the shared value a pool's workers watch for stopped jobs. Pass
+    it to init_worker as the pool initializer's argument; setting its
+    value to a job id stops that job and every earlier one.
+    """
+    return multiprocessing.RawValue("q", 0)
+
+
+def init_worker(stopped_job):
+    """Pool initializer: keep the stop flag made by stop_flag()."""
+    global _stopped_job
+    _stopped_job = stopped_job
+
+
+class JobStopped:
+    """Cancel flag a worker hands to its search: set once the job is stopped."""
+
+    def __init__(self, job):
+        self.job = job
+
+    def is_set(self):
+        return _stopped_job.value >= self.job
+
+
+def ping():
+    return os.getpid()
+
@@ -0,0 +1,110 @@
+"""
+Compare the object-graph DLX core against the array-backed one.
+
+Run from the repository root:
+
+    python -m benchmarks.dlx_cores
+"""
+
+import time
+import tracemalloc
+
+from Solver.DLX import DLX
+from Solver.array_dlx import ArrayDLX, sudoku_row_columns
+
+PUZZLES = [
+    "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+    "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+    "100007090030020008009600500005300900010080002600004000300000010040000007007000300",
+    "520006000000000701300000000000400800600000050000000000041800000000030020008700000",
+]
+
+
+def parse(line):
+    return [[int(line[r * 9 + c]) for c in range(9)] for r in range(9)]
+
+
+def candidate_rows(board):
+    """
+    Return the column ids of every option consistent with the givens:
+    the given itself in a filled cell, and in an empty one each digit
+    its row, column and box do not already hold.
+    """
+    size, subgrid = 9, 3
+    used = set()
+    for row in range(size):
+        for col in range(size):
+            digit = board[row][col]
+            if digit:
+                used.update(sudoku_row_columns(size, subgrid, row, col, digit)[1:])
+
+    rows = []
+    for row in range(size):
+        for col in range(size):
+            given = board[row][col]
+            digits = [given] if given else range(1, size + 1)
+            for digit in digits:
+                columns = sudoku_row_columns(size, subgrid, row, col, digit)
+                if given or not used.intersection(columns[1:]):
+                    rows.append(columns)
+    return rows
+
+
+def build_object_dlx(rows):
+    dlx = DLX(columns=4 * 81)
+    dlx.add_options(rows)
+    return dlx
+
+
+def build_array_dlx(rows):
+    dlx = ArrayDLX(4 * 81, capacity=4 * len(rows))
+    dlx.add_rows(rows)
+    return dlx
+
+
+def measure(build, rows, repeats=5):
+    """Return best build time, best search time, peak traced bytes and the solution."""
+    build_times, search_times = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        dlx = build(rows)
+        built = time.perf_counter()
+        dlx.solve()
+        done = time.perf_counter()
+        build_times.append(built - start)
+        search_times.append(done - built)
+
+    # Memory is traced in a separate run so it does not skew the timings
+    tracemalloc.start()
+    dlx = build(rows)
+    dlx.solve()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(build_times), min(search_times), peak, decode(rows, dlx.solutions)
+
+
+def decode(rows, solutions):
+    """Map the first solution's row ids back to sorted (digit, row, col) placements."""
+    if not solutions:
+        return None
+    placements = []
+    for row_id in solutions[0]:
+        pos, row_column = rows[row_id][:2]
+        placements.append(((row_column - 81) % 9 + 1, pos // 9, pos % 9))
+    return sorted(placements)
+
+
+def main():
+    print(f"{'core':<8}{'build ms':>10}{'search ms':>11}{'peak KiB':>10}")
+    for line in PUZZLES:
+        rows = candidate_rows(parse(line))
+        obj = measure(build_object_dlx, rows)
+        arr = measure(build_array_dlx, rows)
+        assert obj[3] == arr[3], "cores disagree"
+        for name, (build, search, peak, _) in (("objects", obj), ("arrays", arr)):
+            print(f"{name:<8}{build * 1e3:>10.2f}{search * 1e3:>11.2f}{peak / 1024:>10.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare wall-clock time of a single DLX search against the same search
+split across worker processes by Solver.parallel, on the hardest puzzle
+of some corpora and on exhaustive solution counting.
+
+Run from the repository root:
+
+    python -m benchmarks.parallel              # one worker per CPU
+    python -m benchmarks.parallel --workers 4
+
+Splitting only pays off with several cores; on a single CPU the workers
+share it and the parallel times come out slower.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from Solver.DLX import SudokuSolver
+from Solver.parallel import ParallelSolver
+from Solver.stats import SolveStats
+
+from .suite import make_corpus
+
+# name, box size, fraction of cells given, puzzle count
+CORPORA = [
+    ("9x9-hard", 3, 0.28, 60),
+    ("16x16-medium", 4, 0.45, 10),
+]
+# Counting corpus: sparse 9x9 puzzles with many solutions
+COUNT_CORPUS = ("9x9-multi", 3, 0.25, 20)
+
+
+def hardest(solver, puzzles):
+    """The puzzle whose DLX search takes the most nodes."""
+    def nodes(puzzle):
+        stats = SolveStats()
+        solver.solve(puzzle, stats=stats)
+        return stats.nodes
+    return max(puzzles, key=nodes)
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.parallel")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--count-limit", type=int, default=100000,
+                        help="stop counting at this many solutions (default: 100000)")
+    args = parser.parse_args(argv)
+
+    solver = SudokuSolver()
+    print(f"{'task':<22}{'serial ms':>11}{'parallel ms':>13}{'speedup':>9}")
+    with ParallelSolver(workers=args.workers) as parallel:
+        parallel.start()
+        for corpus in CORPORA:
+            puzzle = hardest(solver, make_corpus(*corpus))
+            _, serial = timed(solver.solve, puzzle)
+            _, split = timed(parallel.solve, puzzle)
+            print(f"{'solve ' + corpus[0]:<22}{serial * 1e3:>11.1f}{split * 1e3:>13.1f}"
+                  f"{serial / split:>8.2f}x")
+
+        puzzle = make_corpus(*COUNT_CORPUS)[0]
+        expected, serial = timed(solver.count_solutions, puzzle, args.count_limit)
+        count, split = timed(parallel.count_solutions, puzzle, args.count_limit)
+        assert count == expected, "parallel count disagrees"
+        print(f"{'count ' + COUNT_CORPUS[0]:<22}{serial * 1e3:>11.1f}{split * 1e3:>13.1f}"
+              f"{serial / split:>8.2f}x")
+        print(f"\n{count} solutions counted with {args.workers} workers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Time every engine on each puzzle of a spread of corpora, fit the
+portfolio thresholds to those timings and compare the fitted choice
+against each engine on its own.
+
+Run from the repository root:
+
+    python -m benchmarks.portfolio                       # print thresholds
+    python -m benchmarks.portfolio --output thresholds.json
+
+Before fitting, the overhead of a race is measured: a warm
+PortfolioSolver races both engines on easy puzzles, and the time beyond
+what race_time expects with no overhead is averaged. Pass --cores to fit
+for a machine with a different number of cores than this one.
+
+A thresholds file can be loaded with Solver.features.load_thresholds and
+passed to PortfolioSolver. Paste the printed values into
+DEFAULT_THRESHOLDS and RACE_OVERHEAD to change the built-in choice; the
+defaults are fitted with --cores 2, the fewest on which races are run.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from Solver.budget import BudgetExceeded
+from Solver.engines import ENGINES
+from Solver.features import (
+    DEFAULT_THRESHOLDS,
+    Thresholds,
+    decision_times,
+    learn_thresholds,
+    puzzle_features,
+    race_time,
+)
+from Solver.portfolio import PortfolioSolver
+
+from .suite import CORPORA, make_corpus, percentile
+
+RACED = ("backtracking", "dlx")
+
+# The suite's corpora plus extra densities, so the fit sees the whole
+# range from near-complete grids down to the hardest sparse ones,
+# including the larger grids near their hardness peak where either
+# engine can get stuck
+CORPORA = CORPORA + [
+    ("9x9-near-complete", 3, 0.7, 60),
+    ("9x9-full-half", 3, 0.55, 60),
+    ("9x9-sparse", 3, 0.25, 60),
+    ("16x16-sparse", 4, 0.3, 20),
+    ("25x25-hard", 5, 0.5, 16),
+]
+RACE_OVERHEAD_CORPUS = ("9x9-race", 3, 0.7, 40)
+
+TIME_LIMIT = 2.0  # Seconds; slower solves are cut off and counted as this long
+
+
+def best_time(solve, puzzle, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = solve(puzzle, None, TIME_LIMIT)
+        elapsed = time.perf_counter() - started
+        if isinstance(result, BudgetExceeded):
+            return TIME_LIMIT  # Repeating a cut-off solve tells nothing new
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def collect_history(corpora, repeat=3):
+    """Return [(Features, {engine: seconds})] for every puzzle of the corpora."""
+    history = []
+    for name, box, given, count in corpora:
+        for puzzle in make_corpus(name, box, given, count):
+            times = {engine: best_time(ENGINES[engine], puzzle, repeat) for engine in RACED}
+            history.append((puzzle_features(puzzle), times))
+    return history
+
+
+def measure_race_overhead(repeat=3):
+    """
+    Race both engines in a warm PortfolioSolver on puzzles they each
+    solve in a moment, and return the mean time a race took beyond
+    race_time with no overhead on this machine's cores. Every race
+    counts, not just the fastest, since a loser that is slow to stop
+    holds up the next race. Starting the workers is a one-off cost and
+    is left out.
+    """
+    cores = os.cpu_count() or 1
+    always_race = {9: Thresholds(None, None, None, None)}
+    extra = []
+    with PortfolioSolver(always_race, race=True) as solver:
+        puzzles = make_corpus(*RACE_OVERHEAD_CORPUS)
+        solver.solve(puzzles[0])  # Start the workers
+        for puzzle in puzzles:
+            times = {engine: best_time(ENGINES[engine], puzzle, repeat) for engine in RACED}
+            expected = race_time(times, 0.0, cores)
+            extra.extend(solver.solve(puzzle).elapsed - expected for _ in range(repeat))
+    return statistics.mean(extra)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.portfolio")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="solves per puzzle, fastest kept (default: 3)")
+    parser.add_argument("--cores", type=int, default=os.cpu_count() or 1,
+                        help="cores a race gets (default: this machine's)")
+    parser.add_argument("--output", help="write thresholds and history as JSON")
+    args = parser.parse_args(argv)
+
+    for engine in RACED:
+        ENGINES[engine](make_corpus(*CORPORA[0])[0])  # Warm up the DLX templates
+    overhead = measure_race_overhead(args.repeat)
+    history = collect_history(CORPORA, args.repeat)
+    thresholds = learn_thresholds(history, overhead, args.cores)
+
+    strategies = {engine: [times[engine] for _, times in history] for engine in RACED}
+    strategies["oracle"] = [min(times.values()) for _, times in history]
+    strategies["default thresholds"] = decision_times(
+        DEFAULT_THRESHOLDS, history, overhead, args.cores)
+    strategies["learned thresholds"] = decision_times(thresholds, history, overhead, args.cores)
+
+    print(f"race overhead {overhead * 1e3:.1f} ms, fitted for {args.cores} cores")
+    print(f"{len(history)} puzzles")
+    print(f"{'strategy':<22}{'total ms':>10}{'p95 ms':>9}{'max ms':>9}")
+    for name, spent in strategies.items():
+        spent = sorted(spent)
+        print(f"{name:<22}{sum(spent) * 1e3:>10.1f}{percentile(spent, 0.95) * 1e3:>9.3f}"
+              f"{spent[-1] * 1e3:>9.3f}")
+    print("\nLearned thresholds:")
+    for size, values in thresholds.items():
+        print(f"  {size}: {values}")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({
+                "race_overhead": overhead,
+                "cores": args.cores,
+                "thresholds": {size: values._asdict() for size, values in thresholds.items()},
+                "history": [
+                    {"features": features._asdict(), "times": times}
+                    for features, times in history if features is not None
+                ],
+            }, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Benchmark every registered solver engine over fixed, locally generated
+corpora and optionally check the results against a stored baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.suite                      # print a report
+    python -m benchmarks.suite --output run.json    # also write JSON
+    python -m benchmarks.suite --runs 3 --baseline benchmarks/baseline.json
+
+With --baseline the exit status is 1 when any engine/corpus pair is
+slower than the baseline by more than --threshold (default 25%) on p50
+or p95 latency, or has lost that much throughput.
+
+Absolute timings only hold on the machine that took them, so each solve
+is also divided by the time of a fixed pure-Python calibration loop run
+just before and after it, and the baseline check is made on these
+relative times (p50_rel, p95_rel and mean_rel). That way a baseline
+carries over between machines, and from a quiet moment to a busy one.
+To refresh it after an intended performance change, run:
+
+    python -m benchmarks.suite --runs 5 --output benchmarks/baseline.json
+
+--runs repeats the whole suite and keeps the median of each metric, so
+one lucky or unlucky run does not set the bar.
+
+The corpora stay inside the envelope where every engine finishes
+reliably. Random 25x25 grids with 40-50% of the cells given sit at the
+hardness peak and are left out: there, even with randomized restarts,
+the backtracking engine solves only about half of them within 10 seconds.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from Solver.engines import ENGINES
+
+# name, box size, fraction of cells given, puzzle count
+CORPORA = [
+    ("9x9-easy", 3, 0.45, 60),
+    ("9x9-medium", 3, 0.35, 60),
+    ("9x9-hard", 3, 0.28, 60),
+    ("16x16-medium", 4, 0.45, 10),
+    ("25x25-easy", 5, 0.6, 3),
+    ("25x25-medium", 5, 0.55, 3),
+]
+SEED = 20240601
+CHECKED_METRICS = ("p50_rel", "p95_rel")
+CALIBRATION_STEPS = 10_000  # About as long as an easy 9x9 solve
+
+
+def calibrate(steps=CALIBRATION_STEPS):
+    """
+    Time a fixed workload of the integer, bitmask and list operations the
+    engines spend their time on, independent of the solver code, and
+    return the elapsed milliseconds.
+    """
+    started = time.perf_counter()
+    masks = [0] * 81
+    total = 0
+    for step in range(steps):
+        cell = step % 81
+        bit = 1 << (step % 9)
+        masks[cell] ^= bit
+        total += (masks[cell] & ~bit).bit_count()
+    return (time.perf_counter() - started) * 1e3
+
+
+def random_solution(box, rng):
+    """A random valid grid: a shuffled copy of the canonical pattern."""
+    size = box * box
+    pattern = [[(box * (row % box) + row // box + col) % size + 1
+                for col in range(size)] for row in range(size)]
+    digits = list(range(1, size + 1))
+    rng.shuffle(digits)
+    rows = [band * box + i for band in rng.sample(range(box), box)
+            for i in rng.sample(range(box), box)]
+    cols = [stack * box + i for stack in rng.sample(range(box), box)
+            for i in rng.sample(range(box), box)]
+    return [[digits[pattern[row][col] - 1] for col in cols] for row in rows]
+
+
+def make_corpus(name, box, given, count):
+    """Deterministically generate a corpus: the same name gives the same puzzles."""
+    rng = random.Random(f"{SEED}:{name}")
+    puzzles = []
+    for _ in range(count):
+        solution = random_solution(box, rng)
+        puzzles.append([[value if rng.random() < given else 0 for value in row]
+                        for row in solution])
+    return puzzles
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_engine(solve, puzzles, measure_memory=True, repeat=3):
+    """
+    Time each solve and return the latency, throughput and memory summary.
+    Each puzzle is solved `repeat` times and its fastest time kept, which
+    filters out most scheduler noise on shared machines. Each solve is
+    also divided by the mean of calibration runs timed just before and
+    after it, which cancels out the machine's speed at that moment; the
+    fastest of those relative times is kept the same way.
+    """
+    solve(puzzles[0])  # Warm up caches such as the DLX templates
+
+    latencies = []
+    relative = []
+    unsolved = 0
+    before = calibrate() / 1e3
+    for puzzle in puzzles:
+        best = best_relative = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            solution = solve(puzzle)
+            elapsed = time.perf_counter() - started
+            after = calibrate() / 1e3
+            best = elapsed if best is None else min(best, elapsed)
+            ratio = elapsed / ((before + after) / 2)
+            before = after
+            best_relative = ratio if best_relative is None else min(best_relative, ratio)
+        if solution is None:
+            unsolved += 1
+        latencies.append(best)
+        relative.append(best_relative)
+    total = sum(latencies)
+
+    peak = None
+    if measure_memory:
+        # Traced separately: tracemalloc slows allocation-heavy code
+        tracemalloc.start()
+        for puzzle in puzzles:
+            solve(puzzle)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    latencies.sort()
+    relative.sort()
+    return {
+        "puzzles": len(puzzles),
+        "unsolved": unsolved,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p95_ms": percentile(latencies, 0.95) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "throughput_per_s": len(puzzles) / total if total else None,
+        "peak_memory_kib": peak / 1024 if peak is not None else None,
+        "p50_rel": percentile(relative, 0.50),
+        "p95_rel": percentile(relative, 0.95),
+        "mean_rel": sum(relative) / len(relative),
+    }
+
+
+def run_suite(engines, corpora, measure_memory=True, repeat=3):
+    results = {}
+    for name, box, given, count in corpora:
+        puzzles = make_corpus(name, box, given, count)
+        for engine in engines:
+            results[f"{engine}/{name}"] = run_engine(
+                ENGINES[engine], puzzles, measure_memory, repeat)
+    return {
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def median_run(runs):
+    """Combine several runs of the same suite, keeping each metric's median."""
+    results = {}
+    for key in runs[0]["results"]:
+        samples = [run["results"][key] for run in runs]
+        results[key] = {
+            metric: (statistics.median(sample[metric] for sample in samples)
+                     if samples[0][metric] is not None else None)
+            for metric in samples[0]
+        }
+    return dict(runs[0], results=results, runs=len(runs))
+
+
+def compare(run, baseline, threshold):
+    """
+    Return a list of human-readable regressions of run against baseline,
+    judged on solve times relative to the calibration loop.
+    """
+    regressions = []
+    for key, base in baseline["results"].items():
+        current = run["results"].get(key)
+        if current is None:
+            continue
+        for metric in CHECKED_METRICS:
+            if current[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f"{key}: {metric} {current[metric]:.3f} vs baseline {base[metric]:.3f}"
+                )
+        # Throughput is the inverse of the mean solve time
+        if current["mean_rel"] * (1 - threshold) > base["mean_rel"]:
+            regressions.append(
+                f"{key}: throughput down to {base['mean_rel'] / current['mean_rel']:.0%} "
+                f"of baseline"
+            )
+    return regressions
+
+
+def print_report(run):
+    print(f"{'engine/corpus':<32}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'per s':>9}{'peak KiB':>10}{'p50 rel':>9}")
+    for key, stats in run["results"].items():
+        peak = stats["peak_memory_kib"]
+        print(f"{key:<32}{stats['p50_ms']:>9.3f}{stats['p95_ms']:>9.3f}"
+              f"{stats['p99_ms']:>9.3f}{stats['throughput_per_s']:>9.1f}"
+              f"{peak if peak is not None else float('nan'):>10.0f}"
+              f"{stats['p50_rel']:>9.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("--engine", action="append", choices=sorted(ENGINES),
+                        help="engine to run (repeatable; default: all)")
+    parser.add_argument("--corpus", action="append",
+                        choices=[corpus[0] for corpus in CORPORA],
+                        help="corpus to run (repeatable; default: all)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown as a fraction (default: 0.25)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="solves per puzzle, fastest kept (default: 3)")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="runs of the whole suite, median kept (default: 1)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc pass")
+    args = parser.parse_args(argv)
+
+    engines = args.engine or sorted(ENGINES)
+    corpora = [corpus for corpus in CORPORA
+               if not args.corpus or corpus[0] in args.corpus]
+    run = median_run([
+        run_suite(engines, corpora, measure_memory=not args.no_memory, repeat=args.repeat)
+        for _ in range(args.runs)
+    ])
+    print_report(run)
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(run, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        regressions = compare(run, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions against baseline:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,12 @@
 # main.py
 
 import pygame
-from solvers.DLX import SudokuSolver
-from solvers.backtracking import backTrackingSolver
+from Solver.DLX import SudokuSolver
+from Solver.backtracking import backTrackingSolver
+from Solver.conflicts import ConflictTracker
+from Solver.portfolio import PortfolioSolver
+from Solver.session import DLXSession
+import threading
 import time
 
 # Initialize Pygame
@@ -10,7 +14,7 @@ pygame.init()
 
 # Constants
 WIDTH, HEIGHT = 600,600
-EXTRA_HEIGHT = 200
+EXTRA_HEIGHT = 220
 GRID_SIZE = 9
 CELL_SIZE = WIDTH // GRID_SIZE
 FONT = pygame.font.SysFont('Arial', 40)
@@ -33,7 +37,13 @@ grid = [
 fixed_grid = [
     [0 for _ in range(9)] for _ in range(9)
 ]
-error_grid = [[0 for _ in range(9)] for _ in range(9)]
+# Cells whose digit clashes with another in the same row, column or box
+conflicts = ConflictTracker(GRID_SIZE)
+
+# The grid kept loaded in DLX for live solvability checks and hints;
+# searches are capped so a keystroke never stalls the UI
+session = DLXSession(size=GRID_SIZE)
+LIVE_CHECK_NODES = 500
 
 # Message display
 message = "Input mode enabled. Enter your puzzle."
@@ -42,72 +52,133 @@ message_color = BLACK
 # Input mode flag
 input_mode = True
 
-# Draw grid function
-def draw_grid():
-    # Fill background
-    screen.fill(WHITE)
-
-    # Highlight selected cell
-    if selected_cell:
-        row, col = selected_cell
-        rect = pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-        pygame.draw.rect(screen, LIGHT_BLUE, rect)
-
-    # Draw grid lines
-    for x in range(0, WIDTH + 1, CELL_SIZE):
-        line_width = 4 if x % (3 * CELL_SIZE) == 0 else 1
-        pygame.draw.line(screen, BLACK, (x, 0), (x, HEIGHT), line_width)
-    for y in range(0, HEIGHT + 1, CELL_SIZE):
-        line_width = 4 if y % (3 * CELL_SIZE) == 0 else 1
-        pygame.draw.line(screen, BLACK, (0, y), (WIDTH, y), line_width)
-
-    # Draw numbers
-    draw_numbers()
+# Background solve in progress, if any
+solve_job = None
+SPINNER = "|/-\\"
+
+INSTRUCTIONS = [
+    "Instructions:",
+    "Click on a cell and press 1-9 to enter a number.",
+    "Press Enter to toggle input mode.",
+    "Press B to solve using Backtracking.",
+    "Press D to solve using DLX.",
+    "Press A to let the solver pick the engine.",
+    "Press Esc to cancel a running solve.",
+    "Press H for a hint.",
+    "Press R to reset the grid."
+]
 
-    # Draw message area
-    pygame.draw.rect(screen, GRAY, (0, HEIGHT, WIDTH, EXTRA_HEIGHT))
-    msg_text = SMALL_FONT.render(message, True, message_color)
-    screen.blit(msg_text, (10, HEIGHT + 10))
-
-    # Display instructions
-    instructions = [
-        "Instructions:",
-        "Click on a cell and press 1-9 to enter a number.",
-        "Press Enter to toggle input mode.",
-        "Press B to solve using Backtracking.",
-        "Press D to solve using DLX.",
-        "Press R to reset the grid."
-    ]
-    for idx, line in enumerate(instructions):
+# Frame rate while a solve is running (the spinner animates); when idle
+# the loop sleeps until the next event instead
+FPS = 30
+MESSAGE_RECT = pygame.Rect(0, HEIGHT, WIDTH, 30)
+
+# Rendered surfaces, built once and reused every frame
+digit_cache = {}
+board_surfaces = {}
+panel_surface = None
+
+# What is currently on screen, so only changed areas are redrawn
+drawn_cells = {}
+drawn_message = None
+
+# Render a digit once per color and reuse the surface
+def digit_surface(value, color):
+    key = (value, color)
+    surface = digit_cache.get(key)
+    if surface is None:
+        surface = digit_cache[key] = FONT.render(str(value), True, color)
+    return surface
+
+# Pre-render the empty board (plain and highlighted) and the instructions panel
+def build_surfaces():
+    global panel_surface
+    for selected, background in ((False, WHITE), (True, LIGHT_BLUE)):
+        surface = pygame.Surface((WIDTH, HEIGHT))
+        surface.fill(background)
+        # Draw grid lines
+        for x in range(0, WIDTH + 1, CELL_SIZE):
+            line_width = 4 if x % (3 * CELL_SIZE) == 0 else 1
+            pygame.draw.line(surface, BLACK, (x, 0), (x, HEIGHT), line_width)
+        for y in range(0, HEIGHT + 1, CELL_SIZE):
+            line_width = 4 if y % (3 * CELL_SIZE) == 0 else 1
+            pygame.draw.line(surface, BLACK, (0, y), (WIDTH, y), line_width)
+        board_surfaces[selected] = surface
+
+    panel_surface = pygame.Surface((WIDTH, EXTRA_HEIGHT))
+    panel_surface.fill(GRAY)
+    for idx, line in enumerate(INSTRUCTIONS):
         instr_text = SMALL_FONT.render(line, True, BLACK)
-        screen.blit(instr_text, (10, HEIGHT + 40 + idx * 20))
+        panel_surface.blit(instr_text, (10, 40 + idx * 20))
+
+# Forget what is on screen so the next draw repaints everything
+def invalidate():
+    global drawn_message
+    drawn_cells.clear()
+    drawn_message = None
+
+# Color of the digit in a cell, or None for a blank cell
+def cell_color(row, col):
+    if grid[row][col] == 0:
+        return None
+    if fixed_grid[row][col]:
+        return BLACK
+    if (row, col) in conflicts.conflicts:
+        return RED
+    return BLUE
+
+# Redraw one cell from the pre-rendered board and return its rect
+def draw_cell(row, col, key):
+    value, color, selected = key
+    rect = pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+    screen.blit(board_surfaces[selected], rect, rect)
+    if value != 0:
+        text = digit_surface(value, color)
+        screen.blit(text, text.get_rect(center=rect.center))
+    return rect
+
+# Draw whatever changed since the last frame and update only those areas
+def draw_grid():
+    global drawn_message
+    dirty = []
+    if not drawn_cells:
+        screen.blit(panel_surface, (0, HEIGHT))
+        dirty.append(pygame.Rect(0, HEIGHT, WIDTH, EXTRA_HEIGHT))
 
-# Display numbers in grid
-def draw_numbers():
     for i in range(GRID_SIZE):
         for j in range(GRID_SIZE):
-            value = grid[i][j]
-            if value != 0:
-                if fixed_grid[i][j]:
-                    color = BLACK
-                elif error_grid[i][j]:
-                    color = RED
-                else:
-                    color = BLUE
-                text = FONT.render(str(value), True, color)
-                text_rect = text.get_rect(center=(j * CELL_SIZE + CELL_SIZE//2, i * CELL_SIZE + CELL_SIZE//2))
-                screen.blit(text, text_rect)
+            key = (grid[i][j], cell_color(i, j), selected_cell == (i, j))
+            if drawn_cells.get((i, j)) != key:
+                drawn_cells[(i, j)] = key
+                dirty.append(draw_cell(i, j, key))
+
+    # Draw message area
+    if drawn_message != (message, message_color):
+        drawn_message = (message, message_color)
+        screen.blit(panel_surface, MESSAGE_RECT, MESSAGE_RECT.move(0, -HEIGHT))
+        msg_text = SMALL_FONT.render(message, True, message_color)
+        screen.blit(msg_text, (10, HEIGHT + 10))
+        dirty.append(MESSAGE_RECT)
+
+    if dirty:
+        pygame.display.update(dirty)
 
 # Reset the grid to initial state
 def reset_grid():
-    global grid, fixed_grid, error_grid, message, message_color, input_mode
+    global grid, fixed_grid, message, message_color, input_mode, solve_job, session
+    if solve_job:
+        # Abandon the running solve; its result is never applied
+        solve_job.cancel()
+        solve_job = None
     grid = [
         [0 for _ in range(9)] for _ in range(9)
     ]
     fixed_grid = [
         [0 for _ in range(9)] for _ in range(9)
     ]
-    error_grid = [[0 for _ in range(9)] for _ in range(9)]
+    conflicts.reset()
+    session.close()
+    session = DLXSession(size=GRID_SIZE)
     message = "Grid Reset. Input mode enabled."
     message_color = BLACK
     input_mode = True
@@ -115,93 +186,136 @@ def reset_grid():
 # Handle user input for a cell
 def handle_input(row, col, value):
     global message, message_color
+    if solve_job:
+        message = "Solving... press Esc to cancel before editing."
+        message_color = RED
+        return
     if not input_mode and fixed_grid[row][col]:
         message = "Cannot change a fixed cell!"
         message_color = RED
         return
-    if value in range(1, 10):
-        grid[row][col] = value
-        error_grid[row][col] = 0
-        message = ""
-    else:
-        grid[row][col] = 0
-        message = ""
-
-# Check for errors in the grid (rows, columns, and subgrids)
-def check_grid():
-    global error_grid
-    # Reset error grid
-    error_grid = [[0 for _ in range(9)] for _ in range(9)]
-
-    # Check rows for duplicates
-    for row in range(GRID_SIZE):
-        seen = {}
-        for col in range(GRID_SIZE):
-            val = grid[row][col]
-            if val != 0:
-                if val in seen:
-                    error_grid[row][col] = 1
-                    error_grid[row][seen[val]] = 1
-                else:
-                    seen[val] = col
+    if value not in range(1, 10):
+        value = 0
+    grid[row][col] = value
+    conflicts.set_cell(row, col, value)
+    session.set_cell(row, col, value)
+    message = ""
+    # Live feedback: warn as soon as the grid can no longer be completed
+    if conflicts.is_valid() and session.is_solvable(LIVE_CHECK_NODES) is False:
+        message = "No solution from here!"
+        message_color = RED
+
+# Suggest a next move and select its cell
+def show_hint():
+    global message, message_color, selected_cell
+    if solve_job:
+        return
+    hint = session.hint(LIVE_CHECK_NODES * 20)
+    if hint is None:
+        message = "No hint available."
+        message_color = RED
+        return
+    selected_cell = (hint.row, hint.col)
+    reason = "forced" if hint.forced else "from the solution"
+    message = f"Hint: {hint.digit} at row {hint.row + 1}, column {hint.col + 1} ({reason})"
+    message_color = BLUE
+
+class SolveJob:
+    """Runs a solver on a snapshot of the grid in a background thread."""
+
+    def __init__(self, solver_type, board):
+        self.solver_type = solver_type
+        self.cancel_event = threading.Event()
+        self.solved_grid = None
+        self.time_elapsed = ""
+        self.start_time = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, args=(board,), daemon=True)
+        self.thread.start()
+
+    def run(self, board):
+        if self.solver_type == 'backtracking':
+            solved_grid, elapsed_time = backTrackingSolver(board, cancel=self.cancel_event)
+            self.solved_grid = solved_grid
+            self.time_elapsed = f"{elapsed_time:.5f} seconds"
+        elif self.solver_type == 'auto':
+            # Engine picked from the puzzle's features; no racing, which
+            # would need worker processes next to the UI
+            result = PortfolioSolver(race=False).solve(board, cancel=self.cancel_event)
+            self.solved_grid = result.solution
+            self.time_elapsed = f"{result.elapsed:.5f} seconds ({result.engine})"
+        else:
+            # Using DLX solver
+            result = SudokuSolver().solve(board, cancel=self.cancel_event)
+            if result["found_solutions"]:
+                # Assuming we take the first solution
+                self.solved_grid = result["found_solutions"][0]
+            self.time_elapsed = result["time_elapsed"]
+
+    def done(self):
+        return not self.thread.is_alive()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def progress(self):
+        """Status line shown while the solve is running."""
+        elapsed = time.perf_counter() - self.start_time
+        spinner = SPINNER[int(elapsed * 8) % len(SPINNER)]
+        name = {'backtracking': "Backtracking", 'auto': "the best engine"}.get(self.solver_type, "DLX")
+        return f"{spinner} Solving with {name}... {elapsed:.1f}s (Esc to cancel)"
 
-    # Check columns for duplicates
-    for col in range(GRID_SIZE):
-        seen = {}
-        for row in range(GRID_SIZE):
-            val = grid[row][col]
-            if val != 0:
-                if val in seen:
-                    error_grid[row][col] = 1
-                    error_grid[seen[val]][col] = 1
-                else:
-                    seen[val] = row
-
-    # Check subgrids for duplicates
-    for box_row in range(3):
-        for box_col in range(3):
-            seen = {}
-            for i in range(3):
-                for j in range(3):
-                    row = box_row * 3 + i
-                    col = box_col * 3 + j
-                    val = grid[row][col]
-                    if val != 0:
-                        if val in seen:
-                            error_grid[row][col] = 1
-                            error_grid[seen[val][0]][seen[val][1]] = 1
-                        else:
-                            seen[val] = (row, col)
 
 # Solve the grid using the specified solver
 def solve_puzzle(solver_type='backtracking'):
-    global grid, message, message_color
-    if any(1 in row for row in error_grid):
+    global solve_job, message, message_color
+    if solve_job:
+        return
+    if not conflicts.is_valid():
         message = "Cannot solve. Please fix errors first."
         message_color = RED
         return
 
-    if solver_type == 'backtracking':
-        solved_grid, elapsed_time = backTrackingSolver(grid)
-        if solved_grid:
-            grid = solved_grid
-            message = f"Puzzle Solved! Time: {elapsed_time:.5f} seconds"
-            message_color = BLUE
-        else:
-            message = "No solution exists!"
-            message_color = RED
+    # The worker gets its own copy; grid only changes once it finishes
+    solve_job = SolveJob(solver_type, [row[:] for row in grid])
+    message = solve_job.progress()
+    message_color = BLACK
+
+# Stop a running solve; its result is discarded when the worker exits
+def cancel_solve():
+    global message, message_color
+    if solve_job and not solve_job.cancelled():
+        solve_job.cancel()
+        message = "Cancelling..."
+        message_color = BLACK
+
+# Apply the worker's result once it has finished
+def poll_solve():
+    global solve_job, grid, message, message_color
+    if not solve_job:
+        return
+    if not solve_job.done():
+        if not solve_job.cancelled():
+            message = solve_job.progress()
+        return
+
+    job, solve_job = solve_job, None
+    if job.cancelled():
+        message = "Solve cancelled."
+        message_color = BLACK
+    elif job.solved_grid:
+        grid = job.solved_grid
+        conflicts.load(grid)
+        for row in range(GRID_SIZE):
+            for col in range(GRID_SIZE):
+                session.set_cell(row, col, grid[row][col])
+        message = f"Puzzle Solved! Time: {job.time_elapsed}"
+        message_color = BLUE
     else:
-        # Using DLX solver
-        solver = SudokuSolver()
-        result = solver.solve(grid)
-        if result["found_solutions"]:
-            # Assuming we take the first solution
-            grid = result["found_solutions"][0]
-            message = f"Puzzle Solved! Time: {result['time_elapsed']}"
-            message_color = BLUE
-        else:
-            message = "No solution exists!"
-            message_color = RED
+        message = "No solution exists!"
+        message_color = RED
 
 # Main game loop
 running = True
@@ -209,13 +323,25 @@ selected_cell = None
 solve_triggered = False
 reset_triggered = False
 
+build_surfaces()
+draw_grid()
+clock = pygame.time.Clock()
+
 while running:
-    draw_grid()
+    if solve_job:
+        events = pygame.event.get()
+    else:
+        # Nothing animates while idle: sleep until something happens
+        events = [pygame.event.wait()] + pygame.event.get()
 
-    for event in pygame.event.get():
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
 
+        # The window was uncovered or restored: repaint it all
+        if event.type in (pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT):
+            invalidate()
+
         # Select cell with mouse click
         if event.type == pygame.MOUSEBUTTONDOWN:
             pos = pygame.mouse.get_pos()
@@ -263,7 +389,13 @@ while running:
                     message = "Input mode enabled. Modify the grid as needed."
                     message_color = BLACK
 
+            if event.key == pygame.K_ESCAPE:
+                cancel_solve()
+
             # Debounced key presses for solving and resetting
+            if event.key == pygame.K_h:
+                show_hint()
+
             if event.key == pygame.K_r and not reset_triggered:
                 reset_grid()
                 reset_triggered = True
@@ -273,15 +405,20 @@ while running:
             if event.key == pygame.K_d and not solve_triggered:
                 solve_puzzle('dlx')
                 solve_triggered = True
+            if event.key == pygame.K_a and not solve_triggered:
+                solve_puzzle('auto')
+                solve_triggered = True
 
         if event.type == pygame.KEYUP:
             if event.key == pygame.K_r:
                 reset_triggered = False
-            if event.key in [pygame.K_b, pygame.K_d]:
+            if event.key in [pygame.K_b, pygame.K_d, pygame.K_a]:
                 solve_triggered = False
 
-    check_grid()
-    pygame.display.update()
+    poll_solve()
+    draw_grid()
+    if solve_job:
+        clock.tick(FPS)
 
 pygame.quit()
 
@@ -0,0 +1,89 @@
+import random
+
+# A 9x9 puzzle with a unique solution that needs real search
+HARD = (
+    "800000000003600000070090200050007000000045700"
+    "000100030001000068008500010090000400"
+)
+
+
+def box_of(size):
+    return {4: 2, 9: 3, 16: 4, 25: 5}[size]
+
+
+def random_grid(size, seed):
+    """A random complete grid: a shuffled copy of the canonical pattern."""
+    rng = random.Random(seed)
+    box = box_of(size)
+    pattern = [[(box * (row % box) + row // box + col) % size + 1
+                for col in range(size)] for row in range(size)]
+    digits = list(range(1, size + 1))
+    rng.shuffle(digits)
+    rows = [band * box + i for band in rng.sample(range(box), box)
+            for i in rng.sample(range(box), box)]
+    cols = [stack * box + i for stack in rng.sample(range(box), box)
+            for i in rng.sample(range(box), box)]
+    return [[digits[pattern[row][col] - 1] for col in cols] for row in rows]
+
+
+def blank_cells(grid, given, seed):
+    """Copy a solved grid keeping about `given` of its cells."""
+    rng = random.Random(seed)
+    return [[value if rng.random() < given else 0 for value in row] for row in grid]
+
+
+def as_rows(board):
+    """Nested lists for a nested-list board or anything indexable by row."""
+    return [list(board[row]) for row in range(len(board))]
+
+
+def is_solution(puzzle, solution):
+    """True if solution is a complete, valid grid agreeing with the puzzle's givens."""
+    size = len(puzzle)
+    box = box_of(size)
+    rows = as_rows(solution)
+    digits = set(range(1, size + 1))
+    units = rows + [list(col) for col in zip(*rows)] + [
+        [rows[top + r][left + c] for r in range(box) for c in range(box)]
+        for top in range(0, size, box) for left in range(0, size, box)
+    ]
+    if any(set(unit) != digits for unit in units):
+        return False
+    givens = as_rows(puzzle)
+    return all(not givens[row][col] or givens[row][col] == rows[row][col]
+               for row in range(size) for col in range(size))
+
+
+def random_transform(board, rng):
+    """
+    Apply a random validity-preserving transform: digit relabeling, band
+    and row swaps, stack and column swaps and maybe a transposition.
+    """
+    size = len(board)
+    box = box_of(size)
+    labels = list(range(1, size + 1))
+    rng.shuffle(labels)
+    rows = [band * box + i for band in rng.sample(range(box), box)
+            for i in rng.sample(range(box), box)]
+    cols = [stack * box + i for stack in rng.sample(range(box), box)
+            for i in rng.sample(range(box), box)]
+    grid = [[board[row][col] for col in cols] for row in rows]
+    if rng.random() < 0.5:
+        grid = [list(line) for line in zip(*grid)]
+    return [[labels[value - 1] if value else 0 for value in line] for line in grid]
+
+
+def matrix_state(dlx):
+    """Every link and count of a DLX matrix, for comparing snapshots."""
+    return tuple(tuple(links) for links in (dlx.L, dlx.R, dlx.U, dlx.D, dlx.C, dlx.S))
+
+
+def assert_templates_pristine(size=9):
+    """Every pooled template of this size must match a freshly built one."""
+    from Solver.array_dlx import _template_pool, build_sudoku_template
+
+    fresh = matrix_state(build_sudoku_template(size, box_of(size)))
+    pool = _template_pool.get(size, [])
+    assert pool, "no template was returned to the pool"
+    for dlx in pool:
+        assert matrix_state(dlx) == fresh
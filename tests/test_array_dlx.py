@@ -0,0 +1,91 @@
+from array import array
+
+from Solver.array_dlx import ArrayDLX, build_sudoku_template, decode_sudoku_row
+
+# Knuth's example from "Dancing Links": the only exact cover is rows 0, 3 and 4
+KNUTH_ROWS = [
+    [2, 4, 5],
+    [0, 3, 6],
+    [1, 2, 5],
+    [0, 3],
+    [1, 6],
+    [3, 4, 6],
+]
+
+
+def links(dlx):
+    return [list(values) for values in (dlx.L, dlx.R, dlx.U, dlx.D, dlx.C, dlx.S)]
+
+
+def test_knuth_example():
+    dlx = ArrayDLX(7)
+    assert dlx.add_rows(KNUTH_ROWS) == range(6)
+    assert sorted(dlx.solve()[0]) == [0, 3, 4]
+    assert dlx.found_solution
+
+
+def test_rows_added_one_at_a_time_match_bulk_insertion():
+    bulk = ArrayDLX(7, capacity=sum(map(len, KNUTH_ROWS)))
+    bulk.add_rows(KNUTH_ROWS)
+    single = ArrayDLX(7)
+    for row_id, columns in enumerate(KNUTH_ROWS):
+        assert single.add_row(columns) == row_id
+    used = bulk.used
+    assert single.used == used
+    assert [values[:used] for values in links(single)[:5]] == \
+        [values[:used] for values in links(bulk)[:5]]
+    assert single.S == bulk.S
+
+
+def test_links_are_compact_arrays():
+    dlx = build_sudoku_template(9, 3)
+    for values in (dlx.L, dlx.R, dlx.U, dlx.D, dlx.C, dlx.ROW, dlx.S):
+        assert isinstance(values, array)
+    # Preallocated exactly: four nodes per option, no spare slots
+    assert dlx.used == len(dlx.L) == 1 + 4 * 81 + 4 * 9 ** 3
+
+
+def test_unpack_and_pack_round_trip():
+    dlx = build_sudoku_template(4, 2)
+    before = links(dlx)
+    dlx.unpack()
+    assert isinstance(dlx.L, list)
+    assert len(dlx.solve()[0]) == 16
+    dlx.pack()
+    assert isinstance(dlx.L, array)
+    assert links(dlx) == before
+
+
+def test_empty_rows_are_rejected():
+    dlx = ArrayDLX(3)
+    try:
+        dlx.add_row([])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an empty row was accepted")
+
+
+def test_out_of_range_columns_are_rejected():
+    dlx = ArrayDLX(3, num_secondary=1)
+    before = links(dlx)
+    for columns in ([0, 3], [-1, 1]):
+        try:
+            dlx.add_row(columns)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"row {columns} was accepted")
+    assert links(dlx) == before
+    assert len(dlx.row_heads) == 0
+
+
+def test_template_solution_decodes_to_a_grid():
+    dlx = build_sudoku_template(4, 2)
+    cells = {}
+    for row_id in dlx.solve()[0]:
+        digit, row, col = decode_sudoku_row(4, row_id)
+        cells[row, col] = digit
+    assert len(cells) == 16
+    for row in range(4):
+        assert {cells[row, col] for col in range(4)} == {1, 2, 3, 4}
@@ -0,0 +1,74 @@
+import pytest
+
+from Solver.backtracking import (
+    backTrackingSolver,
+    init_masks,
+    pick_branch,
+    solve_backtracking,
+)
+
+from .helpers import HARD, blank_cells, is_solution, random_grid
+
+
+def parse(line):
+    size = int(len(line) ** 0.5)
+    return [[int(line[row * size + col]) for col in range(size)] for row in range(size)]
+
+
+@pytest.mark.parametrize("presolve", [True, False])
+def test_solves_hard_puzzle(presolve):
+    puzzle = parse(HARD)
+    solution = solve_backtracking([row[:] for row in puzzle], presolve=presolve)
+    assert is_solution(puzzle, solution)
+
+
+def test_solver_leaves_the_input_untouched():
+    puzzle = parse(HARD)
+    original = [row[:] for row in puzzle]
+    solution, elapsed = backTrackingSolver(puzzle)
+    assert puzzle == original
+    assert is_solution(puzzle, solution)
+    assert elapsed >= 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_puzzles(seed):
+    puzzle = blank_cells(random_grid(9, seed), 0.35, seed)
+    solution, _ = backTrackingSolver(puzzle)
+    assert is_solution(puzzle, solution)
+
+
+def test_clashing_givens_have_no_solution():
+    puzzle = parse(HARD)
+    puzzle[0][1] = 8  # A second 8 in the first row
+    assert init_masks(puzzle) is None
+    assert backTrackingSolver(puzzle)[0] is None
+
+
+def test_unsolvable_puzzle():
+    # Every digit but 9 in the first row, and a 9 in the last cell's column
+    puzzle = [[0] * 9 for _ in range(9)]
+    puzzle[0][:8] = range(1, 9)
+    puzzle[5][8] = 9
+    assert backTrackingSolver(puzzle)[0] is None
+
+
+def test_pick_branch_takes_naked_singles():
+    puzzle = [[0] * 4 for _ in range(4)]
+    puzzle[0][:3] = [1, 2, 3]
+    rows, cols, boxes, empties, all_digits = init_masks(puzzle)
+    choices = pick_branch(empties, len(empties), rows, cols, boxes, all_digits)
+    assert len(choices) == 1
+    index, bit = choices[0]
+    assert empties[index][:2] == (0, 3)
+    assert bit == 1 << 3
+
+
+def test_pick_branch_prefers_the_narrowest_choice():
+    rows, cols, boxes, empties, all_digits = init_masks(parse(HARD))
+    choices = pick_branch(empties, len(empties), rows, cols, boxes, all_digits)
+    # MRV never branches wider than the emptiest cell of an empty unit
+    assert 1 <= len(choices) <= 9
+    for index, bit in choices:
+        row, col, box, _ = empties[index]
+        assert not (rows[row] | cols[col] | boxes[box]) & bit
@@ -0,0 +1,62 @@
+import pytest
+
+from Solver.batch import BatchResult, solve_chunk, solve_many
+from Solver.board import Board
+from Solver.budget import MAX_NODES
+
+from .helpers import HARD, blank_cells, is_solution, random_grid
+
+
+def puzzles(count):
+    return [Board.from_rows(blank_cells(random_grid(9, seed), 0.4, seed)) for seed in range(count)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunksize", [1, 3, 64])
+def test_ordered_results_follow_input(workers, chunksize):
+    boards = puzzles(10)
+    results = list(solve_many(boards, workers=workers, chunksize=chunksize))
+    assert [result.index for result in results] == list(range(10))
+    for board, result in zip(boards, results):
+        assert result.exceeded is None
+        assert is_solution(board, result.solution)
+        assert result.elapsed >= 0
+
+
+@pytest.mark.parametrize("engine", ["auto", "backtracking", "dlx"])
+def test_unordered_results_cover_every_puzzle(engine):
+    boards = puzzles(10)
+    results = list(solve_many(boards, engine=engine, workers=2, chunksize=2, ordered=False))
+    assert sorted(result.index for result in results) == list(range(10))
+    for result in results:
+        assert is_solution(boards[result.index], result.solution)
+
+
+def test_inputs_are_read_lazily():
+    def generate():
+        for seed in range(5):
+            yield Board.from_rows(blank_cells(random_grid(9, seed), 0.5, seed))
+
+    results = solve_many(generate(), workers=1, chunksize=2)
+    assert next(results).index == 0
+    assert [result.index for result in results] == [1, 2, 3, 4]
+
+
+def test_none_and_unsolvable_boards_stay_aligned():
+    bad = Board.from_line(HARD)
+    bad.cells[1] = 8  # Clashes with the 8 in the top-left corner
+    results = solve_chunk("dlx", [(0, None), (1, bad), (2, Board.from_line(HARD))])
+    assert results[0] == BatchResult(0, None, 0.0)
+    assert results[1].solution is None and results[1].exceeded is None
+    assert is_solution(Board.from_line(HARD), results[2].solution)
+
+
+def test_budget_overrun_is_reported():
+    [result] = solve_many([Board.from_line(HARD)], workers=1, max_nodes=1)
+    assert result.solution is None
+    assert result.exceeded.reason == MAX_NODES
+
+
+def test_unknown_engine_fails_fast():
+    with pytest.raises(ValueError, match="Unknown engine"):
+        next(solve_many([], engine="nope"))
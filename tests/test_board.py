@@ -0,0 +1,68 @@
+import pytest
+
+from Solver.board import Board, board_like, copy_board, format_board
+from Solver.engines import ENGINES
+
+from .helpers import HARD, is_solution, random_grid
+
+
+def test_line_round_trip():
+    board = Board.from_line(HARD)
+    assert len(board) == 9
+    assert format_board(board) == HARD.replace("0", ".")
+    assert Board.from_line(format_board(board)) == board
+    assert board.rows()[0][0] == 8
+
+
+def test_rows_read_and_write_through():
+    board = Board.from_rows(random_grid(4, 1))
+    board[1][2] = 0
+    assert board.cells[1 * 4 + 2] == 0
+    assert board.rows()[1][2] == 0
+    with pytest.raises(IndexError):
+        board[4]
+
+
+def test_copies_are_independent():
+    board = Board.from_line(HARD)
+    copy = board.copy()
+    copy[0][1] = 1
+    assert board[0][1] == 0
+    assert copy_board(board) == board
+    assert copy_board(board) is not board
+
+
+def test_equal_boards_hash_alike():
+    first = Board.from_line(HARD)
+    second = Board.from_rows(first.rows())
+    assert first == second
+    assert {first: "hard"}[second] == "hard"
+    second[0][1] = 1
+    assert first != second
+    assert first != first.rows()
+
+
+def test_board_like_keeps_the_input_kind():
+    grid = random_grid(9, 2)
+    values = [value for row in grid for value in row]
+    board = board_like(Board.from_rows(grid), values)
+    assert isinstance(board, Board)
+    assert board.rows() == grid
+    assert board_like(grid, values) == grid
+
+
+def test_cell_count_must_match_size():
+    with pytest.raises(ValueError):
+        Board(9, bytes(80))
+    with pytest.raises(ValueError):
+        Board(10)
+
+
+@pytest.mark.parametrize("engine", ["backtracking", "dlx"])
+def test_engines_solve_boards_without_mutating_them(engine):
+    board = Board.from_line(HARD)
+    before = board.copy()
+    solution = ENGINES[engine](board)
+    assert isinstance(solution, Board)
+    assert board == before
+    assert is_solution(board.rows(), solution.rows())
@@ -0,0 +1,51 @@
+import pytest
+
+from Solver.backtracking import backTrackingSolver
+from Solver.board import Board
+from Solver.budget import MAX_NODES, TIMEOUT, BudgetExceeded
+from Solver.DLX import SudokuSolver
+from Solver.engines import ENGINES
+from Solver.stats import SolveStats
+
+from .helpers import HARD, is_solution
+
+
+@pytest.mark.parametrize("engine", ["backtracking", "dlx"])
+def test_max_nodes_stops_the_search(engine):
+    result = ENGINES[engine](Board.from_line(HARD), None, None, 5)
+    assert isinstance(result, BudgetExceeded)
+    assert result.reason == MAX_NODES
+    assert result.stats.budget_exceeded == MAX_NODES
+    assert result.stats.nodes == 6  # Stops on the first node past the limit
+    assert not result.stats.solved
+
+
+@pytest.mark.parametrize("engine", ["backtracking", "dlx"])
+def test_timeout_stops_the_search(engine):
+    result = ENGINES[engine](Board.from_line(HARD), None, 0.0, None)
+    assert isinstance(result, BudgetExceeded)
+    assert result.reason == TIMEOUT
+    assert result.elapsed >= 0.0
+
+
+@pytest.mark.parametrize("engine", ["backtracking", "dlx"])
+def test_ample_budget_solves(engine):
+    board = Board.from_line(HARD)
+    solution = ENGINES[engine](board, None, 60.0, 10**6)
+    assert is_solution(board.rows(), solution.rows())
+
+
+def test_backtracking_overrun_returns_no_grid():
+    stats = SolveStats()
+    solution, elapsed = backTrackingSolver(Board.from_line(HARD), stats, max_nodes=5)
+    assert solution is None
+    assert elapsed > 0
+    assert stats.budget_exceeded == MAX_NODES
+
+
+def test_dlx_overrun_keeps_presolve_time():
+    result = SudokuSolver().solve(Board.from_line(HARD), max_nodes=5)
+    exceeded = result["budget_exceeded"]
+    assert result["found_solutions"] == []
+    assert exceeded.stats.presolve_time > 0
+    assert exceeded.stats.covers == 0  # No column counting without caller stats
@@ -0,0 +1,88 @@
+import random
+
+from Solver.board import Board
+from Solver.cache import SolutionCache
+from Solver.conflicts import is_valid_board
+from Solver.DLX import SudokuSolver
+from Solver.generator import generate_puzzle
+
+from .helpers import is_solution, random_transform
+
+
+def test_transformed_puzzles_hit_the_cache():
+    rng = random.Random(7)
+    cache = SolutionCache()
+    solver = SudokuSolver(cache=cache)
+    for seed in range(3):
+        puzzle = generate_puzzle(9, rng=random.Random(seed)).puzzle
+        solver.solve(puzzle)
+        hits = cache.hits
+        for _ in range(20):
+            copy = random_transform(puzzle, rng)
+            solutions = solver.solve(copy)["found_solutions"]
+            assert len(solutions) == 1
+            assert is_solution(copy, solutions[0])
+        assert cache.hits == hits + 20
+    assert len(cache) == 3
+
+
+def test_unsolvable_puzzles_are_cached():
+    cache = SolutionCache()
+    solver = SudokuSolver(cache=cache)
+    puzzle = generate_puzzle(9, rng=random.Random(3)).puzzle
+    # A digit that fits the givens but not the unique solution
+    solution = solver.solve(puzzle)["found_solutions"][0]
+    broken = None
+    for row, col in ((r, c) for r in range(9) for c in range(9) if not puzzle[r][c]):
+        for digit in range(1, 10):
+            candidate = [line[:] for line in puzzle]
+            candidate[row][col] = digit
+            if digit != solution[row][col] and is_valid_board(candidate):
+                broken = candidate
+                break
+        if broken is not None:
+            break
+    assert solver.solve(broken)["found_solutions"] == []
+    hits = cache.hits
+    assert solver.solve(random_transform(broken, random.Random(1)))["found_solutions"] == []
+    assert cache.hits == hits + 1
+
+
+def test_sqlite_tier_outlives_memory(tmp_path):
+    path = str(tmp_path / "solutions.db")
+    puzzle = generate_puzzle(9, rng=random.Random(5)).puzzle
+    cache = SolutionCache(path=path)
+    SudokuSolver(cache=cache).solve(puzzle)
+    cache.close()
+
+    cache = SolutionCache(path=path)
+    copy = random_transform(puzzle, random.Random(2))
+    solutions = SudokuSolver(cache=cache).solve(copy)["found_solutions"]
+    assert cache.hits == 1
+    assert is_solution(copy, solutions[0])
+    cache.close()
+
+
+def test_lru_evicts_the_oldest_entry():
+    cache = SolutionCache(maxsize=2)
+    solver = SudokuSolver(cache=cache)
+    puzzles = [generate_puzzle(9, rng=random.Random(seed)).puzzle for seed in range(3)]
+    for puzzle in puzzles:
+        solver.solve(puzzle)
+    assert len(cache) == 2
+    solver.solve(puzzles[0])
+    assert cache.hits == 0
+    solver.solve(random_transform(puzzles[2], random.Random(4)))
+    assert cache.hits == 1
+
+
+def test_board_hits_come_back_as_boards():
+    cache = SolutionCache()
+    solver = SudokuSolver(cache=cache)
+    puzzle = generate_puzzle(9, rng=random.Random(8)).puzzle
+    solver.solve(puzzle)
+    board = Board.from_rows(random_transform(puzzle, random.Random(9)))
+    [solution] = solver.solve(board)["found_solutions"]
+    assert cache.hits == 1
+    assert isinstance(solution, Board)
+    assert is_solution(board.rows(), solution)
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+from Solver.board import Board, format_board
+from Solver.cli import BUDGET_EXCEEDED, INVALID, NO_SOLUTION, main
+
+from .helpers import HARD, is_solution
+
+UNSOLVABLE = "88" + HARD[2:]
+
+
+def write_puzzles(tmp_path, lines):
+    path = tmp_path / "puzzles.txt"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_solves_every_line(tmp_path):
+    source = write_puzzles(tmp_path, ["# comment", HARD, "", HARD.replace("0", ".")])
+    output = tmp_path / "out.txt"
+    assert main([str(source), "-o", str(output)]) == 0
+    lines = output.read_text().splitlines()
+    assert len(lines) == 2
+    for line in lines:
+        assert is_solution(Board.from_line(HARD).rows(), Board.from_line(line).rows())
+
+
+def test_invalid_line_sets_exit_code(tmp_path, capsys):
+    source = write_puzzles(tmp_path, [HARD, "12345", UNSOLVABLE])
+    output = tmp_path / "out.txt"
+    assert main([str(source), "-o", str(output), "-e", "backtracking"]) == 1
+    lines = output.read_bytes().splitlines()
+    assert lines[1:] == [INVALID, NO_SOLUTION]
+    assert "line 2" in capsys.readouterr().err
+
+
+def test_budget_and_summary(tmp_path, capsys):
+    source = write_puzzles(tmp_path, [HARD])
+    output = tmp_path / "out.txt"
+    assert main([str(source), "-o", str(output), "--max-nodes", "1", "--summary"]) == 0
+    assert output.read_bytes().splitlines() == [BUDGET_EXCEEDED]
+    assert "1 over budget" in capsys.readouterr().err
+
+
+def test_module_streams_stdin_to_stdout():
+    result = subprocess.run([sys.executable, "-m", "Solver", "-j", "2"],
+                            input=(HARD + "\n").encode(), capture_output=True, check=False)
+    assert result.returncode == 0
+    solution = Board.from_line(result.stdout.strip())
+    assert format_board(solution) == result.stdout.decode().strip()
+    assert is_solution(Board.from_line(HARD).rows(), solution.rows())
+
+
+def test_unknown_engine_exits_with_usage_error():
+    result = subprocess.run([sys.executable, "-m", "Solver", "-e", "nope"],
+                            input=b"", capture_output=True, check=False)
+    assert result.returncode == 2
+    assert b"invalid choice" in result.stderr
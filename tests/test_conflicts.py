@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from Solver.board import Board
+from Solver.conflicts import ConflictTracker, is_valid_board
+
+from .helpers import HARD, box_of, random_grid
+
+
+def brute_conflicts(grid):
+    size = len(grid)
+    box = box_of(size)
+    clashing = set()
+    for row in range(size):
+        for col in range(size):
+            value = grid[row][col]
+            if not value:
+                continue
+            for other_row in range(size):
+                for other_col in range(size):
+                    if (other_row, other_col) == (row, col) or grid[other_row][other_col] != value:
+                        continue
+                    if (other_row == row or other_col == col
+                            or (other_row // box, other_col // box) == (row // box, col // box)):
+                        clashing.add((row, col))
+    return clashing
+
+
+@pytest.mark.parametrize("size", [4, 9])
+def test_random_edits_match_a_full_rescan(size):
+    rng = random.Random(size)
+    tracker = ConflictTracker(size)
+    grid = [[0] * size for _ in range(size)]
+    for _ in range(400):
+        row, col = rng.randrange(size), rng.randrange(size)
+        value = rng.choice([0, rng.randint(1, size)])
+        tracker.set_cell(row, col, value)
+        grid[row][col] = value
+        assert tracker.conflicts == brute_conflicts(grid)
+        assert tracker.is_valid() == (not tracker.conflicts)
+        assert tracker.is_valid() == is_valid_board(grid)
+    assert tracker.values == grid
+
+
+def test_load_and_reset():
+    grid = Board.from_line(HARD).rows()
+    grid[0][1] = 8
+    tracker = ConflictTracker.from_board(grid)
+    assert tracker.conflicts == {(0, 0), (0, 1)}
+    tracker.set_cell(0, 1, 0)
+    assert tracker.is_valid()
+    tracker.reset()
+    assert tracker.values == [[0] * 9 for _ in range(9)]
+    assert not any(holders for unit in tracker.positions for holders in unit)
+
+
+def test_out_of_range_value_leaves_state_alone():
+    tracker = ConflictTracker(4)
+    tracker.set_cell(0, 0, 3)
+    with pytest.raises(ValueError, match="out of range"):
+        tracker.set_cell(0, 0, 5)
+    assert tracker.values[0][0] == 3
+    assert tracker.is_valid()
+
+
+def test_is_valid_board():
+    assert is_valid_board(Board.from_line(HARD))
+    assert is_valid_board(random_grid(16, 0))
+    clash = Board.from_line(HARD)
+    clash.cells[80] = 8  # Same column as the 8 in row 6
+    assert not is_valid_board(clash)
+    too_big = Board.from_line(HARD).rows()
+    too_big[0][1] = 10
+    assert not is_valid_board(too_big)
+    ragged = Board.from_line(HARD).rows()
+    ragged[3].append(0)
+    assert not is_valid_board(ragged)
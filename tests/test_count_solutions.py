@@ -0,0 +1,53 @@
+import pytest
+
+from Solver.backtracking import count_solutions
+from Solver.DLX import SudokuSolver
+
+from .helpers import HARD, blank_cells, random_grid
+
+
+def parse(line):
+    return [[int(line[row * 9 + col]) for col in range(9)] for row in range(9)]
+
+
+def dlx_count(board, limit=2, presolve=True):
+    return SudokuSolver().count_solutions(board, limit, presolve)
+
+
+ENGINES = [count_solutions, dlx_count]
+
+
+@pytest.mark.parametrize("count", ENGINES)
+@pytest.mark.parametrize("presolve", [True, False])
+def test_every_4x4_grid(count, presolve):
+    empty = [[0] * 4 for _ in range(4)]
+    assert count(empty, 1000, presolve) == 288
+
+
+@pytest.mark.parametrize("count", ENGINES)
+def test_limit_stops_early(count):
+    empty = [[0] * 9 for _ in range(9)]
+    assert count(empty, 1) == 1
+    assert count(empty, 7) == 7
+
+
+@pytest.mark.parametrize("count", ENGINES)
+def test_unique_and_contradictory(count):
+    puzzle = parse(HARD)
+    assert count(puzzle, 2) == 1
+    puzzle[0][1] = 8
+    assert count(puzzle, 2) == 0
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_engines_agree(seed):
+    puzzle = blank_cells(random_grid(9, seed), 0.3, seed)
+    assert count_solutions(puzzle, 500) == dlx_count(puzzle, 500)
+
+
+def test_count_leaves_the_board_untouched():
+    puzzle = parse(HARD)
+    original = [row[:] for row in puzzle]
+    count_solutions(puzzle)
+    dlx_count(puzzle)
+    assert puzzle == original
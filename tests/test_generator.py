@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from Solver import generator
+from Solver.backtracking import count_solutions
+from Solver.DLX import SudokuSolver
+from Solver.generator import SYMMETRIES, cell_orbits, generate_many, generate_puzzle
+
+from .helpers import is_solution
+
+
+@pytest.mark.parametrize("size, symmetry, seed", [
+    (4, "none", 1),
+    (9, "none", 2),
+    (9, "rotational", 3),
+    (9, "full", 4),
+])
+def test_generated_puzzles_are_unique(size, symmetry, seed):
+    generated = generate_puzzle(size, symmetry, rng=random.Random(seed))
+    puzzle, solution = generated.puzzle, generated.solution
+    assert is_solution(puzzle, solution)
+    assert count_solutions([row[:] for row in puzzle], limit=2) == 1
+    assert SudokuSolver().count_solutions(puzzle, limit=2) == 1
+    for orbit in cell_orbits(size, symmetry):
+        assert len({bool(puzzle[row][col]) for row, col in orbit}) == 1
+
+
+def test_generated_puzzles_are_minimal():
+    generated = generate_puzzle(9, rng=random.Random(5))
+    puzzle = generated.puzzle
+    for row in range(9):
+        for col in range(9):
+            if puzzle[row][col]:
+                fewer = [line[:] for line in puzzle]
+                fewer[row][col] = 0
+                assert SudokuSolver().count_solutions(fewer, limit=2) == 2
+
+
+def test_difficulty_band_is_hit():
+    generated = generate_puzzle(9, difficulty="medium", rng=random.Random(6))
+    assert generated.difficulty == "medium"
+
+
+def test_generate_many_yields_distinct_unique_puzzles():
+    puzzles = list(generate_many(6, size=9, workers=1, chunksize=4, seed=7))
+    assert len(puzzles) == 6
+    assert len({tuple(map(tuple, p.puzzle)) for p in puzzles}) == 6
+    for generated in puzzles:
+        assert SudokuSolver().count_solutions(generated.puzzle, limit=2) == 1
+
+
+def test_generate_many_is_reproducible():
+    first = [p.puzzle for p in generate_many(3, size=4, workers=1, seed=8)]
+    second = [p.puzzle for p in generate_many(3, size=4, workers=1, seed=8)]
+    assert first == second
+
+
+def test_generate_many_stops_on_unreachable_targets(monkeypatch):
+    # No 4x4 puzzle needs real search, so expert is out of reach; the
+    # give-up bound is max_attempts empty chunks, however many were asked for
+    chunks = []
+    generate_chunk = generator.generate_chunk
+
+    def counting_chunk(*args):
+        chunks.append(args)
+        return generate_chunk(*args)
+
+    monkeypatch.setattr(generator, "generate_chunk", counting_chunk)
+    found = list(generate_many(10_000, size=4, difficulty="expert", workers=1,
+                               chunksize=2, seed=1, max_attempts=3))
+    assert found == []
+    assert len(chunks) == 3
+
+
+def test_bad_arguments_fail_fast():
+    with pytest.raises(ValueError):
+        next(generate_many(1, difficulty="impossible"))
+    with pytest.raises(ValueError):
+        next(generate_many(1, symmetry="spiral"))
+    assert "none" in SYMMETRIES
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from Solver.board import Board, parse_line
+from Solver.DLX import SudokuSolver
+from Solver.parallel import ParallelSolver
+from Solver.workers import JobStopped, init_worker, stop_flag
+
+from .helpers import (
+    HARD,
+    assert_templates_pristine,
+    blank_cells,
+    is_solution,
+    random_grid,
+)
+
+
+@pytest.fixture(scope="module")
+def parallel():
+    with ParallelSolver(workers=2) as solver:
+        yield solver
+
+
+# Givens chosen so each puzzle has tens to hundreds of solutions
+@pytest.mark.parametrize("seed, given", [(1, 0.35), (2, 0.4), (3, 0.4)])
+def test_parallel_count_equals_serial_count(parallel, seed, given):
+    puzzle = blank_cells(random_grid(9, seed), given, seed)
+    expected = SudokuSolver().count_solutions(puzzle, limit=10**4)
+    assert parallel.count_solutions(puzzle) == expected
+    assert parallel.count_solutions(puzzle, limit=10) == min(expected, 10)
+
+
+def test_parallel_count_with_split_depth():
+    puzzle = blank_cells(random_grid(9, 4), 0.3, 4)
+    expected = SudokuSolver().count_solutions(puzzle, limit=10**4)
+    with ParallelSolver(workers=2, depth=3) as solver:
+        assert solver.count_solutions(puzzle) == expected
+
+
+def test_single_worker_count_runs_in_process():
+    puzzle = blank_cells(random_grid(9, 5), 0.3, 5)
+    expected = SudokuSolver().count_solutions(puzzle, limit=10**4)
+    solver = ParallelSolver(workers=1)
+    assert solver.count_solutions(puzzle) == expected
+    assert solver.pool is None
+    assert_templates_pristine()
+
+
+def test_parallel_solve(parallel):
+    puzzle = parse_line(HARD)
+    solution = parallel.solve(puzzle)
+    assert is_solution(puzzle, solution)
+    board_solution = parallel.solve(Board.from_line(HARD))
+    assert isinstance(board_solution, Board)
+    assert board_solution.rows() == solution
+    assert_templates_pristine()
+
+
+def test_parallel_unsolvable_and_clashing(parallel):
+    clashing = parse_line(HARD)
+    clashing[0][1] = 8
+    assert parallel.solve(clashing) is None
+    assert parallel.count_solutions(clashing) == 0
+
+
+def test_parallel_cancel(parallel):
+    cancel = threading.Event()
+    cancel.set()
+    puzzle = [[0] * 9 for _ in range(9)]
+    # The limit bounds the test should the cancel flag be ignored
+    assert parallel.count_solutions(puzzle, limit=10**4, cancel=cancel) < 10**4
+
+
+def test_job_stopped_covers_earlier_jobs():
+    flag = stop_flag()
+    init_worker(flag)
+    assert not JobStopped(2).is_set()
+    flag.value = 2
+    assert JobStopped(1).is_set() and JobStopped(2).is_set()
+    assert not JobStopped(3).is_set()
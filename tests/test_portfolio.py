@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from Solver.board import Board
+from Solver.features import (
+    DEFAULT_THRESHOLDS,
+    Features,
+    Thresholds,
+    choose_engine,
+    learn_thresholds,
+    puzzle_features,
+    race_time,
+)
+from Solver.portfolio import RACE_ENGINES, PortfolioSolver
+
+from .helpers import HARD, is_solution
+
+ALWAYS_RACE = {9: Thresholds(None, None, None, None)}
+
+
+def test_none_leaves_a_test_out():
+    features = Features(9, 0.3, 0.5)
+    assert choose_engine(features, ALWAYS_RACE) is None
+    assert choose_engine(features, {9: Thresholds(None, 0.6, None, None)}) == "backtracking"
+    assert choose_engine(features, {9: Thresholds(0.4, 0.6, None, None)}) is None
+    assert choose_engine(features, {9: Thresholds(None, None, None, 0.5)}) == "dlx"
+    assert choose_engine(features, {9: Thresholds(None, None, 0.3, None)}) == "dlx"
+    assert choose_engine(None, ALWAYS_RACE) == "dlx"
+
+
+def test_default_thresholds_leave_a_race_band():
+    raced = set()
+    for size, limits in DEFAULT_THRESHOLDS.items():
+        for density in (i / 100 for i in range(101)):
+            if choose_engine(Features(size, 0.5, density), {size: limits}) is None:
+                raced.add(size)
+    assert raced
+
+
+def test_race_time_shares_cores():
+    times = {"backtracking": 0.010, "dlx": 0.030}
+    assert race_time(times, 0.002, cores=2) == pytest.approx(0.012)
+    assert race_time(times, 0.002, cores=1) == pytest.approx(0.022)
+
+
+def test_fit_races_only_unpredictable_puzzles():
+    # Low density: backtracking always wins. High density: either engine
+    # may take a second on puzzles that look alike, so racing beats any
+    # fixed choice.
+    history = [(Features(9, 0.5, 0.1 + i / 1000), {"backtracking": 0.001, "dlx": 0.004})
+               for i in range(20)]
+    history += [(Features(9, 0.3, 0.6),
+                 {"backtracking": 1.0 if i % 2 else 0.01, "dlx": 0.01 if i % 2 else 1.0})
+                for i in range(20)]
+    fitted = learn_thresholds(history, race_overhead=0.005, cores=2)
+    assert choose_engine(history[0][0], fitted) == "backtracking"
+    assert choose_engine(history[-1][0], fitted) is None
+    # Without spare cores the race costs twice the winner's time, and
+    # still beats a one-second miss
+    assert choose_engine(history[-1][0], learn_thresholds(history, 0.005, cores=1)) is None
+
+
+def test_race_returns_a_solution():
+    board = Board.from_line(HARD)
+    with PortfolioSolver(ALWAYS_RACE, race=True) as solver:
+        for _ in range(2):
+            result = solver.solve(board)
+            assert result.raced
+            assert result.engine in RACE_ENGINES
+            assert is_solution(board.rows(), result.solution)
+        assert solver.races == 2
+
+
+def test_cancelled_race_gives_up():
+    cancel = threading.Event()
+    cancel.set()
+    with PortfolioSolver(ALWAYS_RACE, race=True) as solver:
+        result = solver.solve(Board.from_line(HARD), cancel)
+    assert result.raced
+    assert result.solution is None
+
+
+def test_close_calls_go_to_dlx_without_racing():
+    board = Board.from_line(HARD)
+    assert choose_engine(puzzle_features(board), ALWAYS_RACE) is None
+    with PortfolioSolver(ALWAYS_RACE, race=False) as solver:
+        result = solver.solve(board)
+        assert solver.pool is None
+    assert (result.engine, result.raced) == ("dlx", False)
+    assert is_solution(board.rows(), result.solution)
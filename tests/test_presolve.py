@@ -0,0 +1,68 @@
+import pytest
+
+from Solver.board import Board
+from Solver.presolve import presolve
+
+from .helpers import HARD, blank_cells, random_grid
+
+
+def empty(size=9):
+    return [[0] * size for _ in range(size)]
+
+
+def has(cands, row, col, digit, size=9):
+    return bool(cands[row * size + col] & (1 << (digit - 1)))
+
+
+def test_singles_finish_an_easy_puzzle():
+    grid = random_grid(9, 0)
+    puzzle = blank_cells(grid, 0.7, 0)
+    solved, cands = presolve(puzzle)
+    assert solved == grid
+    assert all(cand & (cand - 1) == 0 for cand in cands)
+    assert puzzle != grid  # The input is left alone
+
+
+def test_pointing():
+    puzzle = empty()
+    puzzle[1][:3] = [2, 3, 4]
+    puzzle[2][:3] = [5, 6, 7]
+    _, cands = presolve(puzzle)
+    # 1 is confined to row 0 within the top-left box
+    assert has(cands, 0, 0, 1)
+    assert not any(has(cands, 0, col, 1) for col in range(3, 9))
+    assert has(cands, 1, 4, 1)
+
+
+def test_claiming():
+    puzzle = empty()
+    puzzle[0][3:] = [2, 3, 4, 5, 6, 7]
+    _, cands = presolve(puzzle)
+    # 1, 8 and 9 are confined to the top-left box within row 0
+    for digit in (1, 8, 9):
+        assert not any(has(cands, row, col, digit) for row in (1, 2) for col in range(3))
+        assert has(cands, 1, 3, digit)
+
+
+@pytest.mark.parametrize("size", [9, 16])
+@pytest.mark.parametrize("given", [0.3, 0.45])
+def test_eliminations_keep_the_solution(size, given):
+    for seed in range(5):
+        grid = random_grid(size, seed)
+        result = presolve(blank_cells(grid, given, seed))
+        assert result is not None
+        solved, cands = result
+        for row in range(size):
+            for col in range(size):
+                assert solved[row][col] in (0, grid[row][col])
+                assert has(cands, row, col, grid[row][col], size)
+
+
+def test_contradictions():
+    clash = Board.from_line(HARD)
+    clash.cells[1] = 8
+    assert presolve(clash) is None
+    stuck = empty()
+    stuck[0][:8] = range(1, 9)
+    stuck[4][8] = 9  # Cell (0, 8) can only be 9
+    assert presolve(stuck) is None
@@ -0,0 +1,94 @@
+import threading
+
+from Solver.array_dlx import ArrayDLX, build_sudoku_template
+from Solver.search import CANCELLED, EXHAUSTED, FOUND, NODE, PAUSED, READY, DLXSearch
+
+from .helpers import matrix_state
+
+KNUTH_ROWS = [[2, 4, 5], [0, 3, 6], [1, 2, 5], [0, 3], [1, 6], [3, 4, 6]]
+
+
+def knuth():
+    dlx = ArrayDLX(7)
+    dlx.add_rows(KNUTH_ROWS)
+    return dlx
+
+
+def test_step_reaches_the_solution_then_exhausts():
+    dlx = knuth()
+    search = DLXSearch(dlx)
+    assert search.status == READY
+    events = []
+    while True:
+        event = search.step()
+        events.append(event)
+        if event == FOUND:
+            assert sorted(search.solution()) == [0, 3, 4]
+        if event == EXHAUSTED:
+            break
+    assert events.count(FOUND) == 1
+    assert set(events) <= {NODE, FOUND, EXHAUSTED}
+    assert search.nodes == events.count(NODE)
+
+
+def test_search_leaves_the_matrix_as_it_found_it():
+    dlx = build_sudoku_template(4, 2)
+    before = matrix_state(dlx)
+    search = dlx.search()
+    for _ in range(3):
+        assert search.run()
+    search.close()
+    assert matrix_state(dlx) == before
+
+
+def test_paused_search_resumes_to_the_same_solutions():
+    straight = build_sudoku_template(4, 2).search()
+    expected = []
+    while straight.run():
+        expected.append(straight.solution())
+
+    search = build_sudoku_template(4, 2).search()
+    found = []
+    while True:
+        if search.run(max_nodes=3):
+            found.append(search.solution())
+        elif search.status == PAUSED:
+            continue
+        else:
+            break
+    assert search.status == EXHAUSTED
+    assert found == expected
+    assert len(found) == 288  # Every 4x4 Sudoku grid
+
+
+def test_cancel_event_stops_the_search():
+    dlx = build_sudoku_template(9, 3)
+    before = matrix_state(dlx)
+    event = threading.Event()
+    event.set()
+    search = dlx.search(event)
+    assert not search.run()
+    assert search.status == CANCELLED
+    assert not search.stack
+    assert matrix_state(dlx) == before
+
+
+def test_cancel_method_stops_a_paused_search():
+    dlx = build_sudoku_template(9, 3)
+    before = matrix_state(dlx)
+    search = dlx.search()
+    assert not search.run(max_nodes=10)
+    assert search.status == PAUSED
+    search.cancel()
+    assert not search.run()
+    assert search.status == CANCELLED
+    assert not search.run()
+    assert matrix_state(dlx) == before
+
+
+def test_counters():
+    search = knuth().search()
+    search.run()
+    assert search.max_depth == 3
+    assert search.branch_points >= 3
+    assert search.alternatives >= search.branch_points
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+
+from Solver.server import SolveServer
+
+from .helpers import HARD
+
+
+async def exchange(port, raw):
+    """Send raw bytes and return (status code, decoded JSON body)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def post(body, headers=""):
+    return (f"POST /solve HTTP/1.1\r\nConnection: close\r\n{headers}"
+            f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+
+@pytest.fixture(scope="module")
+def run():
+    loop = asyncio.new_event_loop()
+    server = SolveServer(port=0, workers=1)
+    loop.run_until_complete(server.start())
+    yield lambda raw: loop.run_until_complete(exchange(server.port, raw))
+    loop.run_until_complete(server.close())
+    loop.close()
+
+
+def test_solve_single_and_batch(run):
+    status, body = run(post(json.dumps({"puzzle": HARD}).encode()))
+    assert status == 200 and body["status"] == "solved"
+    status, body = run(post(json.dumps({"puzzles": [HARD, "12", "0" * 81]}).encode()))
+    assert status == 200
+    assert [result["status"] for result in body["results"]] == ["solved", "invalid", "solved"]
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1.5"])
+def test_malformed_content_length_is_400(run, length):
+    raw = f"POST /solve HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()
+    status, body = run(raw)
+    assert status == 400
+    assert "Content-Length" in body["error"]
+
+
+def test_oversized_header_is_400(run):
+    raw = b"GET /health HTTP/1.1\r\nX-Filler: " + b"a" * 100_000 + b"\r\n\r\n"
+    status, _ = run(raw)
+    assert status == 400
+
+
+def test_bad_requests(run):
+    assert run(post(b"{not json"))[0] == 400
+    assert run(post(b'{"puzzle": 1, "puzzles": []}'))[0] == 400
+    assert run(b"GET /solve HTTP/1.1\r\nConnection: close\r\n\r\n")[0] == 405
+    assert run(b"GET /nowhere HTTP/1.1\r\nConnection: close\r\n\r\n")[0] == 404
+
+
+def test_health_and_stats(run):
+    assert run(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n") == (200, {"status": "ok"})
+    status, stats = run(b"GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n")
+    assert status == 200 and stats["puzzles"] >= 1
+
+
+def test_unexpected_error_is_logged_500(run, monkeypatch, caplog):
+    async def broken(self, payload):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(SolveServer, "solve_request", broken)
+    status, body = run(post(json.dumps({"puzzle": HARD}).encode()))
+    assert status == 500
+    assert "boom" not in body["error"]
+    assert "boom" in caplog.text
+    monkeypatch.undo()
+    assert run(post(json.dumps({"puzzle": HARD}).encode()))[0] == 200
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from Solver.backtracking import count_solutions
+from Solver.session import DLXSession
+
+from .helpers import assert_templates_pristine, blank_cells, is_solution, random_grid
+
+
+@pytest.mark.parametrize("size, seed", [(4, 1), (9, 2), (9, 3)])
+def test_session_matches_count_solutions_over_random_edits(size, seed):
+    rng = random.Random(seed)
+    grid = random_grid(size, seed)
+    values = blank_cells(grid, 0.3, seed)
+    with DLXSession(values) as session:
+        for _ in range(150):
+            row, col = rng.randrange(size), rng.randrange(size)
+            choice = rng.random()
+            if choice < 0.4:
+                value = 0
+            elif choice < 0.8:
+                value = grid[row][col]
+            else:
+                value = rng.randint(1, size)
+            session.set_cell(row, col, value)
+            values[row][col] = value
+
+            expected = count_solutions([line[:] for line in values], limit=1) > 0
+            status, solution = session.solve()
+            assert status == expected
+            if status:
+                assert is_solution(values, solution)
+                hint = session.hint()
+                if hint is not None:
+                    assert values[hint.row][hint.col] == 0
+                    assert solution[hint.row][hint.col] == hint.digit
+
+
+def test_session_candidates_follow_the_givens():
+    with DLXSession(size=9) as session:
+        session.set_cell(0, 0, 5)
+        assert 5 not in session.candidates(0, 8)
+        assert 5 not in session.candidates(8, 0)
+        assert 5 not in session.candidates(2, 2)
+        session.set_cell(0, 0, 0)
+        assert 5 in session.candidates(0, 8)
+
+
+def test_session_rejects_a_bad_digit_without_losing_the_given():
+    with DLXSession(size=4) as session:
+        session.set_cell(0, 0, 3)
+        with pytest.raises(ValueError):
+            session.set_cell(0, 0, 5)
+        assert session.values[0][0] == 3
+        assert session.candidates(0, 0) == [3]
+        assert 3 not in session.candidates(0, 3)
+
+
+def test_session_hint_prefers_forced_moves():
+    grid = random_grid(9, 4)
+    values = [line[:] for line in grid]
+    values[4][4] = 0
+    with DLXSession(values) as session:
+        assert session.hint() == (4, 4, grid[4][4], True)
+        session.set_cell(4, 4, grid[4][4])
+        assert session.hint() is None
+
+
+def test_session_close_restores_the_template():
+    grid = random_grid(9, 5)
+    with DLXSession(blank_cells(grid, 0.4, 5)) as session:
+        session.solve()
+    assert_templates_pristine(9)
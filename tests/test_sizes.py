@@ -0,0 +1,44 @@
+import pytest
+
+from Solver.backtracking import solve_backtracking
+from Solver.board import Board, box_size, format_board, parse_line
+from Solver.engines import ENGINES
+
+from .helpers import blank_cells, is_solution, random_grid
+
+
+@pytest.mark.parametrize("engine", ["backtracking", "dlx"])
+@pytest.mark.parametrize(("size", "given", "seeds"), [(4, 0.3, 5), (16, 0.4, 5), (25, 0.6, 2)])
+def test_engines_solve_every_size(engine, size, given, seeds):
+    for seed in range(seeds):
+        puzzle = blank_cells(random_grid(size, seed), given, seed)
+        solution = ENGINES[engine](Board.from_rows(puzzle), None, 20)
+        assert is_solution(puzzle, solution)
+
+
+def test_restarts_are_reproducible():
+    puzzle = blank_cells(random_grid(16, 3), 0.3, 3)
+    first = solve_backtracking(Board.from_rows(puzzle), seed=1)
+    assert is_solution(puzzle, first)
+    assert solve_backtracking(Board.from_rows(puzzle), seed=1) == first
+
+
+def test_letters_round_trip():
+    grid = random_grid(16, 0)
+    line = format_board(Board.from_rows(grid))
+    assert set(line) == set("123456789ABCDEFG")
+    assert parse_line(line) == grid
+    assert parse_line(line.lower()) == grid
+
+
+@pytest.mark.parametrize("size", [1, 8, 36, 49])
+def test_unsupported_sizes(size):
+    with pytest.raises(ValueError, match="unsupported grid size"):
+        box_size(size)
+
+
+def test_bad_lines():
+    with pytest.raises(ValueError, match="expected one of"):
+        parse_line("123")
+    with pytest.raises(ValueError, match="invalid cell 'H'"):
+        parse_line("H" + "." * 255)
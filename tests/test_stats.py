@@ -0,0 +1,76 @@
+import pytest
+
+from Solver.array_dlx import _template_pool
+from Solver.backtracking import backTrackingSolver, solve_backtracking
+from Solver.board import Board
+from Solver.DLX import SudokuSolver
+from Solver.stats import SolveStats
+
+from .helpers import HARD
+
+UNSOLVABLE = "88" + HARD[2:]
+
+
+def solve_dlx(board, presolve, stats):
+    SudokuSolver().solve(board, presolve, stats)
+
+
+ENGINES = {"backtracking": solve_backtracking, "dlx": solve_dlx}
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_counters_after_a_search(engine):
+    stats = SolveStats()
+    ENGINES[engine](Board.from_line(HARD), False, stats)
+    assert stats.engine == engine
+    assert stats.solved
+    assert stats.presolve_time == 0.0
+    assert stats.build_time > 0 and stats.search_time > 0
+    assert stats.nodes >= stats.max_depth > 0
+    assert stats.alternatives >= stats.branch_points > 0
+    assert 0 < stats.backtracks < stats.nodes
+    assert stats.branching_factor == stats.alternatives / stats.branch_points
+
+
+def test_hooks_run_once_per_solve():
+    seen = []
+    stats = SolveStats(hooks=[seen.append])
+    backTrackingSolver(Board.from_line(HARD), stats)
+    assert seen == [stats]
+    SudokuSolver().solve(Board.from_line(HARD), stats=stats)
+    assert seen == [stats, stats]
+    assert stats.engine == "dlx"
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_presolve_and_failure(engine):
+    stats = SolveStats()
+    ENGINES[engine](Board.from_line(HARD), True, stats)
+    assert stats.presolve_time > 0
+    stats = SolveStats()
+    ENGINES[engine](Board.from_line(UNSOLVABLE), True, stats)
+    assert not stats.solved
+    assert stats.nodes == 0
+
+
+def test_dlx_column_operations_balance():
+    stats = SolveStats()
+    solve_dlx(Board.from_line(HARD), False, stats)
+    assert stats.covers == stats.uncovers > 0
+    # The counting wrappers are removed from the pooled template afterwards
+    for dlx in _template_pool[9]:
+        assert "cover" not in getattr(dlx, "__dict__", {})
+
+
+def test_backtracking_leaves_column_counters_alone():
+    stats = SolveStats()
+    solve_backtracking(Board.from_line(HARD), stats=stats)
+    assert stats.covers == stats.uncovers == 0
+
+
+def test_as_dict_and_repr():
+    stats = SolveStats()
+    data = stats.as_dict()
+    assert list(data) == [*SolveStats.FIELDS, "branching_factor"]
+    assert data["branching_factor"] == 0.0
+    assert repr(stats).startswith("SolveStats(engine=None, solved=False")
@@ -0,0 +1,74 @@
+import threading
+
+from Solver.array_dlx import acquire_sudoku_template, release_sudoku_template
+from Solver.DLX import SudokuSolver
+
+from .helpers import (
+    HARD,
+    assert_templates_pristine,
+    blank_cells,
+    is_solution,
+    random_grid,
+)
+
+
+def parse(line):
+    return [[int(line[row * 9 + col]) for col in range(9)] for row in range(9)]
+
+
+def test_pristine_after_solve():
+    solver = SudokuSolver()
+    for presolve in (True, False):
+        puzzle = parse(HARD)
+        solutions = solver.solve(puzzle, presolve=presolve)["found_solutions"]
+        assert is_solution(puzzle, solutions[0])
+        assert_templates_pristine()
+
+
+def test_pristine_after_clashing_givens():
+    puzzle = parse(HARD)
+    puzzle[0][1] = 8
+    assert SudokuSolver().solve(puzzle)["found_solutions"] == []
+    release_sudoku_template(9, acquire_sudoku_template(9, 3))
+    assert_templates_pristine()
+
+
+def test_concurrent_solves_get_separate_templates():
+    first = acquire_sudoku_template(9, 3)
+    second = acquire_sudoku_template(9, 3)
+    assert first is not second
+    puzzle = blank_cells(random_grid(9, 1), 0.4, 1)
+    assert is_solution(puzzle, SudokuSolver().solve(puzzle)["found_solutions"][0])
+    release_sudoku_template(9, second)
+    release_sudoku_template(9, first)
+    assert_templates_pristine()
+
+
+def test_each_size_has_its_own_templates():
+    for size in (4, 16):
+        puzzle = blank_cells(random_grid(size, size), 0.6, size)
+        assert is_solution(puzzle, SudokuSolver().solve(puzzle)["found_solutions"][0])
+        assert_templates_pristine(size)
+
+
+def test_pristine_after_closing_iter_solutions_early():
+    solver = SudokuSolver()
+    puzzle = blank_cells(random_grid(9, 6), 0.3, 6)
+    solutions = solver.iter_solutions(puzzle)
+    assert is_solution(puzzle, next(solutions))
+    next(solutions)
+    solutions.close()
+    assert_templates_pristine()
+
+
+def test_pristine_after_cancel_and_budget_abort():
+    solver = SudokuSolver()
+    cancel = threading.Event()
+    cancel.set()
+    empty = [[0] * 9 for _ in range(9)]
+    assert solver.solve(empty, presolve=False, cancel=cancel)["cancelled"]
+    assert_templates_pristine()
+    assert solver.solve(parse(HARD), max_nodes=5)["budget_exceeded"] is not None
+    assert_templates_pristine()
+    assert list(solver.iter_solutions(empty, cancel=cancel)) == []
+    assert_templates_pristine()
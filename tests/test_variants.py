@@ -0,0 +1,134 @@
+from itertools import permutations
+
+import pytest
+
+from Solver.variants import (
+    VariantSolver,
+    box_regions,
+    diagonal_regions,
+    jigsaw,
+    windoku,
+    x_sudoku,
+)
+
+from .helpers import matrix_state, random_grid
+
+# A jigsaw layout of 4x4 whose regions are not boxes
+JIGSAW_4 = [
+    "AAAB",
+    "CABB",
+    "CCDB",
+    "CDDD",
+]
+
+
+def latin_squares(size):
+    """Every size x size grid with each digit once per row and column."""
+    rows = list(permutations(range(1, size + 1)))
+
+    def extend(grid):
+        if len(grid) == size:
+            yield grid
+            return
+        for row in rows:
+            if all(row[col] != line[col] for line in grid for col in range(size)):
+                yield from extend(grid + [row])
+
+    yield from extend([])
+
+
+def brute_force_count(size, regions):
+    return sum(
+        1 for grid in latin_squares(size)
+        if all(len({grid[row][col] for row, col in region}) == len(region)
+               for region in regions)
+    )
+
+
+@pytest.mark.parametrize("regions", [
+    box_regions(4),
+    box_regions(4) + [[(0, 0), (1, 1), (2, 2)]],
+    box_regions(4) + diagonal_regions(4),
+    box_regions(4) + [[(0, 1), (3, 2)], [(1, 0), (2, 3), (3, 3)]],
+], ids=["classic", "partial-diagonal", "x-sudoku", "small-regions"])
+def test_counts_match_brute_force(regions):
+    empty = [[0] * 4 for _ in range(4)]
+    expected = brute_force_count(4, regions)
+    assert VariantSolver(4, regions).count_solutions(empty, limit=10_000) == expected
+
+
+def test_partial_region_count():
+    empty = [[0] * 4 for _ in range(4)]
+    solver = VariantSolver(4, box_regions(4) + [[(0, 0), (1, 1), (2, 2)]])
+    assert solver.count_solutions(empty, limit=10_000) == 144
+
+
+def test_jigsaw_count_and_solutions():
+    regions = {}
+    for row, labels in enumerate(JIGSAW_4):
+        for col, label in enumerate(labels):
+            regions.setdefault(label, []).append((row, col))
+    expected = brute_force_count(4, list(regions.values()))
+    solver = jigsaw(JIGSAW_4)
+    empty = [[0] * 4 for _ in range(4)]
+    solutions = list(solver.iter_solutions(empty))
+    assert len(solutions) == expected == solver.count_solutions(empty, limit=10_000)
+    assert len({tuple(map(tuple, grid)) for grid in solutions}) == expected
+
+
+def test_iter_solutions_respects_the_regions():
+    empty = [[0] * 9 for _ in range(9)]
+    solver = x_sudoku(9)
+    solutions = solver.iter_solutions(empty)
+    for _ in range(5):
+        grid = next(solutions)
+        for region in box_regions(9) + diagonal_regions(9):
+            assert len({grid[row][col] for row, col in region}) == 9
+    solutions.close()
+    assert solver.solve(grid) == grid
+
+
+def test_windoku_rejects_window_clash():
+    solver = windoku(9)
+    board = [[0] * 9 for _ in range(9)]
+    board[1][1] = 5
+    board[3][3] = 5  # Same window (rows and columns 1-3), different box
+    assert solver.solve(board) is None
+    assert solver.count_solutions(board) == 0
+
+
+def test_classic_regions_solve_classic_puzzles():
+    grid = random_grid(9, 11)
+    puzzle = [[value if (row + col) % 3 else 0 for col, value in enumerate(line)]
+              for row, line in enumerate(grid)]
+    assert VariantSolver(9, box_regions(9)).solve(puzzle) == grid
+
+
+def test_matrix_is_reused_clean():
+    solver = x_sudoku(4)
+    empty = [[0] * 4 for _ in range(4)]
+    first = solver.count_solutions(empty, limit=10_000)
+    solutions = solver.iter_solutions(empty)
+    next(solutions)
+    solutions.close()
+    assert len(solver.idle) == 1
+    assert solver.count_solutions(empty, limit=10_000) == first
+
+
+def test_bad_regions_are_rejected():
+    with pytest.raises(ValueError):
+        VariantSolver(4, [[(0, 0), (0, 0)]])
+    with pytest.raises(ValueError):
+        VariantSolver(4, [[(0, col) for col in range(4)] + [(1, 0)]])
+    with pytest.raises(ValueError):
+        VariantSolver(4, [[(0, 4)]])
+
+
+def test_matrix_is_clean_after_closing_with_givens():
+    solver = x_sudoku(4)
+    puzzle = [[1, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]]
+    solutions = solver.iter_solutions(puzzle)
+    next(solutions)
+    solutions.close()
+    [dlx] = solver.idle
+    assert matrix_state(dlx) == matrix_state(solver.build_matrix())
@@ -0,0 +1,105 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from Solver.backtracking import solve_backtracking
+from Solver.batch import solve_many
+from Solver.board import Board
+from Solver.presolve import presolve
+from Solver.vectorized import (
+    INVALID,
+    OPEN,
+    SOLVED,
+    candidate_masks,
+    propagate,
+    propagate_boards,
+    solve_array,
+)
+
+from .helpers import HARD, blank_cells, is_solution, random_grid
+
+
+def scalar_masks(grid):
+    size = len(grid)
+    box = {4: 2, 9: 3, 16: 4}[size]
+    masks = []
+    for row in range(size):
+        for col in range(size):
+            if grid[row][col]:
+                masks.append(0)
+                continue
+            top, left = row - row % box, col - col % box
+            used = set(grid[row]) | {line[col] for line in grid} | {
+                grid[top + r][left + c] for r in range(box) for c in range(box)}
+            masks.append(sum(1 << (digit - 1) for digit in range(1, size + 1)
+                             if digit not in used))
+    return masks
+
+
+@pytest.mark.parametrize("size", [4, 9, 16])
+def test_candidate_masks_match_scalar(size):
+    grids = [blank_cells(random_grid(size, seed), 0.4, seed) for seed in range(6)]
+    masks = candidate_masks(np.array(grids, dtype=np.uint8))
+    for grid, mask in zip(grids, masks):
+        assert mask.ravel().tolist() == scalar_masks(grid)
+
+
+def test_propagate_agrees_with_the_scalar_engine():
+    grids = [blank_cells(random_grid(9, seed), given, seed)
+             for seed in range(20) for given in (0.3, 0.5, 0.7)]
+    filled, status = propagate(grids)
+    for grid, result, state in zip(grids, filled, status):
+        assert state != INVALID
+        # Whatever propagation places, the scalar presolver places too
+        deduced, _ = presolve(grid)
+        placed = result.tolist()
+        for row in range(9):
+            for col in range(9):
+                assert placed[row][col] in (0, deduced[row][col])
+        if state == SOLVED:
+            assert is_solution(grid, placed)
+        else:
+            assert state == OPEN
+            assert is_solution(grid, solve_backtracking(placed))
+
+
+def test_contradictions_are_flagged():
+    clash = Board.from_line(HARD).rows()
+    clash[0][1] = 8
+    dead = [[0] * 9 for _ in range(9)]
+    dead[0][:8] = range(1, 9)
+    dead[4][8] = 9
+    _, status = propagate([clash, dead, Board.from_line(HARD).rows()])
+    assert status.tolist() == [INVALID, INVALID, OPEN]
+
+
+def test_boards_keep_their_kind():
+    puzzle = blank_cells(random_grid(9, 0), 0.6, 0)
+    filled, status = propagate_boards([puzzle, Board.from_rows(puzzle)])
+    assert isinstance(filled[0], list)
+    assert isinstance(filled[1], Board)
+    assert filled[1].rows() == filled[0]
+    assert status[0] == status[1]
+
+
+def test_solve_array():
+    grids = [blank_cells(random_grid(9, seed), 0.35, seed) for seed in range(8)]
+    solutions, solved = solve_array(np.array(grids, dtype=np.uint8))
+    assert solved.all()
+    for grid, solution in zip(grids, solutions):
+        assert is_solution(grid, solution.tolist())
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_vectorized_batches(workers):
+    boards = [Board.from_rows(blank_cells(random_grid(size, seed), 0.5, seed))
+              for seed in range(12) for size in (9, 16)]
+    clash = Board.from_line(HARD)
+    clash.cells[1] = 8
+    boards += [None, clash]
+    results = list(solve_many(boards, workers=workers, chunksize=5, vectorized=True))
+    assert [result.index for result in results] == list(range(len(boards)))
+    for board, result in zip(boards[:-2], results):
+        assert isinstance(result.solution, Board)
+        assert is_solution(board.rows(), result.solution)
+    assert results[-2].solution is None and results[-1].solution is None